@@ -2,22 +2,85 @@
 # Simple Cache Manager
 # Created during "Feature Rush" commit as quick caching solution
 
-from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
+from typing import Any, Optional, Dict, Iterable, List, Tuple
+from array import array
+from collections import OrderedDict
+import heapq
+import logging
 import threading
+import time
+
+log = logging.getLogger(__name__)
+
+# Bound once so the hot paths skip the module attribute lookup
+_monotonic = time.monotonic
 
 
 class CacheEntry:
     """Represents a cached value with metadata."""
     
+    __slots__ = ("value", "expires_at")
+    
     def __init__(self, value: Any, ttl_seconds: int = 300):
         self.value = value
-        self.created_at = datetime.now()
-        self.ttl = timedelta(seconds=ttl_seconds)
+        # Absolute deadline in monotonic seconds, so expiry is one float compare
+        self.expires_at = _monotonic() + ttl_seconds
     
     @property
     def is_expired(self) -> bool:
-        return datetime.now() > self.created_at + self.ttl
+        return _monotonic() > self.expires_at
+
+
+class KeyTrie:
+    """Character trie over cache keys, used for prefix lookups."""
+    
+    _END = None  # child key marking that a full cache key ends at a node
+    
+    def __init__(self):
+        self._root: Dict[Any, Any] = {}
+    
+    def add(self, key: str) -> None:
+        node = self._root
+        for ch in key:
+            node = node.setdefault(ch, {})
+        node[self._END] = True
+    
+    def discard(self, key: str) -> None:
+        node = self._root
+        path = []
+        for ch in key:
+            child = node.get(ch)
+            if child is None:
+                return
+            path.append((node, ch))
+            node = child
+        if node.pop(self._END, None) is None:
+            return
+        # Prune branches that no longer lead to any key
+        for parent, ch in reversed(path):
+            if parent[ch]:
+                break
+            del parent[ch]
+    
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return []
+        keys = []
+        stack = [(node, prefix)]
+        while stack:
+            node, path = stack.pop()
+            for ch, child in node.items():
+                if ch is self._END:
+                    keys.append(path)
+                else:
+                    stack.append((child, path + ch))
+        return keys
+    
+    def clear(self) -> None:
+        self._root.clear()
 
 
 class CacheManager:
@@ -26,14 +89,94 @@ class CacheManager:
     Built quickly during feature rush - has several known issues.
     """
     
-    def __init__(self, default_ttl: int = 300):
-        self._cache: Dict[str, CacheEntry] = {}
+    def __init__(self, default_ttl: int = 300, num_shards: int = 16,
+                 max_size: int = 10000, sweep_interval: Optional[float] = 30.0):
+        if num_shards <= 0 or num_shards & (num_shards - 1):
+            raise ValueError("num_shards must be a power of two")
         self._default_ttl = default_ttl
-        # TODO: This lock implementation is naive. Using a single global lock
-        # means all cache operations are serialized, causing a major bottleneck.
-        # Should use fine-grained locking or lock-free data structures.
-        self._lock = threading.Lock()
-        self._stats = {"hits": 0, "misses": 0}
+        self._max_size = max_size
+        # Each shard evicts its least-recently-used entries past its share
+        self._shard_max_size = max(1, max_size // num_shards)
+        # Keys are spread over independent shards, each guarded by its own
+        # lock, so operations on different shards never contend.
+        self._num_shards = num_shards
+        self._shard_mask = num_shards - 1
+        self._shards: List[OrderedDict[str, CacheEntry]] = [
+            OrderedDict() for _ in range(num_shards)
+        ]
+        # TODO: Locking is per shard, but set_many() holds a shard lock for
+        # its whole batch, stalling every writer and miss on that shard.
+        # Should cap the number of keys handled per lock hold.
+        self._locks = [threading.Lock() for _ in range(num_shards)]
+        # Per-shard key tries kept in sync with the shards for invalidate_prefix()
+        self._tries = [KeyTrie() for _ in range(num_shards)]
+        # Per-shard min-heaps of (expiry, key) so sweeps only visit due entries.
+        # Overwritten or evicted keys leave stale heap items that are skipped;
+        # a heap is rebuilt from its live entries once it outgrows
+        # 2x the shard cap, so it stays bounded even without a sweeper.
+        self._expiry_heaps: List[List[Tuple[float, str]]] = [
+            [] for _ in range(num_shards)
+        ]
+        # Per-shard hit/miss counters, summed lazily in get_stats()
+        self._hits = array('Q', [0] * num_shards)
+        self._misses = array('Q', [0] * num_shards)
+        
+        self._stop_sweeper = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        if sweep_interval:
+            self._sweeper = threading.Thread(
+                target=self._sweep_loop,
+                args=(sweep_interval,),
+                name="CacheManager-sweeper",
+                daemon=True
+            )
+            self._sweeper.start()
+    
+    def _shard(self, key: str) -> int:
+        """Return the index of the shard that owns a key."""
+        return hash(key) & self._shard_mask
+    
+    def _group_by_shard(self, keys: Iterable[str]) -> Dict[int, List[str]]:
+        """Group keys by the shard that owns them."""
+        groups: Dict[int, List[str]] = {}
+        for key in keys:
+            groups.setdefault(self._shard(key), []).append(key)
+        return groups
+    
+    def _get_locked(self, idx: int, key: str) -> Optional[Any]:
+        """Look up a key in shard idx. Caller must hold that shard's lock."""
+        shard = self._shards[idx]
+        entry = shard.get(key)
+        if entry:
+            if entry.is_expired:
+                # Not swept yet; drop it now rather than serve stale data
+                del shard[key]
+                self._tries[idx].discard(key)
+                self._misses[idx] += 1
+                return None
+            shard.move_to_end(key)
+            self._hits[idx] += 1
+            return entry.value
+        self._misses[idx] += 1
+        return None
+    
+    def _set_locked(self, idx: int, key: str, entry: CacheEntry) -> None:
+        """Store an entry in shard idx. Caller must hold that shard's lock."""
+        shard = self._shards[idx]
+        trie = self._tries[idx]
+        heap = self._expiry_heaps[idx]
+        shard[key] = entry
+        shard.move_to_end(key)
+        heapq.heappush(heap, (entry.expires_at, key))
+        trie.add(key)
+        while len(shard) > self._shard_max_size:
+            evicted, _ = shard.popitem(last=False)
+            trie.discard(evicted)
+        if len(heap) > 2 * self._shard_max_size:
+            # Mostly stale items; rebuilding costs O(shard) once per at
+            # least _shard_max_size sets, so it is amortized O(1)
+            heap[:] = [(e.expires_at, k) for k, e in shard.items()]
+            heapq.heapify(heap)
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -45,20 +188,44 @@ class CacheManager:
         Returns:
             Cached value or None if not found/expired
         """
-        with self._lock:
-            entry = self._cache.get(key)
-            if entry:
-                if entry.is_expired:
-                    # HACK: Expired entries are deleted lazily on access.
-                    # This means expired data can accumulate if keys are not
-                    # accessed, causing memory bloat. Need background cleanup.
-                    del self._cache[key]
-                    self._stats["misses"] += 1
-                    return None
-                self._stats["hits"] += 1
-                return entry.value
-            self._stats["misses"] += 1
-            return None
+        idx = hash(key) & self._shard_mask  # inlined _shard()
+        shard = self._shards[idx]
+        # Lock-free fast path for live hits: a single dict lookup and
+        # move_to_end are each atomic under the GIL. Hit counts taken here
+        # may under-count slightly under contention.
+        entry = shard.get(key)
+        if entry is not None and entry.expires_at > _monotonic():
+            try:
+                shard.move_to_end(key)
+            except KeyError:
+                pass  # evicted by a concurrent writer; the value is still valid
+            self._hits[idx] += 1
+            return entry.value
+        # HACK: Expired entries are deleted lazily on access when the sweeper
+        # has not reached them yet. Their heap items are left behind until
+        # the next sweep or heap rebuild drops them.
+        # Miss or expired: re-check under the shard lock before deleting
+        with self._locks[idx]:
+            return self._get_locked(idx, key)
+    
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
+        """
+        Get several values, taking each shard lock at most once.
+        
+        Args:
+            keys: Cache keys to look up
+            
+        Returns:
+            Dict of key -> value for the keys that were found and not expired
+        """
+        found = {}
+        for idx, shard_keys in self._group_by_shard(keys).items():
+            with self._locks[idx]:
+                for key in shard_keys:
+                    value = self._get_locked(idx, key)
+                    if value is not None:
+                        found[key] = value
+        return found
     
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
         """
@@ -69,11 +236,28 @@ class CacheManager:
             value: Value to cache
             ttl: Optional TTL in seconds
         """
-        with self._lock:
-            # FIXME: No size limit on cache! The cache will grow unbounded
-            # until we run out of memory. Need to implement LRU eviction
-            # or max size limit with eviction policy.
-            self._cache[key] = CacheEntry(value, ttl or self._default_ttl)
+        idx = hash(key) & self._shard_mask  # inlined _shard()
+        entry = CacheEntry(value, ttl or self._default_ttl)
+        # FIXME: The size limit is enforced per shard, not globally. Skewed
+        # key hashing can evict from a full shard while others sit nearly
+        # empty, so max_size is only an approximate bound.
+        with self._locks[idx]:
+            self._set_locked(idx, key, entry)
+    
+    def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None) -> None:
+        """
+        Set several values, taking each shard lock at most once.
+        
+        Args:
+            items: Dict of key -> value to cache
+            ttl: Optional TTL in seconds applied to every entry
+        """
+        ttl = ttl or self._default_ttl
+        for idx, shard_keys in self._group_by_shard(items).items():
+            entries = [(key, CacheEntry(items[key], ttl)) for key in shard_keys]
+            with self._locks[idx]:
+                for key, entry in entries:
+                    self._set_locked(idx, key, entry)
     
     def delete(self, key: str) -> bool:
         """
@@ -85,17 +269,23 @@ class CacheManager:
         Returns:
             True if key existed and was deleted
         """
-        with self._lock:
-            if key in self._cache:
-                del self._cache[key]
+        idx = self._shard(key)
+        shard = self._shards[idx]
+        with self._locks[idx]:
+            if key in shard:
+                del shard[key]
+                self._tries[idx].discard(key)
                 return True
             return False
     
     def clear(self) -> None:
         """Clear all cached values."""
-        with self._lock:
-            self._cache.clear()
-            print("CacheManager: Cache cleared")
+        for idx, lock in enumerate(self._locks):
+            with lock:
+                self._shards[idx].clear()
+                self._tries[idx].clear()
+                self._expiry_heaps[idx].clear()
+        log.info("Cache cleared")
     
     def invalidate_prefix(self, prefix: str) -> int:
         """
@@ -107,51 +297,84 @@ class CacheManager:
         Returns:
             Number of keys invalidated
         """
-        # TODO: This is O(n) where n is total cache size.
-        # For large caches with millions of keys, this will be very slow.
-        # Should use a trie or prefix index for efficient prefix lookups.
-        with self._lock:
-            keys_to_delete = [k for k in self._cache if k.startswith(prefix)]
-            for key in keys_to_delete:
-                del self._cache[key]
-            return len(keys_to_delete)
+        # TODO: This is O(matches) per shard but holds the shard lock while
+        # walking the trie. A broad prefix on a large cache blocks that
+        # shard for the whole walk; should collect keys in smaller batches.
+        removed = 0
+        for shard, trie, lock in zip(self._shards, self._tries, self._locks):
+            with lock:
+                keys_to_delete = trie.keys_with_prefix(prefix)
+                for key in keys_to_delete:
+                    del shard[key]
+                    trie.discard(key)
+                removed += len(keys_to_delete)
+        return removed
     
     def get_stats(self) -> Dict:
         """Get cache statistics."""
-        with self._lock:
-            total = self._stats["hits"] + self._stats["misses"]
-            hit_rate = self._stats["hits"] / total if total > 0 else 0
-            return {
-                "hits": self._stats["hits"],
-                "misses": self._stats["misses"],
-                "hit_rate": hit_rate,
-                "size": len(self._cache)
-            }
+        hits = misses = size = 0
+        for idx, lock in enumerate(self._locks):
+            with lock:
+                hits += self._hits[idx]
+                misses += self._misses[idx]
+                size += len(self._shards[idx])
+        total = hits + misses
+        hit_rate = hits / total if total > 0 else 0
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hit_rate,
+            "size": size
+        }
     
     def cleanup_expired(self) -> int:
         """
         Remove all expired entries from cache.
         
+        Called by the background sweeper; only entries whose expiry is due
+        are visited.
+        
         Returns:
             Number of entries removed
         """
-        # NOTE: This method should be called periodically by a background task.
-        # Currently there's no automatic cleanup - it's entirely manual.
-        # Risk of memory leaks if this is never called.
-        with self._lock:
-            expired_keys = [
-                key for key, entry in self._cache.items() 
-                if entry.is_expired
-            ]
-            for key in expired_keys:
-                del self._cache[key]
-            if expired_keys:
-                print(f"CacheManager: Cleaned up {len(expired_keys)} expired entries")
-            return len(expired_keys)
+        # NOTE: This method is called periodically by the background sweeper.
+        # With sweep_interval=None nothing calls it, and expired entries only
+        # go on access or when a heap is rebuilt.
+        removed = 0
+        for idx, lock in enumerate(self._locks):
+            shard = self._shards[idx]
+            heap = self._expiry_heaps[idx]
+            with lock:
+                now = _monotonic()
+                while heap and heap[0][0] <= now:
+                    _, key = heapq.heappop(heap)
+                    entry = shard.get(key)
+                    # The key may have been re-set with a later expiry
+                    if entry is not None and entry.is_expired:
+                        del shard[key]
+                        self._tries[idx].discard(key)
+                        removed += 1
+        if removed:
+            log.info("Cleaned up %d expired entries", removed)
+        return removed
+    
+    def close(self) -> None:
+        """Stop the background expiry sweeper."""
+        self._stop_sweeper.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+            self._sweeper = None
+    
+    def _sweep_loop(self, interval: float) -> None:
+        """Periodically purge expired entries until close() is called."""
+        while not self._stop_sweeper.wait(interval):
+            self.cleanup_expired()
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    
     cache = CacheManager(default_ttl=60)
     
     # Basic operations
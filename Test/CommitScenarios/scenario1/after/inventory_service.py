@@ -2,14 +2,19 @@
 # Inventory Management Service
 # Created during "Feature Rush" commit to support order-inventory integration
 
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional
+from array import array
+import sys
 from dataclasses import dataclass
+import logging
 from cache_manager import CacheManager
 
+log = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class InventoryItem:
-    """Represents inventory for a product."""
+    """Snapshot of the inventory for a product."""
     product_id: str
     available_quantity: int
     reserved_quantity: int
@@ -31,7 +36,15 @@ class InventoryService:
     """
     
     def __init__(self):
-        self._inventory: Dict[str, InventoryItem] = {}
+        # Struct-of-arrays store: one contiguous int column per field, with
+        # product IDs mapped to row indexes. Columns grow by amortized append.
+        self._id_to_idx: Dict[str, int] = {}
+        self._ids: List[str] = []
+        # Interned "avail:<product_id>" cache keys, built once per product
+        self._avail_keys: Dict[str, str] = {}
+        self._available = array('q')
+        self._reserved = array('q')
+        self._reorder = array('q')
         # TODO: Cache initialization is done synchronously in constructor.
         # This blocks the service startup and could cause timeouts.
         # Should use lazy initialization or async startup.
@@ -40,11 +53,46 @@ class InventoryService:
     
     def _initialize_sample_inventory(self):
         """Initialize with sample data for testing."""
-        self._inventory = {
-            "PROD-A": InventoryItem("PROD-A", 100, 0),
-            "PROD-B": InventoryItem("PROD-B", 50, 0),
-            "PROD-C": InventoryItem("PROD-C", 200, 0),
-        }
+        for item in (
+            InventoryItem("PROD-A", 100, 0),
+            InventoryItem("PROD-B", 50, 0),
+            InventoryItem("PROD-C", 200, 0),
+        ):
+            self.add_item(item)
+    
+    def add_item(self, item: InventoryItem) -> None:
+        """
+        Add a product to the inventory, replacing any existing row for it.
+        
+        Args:
+            item: Inventory snapshot to load
+        """
+        product_id = sys.intern(item.product_id)
+        idx = self._id_to_idx.get(product_id)
+        if idx is None:
+            self._id_to_idx[product_id] = len(self._ids)
+            self._ids.append(product_id)
+            self._avail_keys[product_id] = sys.intern(f"avail:{product_id}")
+            self._available.append(item.available_quantity)
+            self._reserved.append(item.reserved_quantity)
+            self._reorder.append(item.reorder_threshold)
+        else:
+            self._available[idx] = item.available_quantity
+            self._reserved[idx] = item.reserved_quantity
+            self._reorder[idx] = item.reorder_threshold
+        self._cache.set(self._avail_keys[product_id], item.available_quantity)
+    
+    def get_item(self, product_id: str) -> Optional[InventoryItem]:
+        """Get a read-only snapshot of a product's inventory."""
+        idx = self._id_to_idx.get(product_id)
+        if idx is None:
+            return None
+        return InventoryItem(
+            product_id,
+            self._available[idx],
+            self._reserved[idx],
+            self._reorder[idx]
+        )
     
     def check_availability(self, product_id: str, quantity: int) -> bool:
         """
@@ -57,20 +105,21 @@ class InventoryService:
         Returns:
             True if available, False otherwise
         """
-        # HACK: Using cache without proper invalidation strategy.
-        # Cached values might be stale causing overselling issues.
-        # Need to implement cache-aside pattern with TTL.
-        cached = self._cache.get(f"avail:{product_id}")
+        key = self._avail_keys.get(product_id)
+        if key is None:
+            return False  # unknown product
+        
+        # HACK: Stock changes write through to the cache, but checking and
+        # reserving are separate unlocked steps. A hit can be outdated by the
+        # time reserve_stock() runs, so True is only a hint to callers.
+        cached = self._cache.get(key)
         if cached is not None:
             return cached >= quantity
         
-        item = self._inventory.get(product_id)
-        if item:
-            available = item.available_quantity >= quantity
-            # Cache for future lookups (but this causes staleness issues!)
-            self._cache.set(f"avail:{product_id}", item.available_quantity)
-            return available
-        return False
+        # Miss (expired or evicted): reload from the store
+        available_quantity = self._available[self._id_to_idx[product_id]]
+        self._cache.set(key, available_quantity)
+        return available_quantity >= quantity
     
     def reserve_stock(self, product_id: str, quantity: int) -> bool:
         """
@@ -83,16 +132,17 @@ class InventoryService:
         Returns:
             True if reservation successful
         """
-        item = self._inventory.get(product_id)
-        if item and item.available_quantity >= quantity:
-            item.available_quantity -= quantity
-            item.reserved_quantity += quantity
-            # FIXME: Not invalidating cache here! This creates a race condition
-            # where availability check sees stale data after reservation.
-            # Multiple concurrent orders could reserve the same stock.
-            print(f"InventoryService: Reserved {quantity} units of {product_id}")
+        # FIXME: The check-and-decrement below is not atomic. Two concurrent
+        # orders could both pass the check and reserve the same stock.
+        # Multiple threads need a per-product lock here.
+        idx = self._id_to_idx.get(product_id)
+        if idx is not None and self._available[idx] >= quantity:
+            self._available[idx] -= quantity
+            self._reserved[idx] += quantity
+            self._cache.set(self._avail_keys[product_id], self._available[idx])
+            log.info("Reserved %d units of %s", quantity, product_id)
             return True
-        print(f"InventoryService: Failed to reserve {quantity} units of {product_id}")
+        log.info("Failed to reserve %d units of %s", quantity, product_id)
         return False
     
     def release_stock(self, product_id: str, quantity: int) -> bool:
@@ -106,19 +156,20 @@ class InventoryService:
         Returns:
             True if release successful
         """
-        item = self._inventory.get(product_id)
-        if item and item.reserved_quantity >= quantity:
-            item.reserved_quantity -= quantity
-            item.available_quantity += quantity
-            # BUG: Cache invalidation is missing here too.
-            # After releasing stock, cached availability is still stale.
-            print(f"InventoryService: Released {quantity} units of {product_id}")
+        # BUG: Release does not check which order holds the reservation.
+        # Any caller can release units reserved by another order.
+        idx = self._id_to_idx.get(product_id)
+        if idx is not None and self._reserved[idx] >= quantity:
+            self._reserved[idx] -= quantity
+            self._available[idx] += quantity
+            self._cache.set(self._avail_keys[product_id], self._available[idx])
+            log.info("Released %d units of %s", quantity, product_id)
             return True
         return False
     
     def get_inventory_status(self, product_id: str) -> Optional[Dict]:
         """Get current inventory status for a product."""
-        item = self._inventory.get(product_id)
+        item = self.get_item(product_id)
         if item:
             return {
                 "product_id": product_id,
@@ -128,6 +179,35 @@ class InventoryService:
             }
         return None
     
+    def get_available_quantities(self, product_ids: Iterable[str]) -> Dict[str, int]:
+        """
+        Get available quantities for several products in one batched cache pass.
+        
+        Args:
+            product_ids: Product identifiers
+            
+        Returns:
+            Dict of product_id -> available quantity (unknown products omitted)
+        """
+        keys = {
+            product_id: self._avail_keys[product_id]
+            for product_id in product_ids
+            if product_id in self._avail_keys
+        }
+        cached = self._cache.get_many(keys.values())
+        
+        quantities = {}
+        misses = {}
+        for product_id, key in keys.items():
+            if key in cached:
+                quantities[product_id] = cached[key]
+                continue
+            idx = self._id_to_idx[product_id]
+            quantities[product_id] = misses[key] = self._available[idx]
+        if misses:
+            self._cache.set_many(misses)
+        return quantities
+    
     def bulk_check_availability(self, items: Dict[str, int]) -> Dict[str, bool]:
         """
         Check availability for multiple products at once.
@@ -138,11 +218,12 @@ class InventoryService:
         Returns:
             Dict of product_id -> availability
         """
-        # TODO: This should be a single database query or batch cache lookup.
-        # Current implementation makes N calls which is very inefficient.
-        # Will cause performance issues with large shopping carts.
+        # TODO: This should be a single database query on cache misses.
+        # get_available_quantities() reads misses from the in-memory columns
+        # one product at a time, which won't hold up with a real store.
+        quantities = self.get_available_quantities(items)
         return {
-            product_id: self.check_availability(product_id, qty)
+            product_id: product_id in quantities and quantities[product_id] >= qty
             for product_id, qty in items.items()
         }
     
@@ -152,14 +233,17 @@ class InventoryService:
         # No indexing, no caching. This will be slow with thousands of products.
         # Should maintain a separate low-stock index.
         return [
-            item.product_id 
-            for item in self._inventory.values() 
-            if item.needs_reorder
+            product_id
+            for product_id, available, threshold
+            in zip(self._ids, self._available, self._reorder)
+            if available < threshold
         ]
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    
     service = InventoryService()
     
     print("Initial inventory status:")
@@ -3,12 +3,18 @@
 # AFTER the "Feature Rush" commit - Developer added quick features under deadline pressure
 
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from collections import defaultdict
+from dataclasses import dataclass, field
 from datetime import datetime
+import math
+import sys
+import logging
 from inventory_service import InventoryService
 
+log = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class OrderItem:
     """Represents an item in an order."""
     product_id: str
@@ -16,7 +22,7 @@ class OrderItem:
     unit_price: float
 
 
-@dataclass
+@dataclass(slots=True)
 class Order:
     """Represents a customer order."""
     order_id: str
@@ -24,11 +30,16 @@ class Order:
     items: List[OrderItem]
     created_at: datetime
     status: str = "pending"
+    # Items are fixed at creation, so the total is computed once
+    _total: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._total = math.fsum(item.quantity * item.unit_price for item in self.items)
     
     @property
     def total(self) -> float:
-        """Calculate total order amount."""
-        return sum(item.quantity * item.unit_price for item in self.items)
+        """Total order amount."""
+        return self._total
 
 
 class OrderService:
@@ -39,6 +50,10 @@ class OrderService:
     
     def __init__(self):
         self.orders: Dict[str, Order] = {}
+        # Secondary indexes so per-customer and per-status queries avoid full
+        # scans. Inner dicts act as insertion-ordered sets of order IDs.
+        self._orders_by_customer: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._orders_by_status: Dict[str, Dict[str, None]] = defaultdict(dict)
         self._order_counter = 0
         self.inventory = InventoryService()
         # TODO: This direct instantiation of InventoryService creates tight coupling.
@@ -57,27 +72,32 @@ class OrderService:
         Returns:
             The created Order object
         """
+        # Intern IDs at ingress so every order line and index shares one
+        # string object per product/customer
+        customer_id = sys.intern(customer_id)
+        product_ids = [sys.intern(item["product_id"]) for item in items]
+        
         # HACK: Quick validation added during feature rush - no proper error handling
         # If inventory check fails, we just proceed anyway and hope for the best.
         # This will cause issues when we oversell products.
-        for item in items:
-            available = self.inventory.check_availability(
-                item["product_id"], 
-                item["quantity"]
-            )
+        requested: Dict[str, int] = {}
+        for product_id, item in zip(product_ids, items):
+            requested[product_id] = requested.get(product_id, 0) + item["quantity"]
+        availability = self.inventory.bulk_check_availability(requested)
+        for product_id, available in availability.items():
             if not available:
-                print(f"WARNING: Product {item['product_id']} may not be available!")
+                log.warning("Product %s may not be available!", product_id)
         
         self._order_counter += 1
         order_id = f"ORD-{self._order_counter:06d}"
         
         order_items = [
             OrderItem(
-                product_id=item["product_id"],
+                product_id=product_id,
                 quantity=item["quantity"],
                 unit_price=item["unit_price"]
             )
-            for item in items
+            for product_id, item in zip(product_ids, items)
         ]
         
         order = Order(
@@ -88,6 +108,8 @@ class OrderService:
         )
         
         self.orders[order_id] = order
+        self._orders_by_customer[customer_id][order_id] = None
+        self._orders_by_status[order.status][order_id] = None
         
         # Reserve inventory
         # FIXME: No transaction support here. If reservation partially fails,
@@ -96,7 +118,7 @@ class OrderService:
         for item in order_items:
             self.inventory.reserve_stock(item.product_id, item.quantity)
         
-        print(f"OrderService: Created order {order_id} for customer {customer_id}")
+        log.info("Created order %s for customer %s", order_id, customer_id)
         return order
     
     def get_order(self, order_id: str) -> Optional[Order]:
@@ -105,9 +127,12 @@ class OrderService:
     
     def update_order_status(self, order_id: str, status: str) -> bool:
         """Update the status of an order."""
-        if order_id in self.orders:
-            self.orders[order_id].status = status
-            print(f"OrderService: Updated order {order_id} status to {status}")
+        order = self.orders.get(order_id)
+        if order:
+            self._orders_by_status[order.status].pop(order_id, None)
+            self._orders_by_status[status][order_id] = None
+            order.status = status
+            log.info("Updated order %s status to %s", order_id, status)
             return True
         return False
     
@@ -126,8 +151,8 @@ class OrderService:
     def get_customer_orders(self, customer_id: str) -> List[Order]:
         """Get all orders for a specific customer."""
         return [
-            order for order in self.orders.values()
-            if order.customer_id == customer_id
+            self.orders[order_id]
+            for order_id in self._orders_by_customer.get(customer_id, ())
         ]
     
     def validate_all_pending_orders(self) -> Dict[str, bool]:
@@ -135,22 +160,30 @@ class OrderService:
         Validate all pending orders against current inventory.
         Added during feature rush for inventory sync feature.
         """
-        # HACK: This method iterates through ALL orders every time it's called.
-        # No pagination, no filtering, no caching. Will be extremely slow
-        # when we have thousands of orders. Need to add proper indexing.
+        # HACK: This method re-validates ALL pending orders every time it's called.
+        # No pagination and no tracking of which orders a stock change affects,
+        # so the cost still grows with the size of the pending backlog.
+        pending = [
+            (order_id, self.orders[order_id])
+            for order_id in self._orders_by_status.get("pending", ())
+        ]
+        available = self.inventory.get_available_quantities({
+            item.product_id for _, order in pending for item in order.items
+        })
         results = {}
-        for order_id, order in self.orders.items():
-            if order.status == "pending":
-                valid = all(
-                    self.inventory.check_availability(item.product_id, item.quantity)
-                    for item in order.items
-                )
-                results[order_id] = valid
+        for order_id, order in pending:
+            results[order_id] = all(
+                item.product_id in available
+                and available[item.product_id] >= item.quantity
+                for item in order.items
+            )
         return results
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    
     service = OrderService()
     
     # Create a sample order
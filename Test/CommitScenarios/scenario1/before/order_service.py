@@ -3,8 +3,9 @@
 # Clean initial implementation before the "Feature Rush" commit
 
 from typing import List, Dict, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
+import math
 
 
 @dataclass
@@ -23,11 +24,16 @@ class Order:
     items: List[OrderItem]
     created_at: datetime
     status: str = "pending"
+    # Items are fixed at creation, so the total is computed once
+    _total: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._total = math.fsum(item.quantity * item.unit_price for item in self.items)
     
     @property
     def total(self) -> float:
-        """Calculate total order amount."""
-        return sum(item.quantity * item.unit_price for item in self.items)
+        """Total order amount."""
+        return self._total
 
 
 class OrderService:
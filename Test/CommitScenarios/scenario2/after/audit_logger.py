@@ -2,13 +2,27 @@
 # Security Audit Logger
 # Added during commit to track permission checks and security events
 
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import defaultdict, deque
 from dataclasses import dataclass
 from datetime import datetime
+from itertools import count, islice
+import bisect
 import json
+import logging
+import threading
+import time
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True, frozen=True)
 class AuditEvent:
     """Represents a security audit event."""
     event_id: str
@@ -39,18 +53,121 @@ class AuditLogger:
     Part of the auth chain for tracking access patterns.
     """
     
-    def __init__(self, log_file: str = None):
+    def __init__(self, log_file: str = None, max_events_per_user: int = 10000,
+                 flush_interval: Optional[float] = 0.1):
         self._events: List[AuditEvent] = []
-        self._event_counter = 0
+        # Most recent events per user, bounded so one noisy user can't grow
+        # the index without limit
+        self._events_by_user: Dict[str, Deque[AuditEvent]] = defaultdict(
+            lambda: deque(maxlen=max_events_per_user)
+        )
+        # Failed events in timestamp order, with a parallel key list for bisect
+        self._failed_events: List[AuditEvent] = []
+        self._failed_timestamps: List[datetime] = []
+        self._event_counter = count(1)
+        # Local date string used in event IDs, refreshed at local midnight
+        self._date_str = ""
+        self._date_rollover = 0.0
         # TODO: Currently storing events in memory only. Need to persist to
         # a proper audit log storage (file, database, or SIEM system).
         # In-memory storage is useless for actual auditing and compliance.
         self._log_file = log_file
+        
+        # Each logging thread appends to its own buffer; buffers are drained
+        # into the shared structures by the flush thread or before a query.
+        self._local = threading.local()
+        self._buffers: List[Tuple[threading.Thread, Deque[AuditEvent]]] = []
+        self._buffers_lock = threading.Lock()
+        self._drain_lock = threading.Lock()
+        self._stop_flusher = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        if flush_interval:
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                args=(flush_interval,),
+                name="AuditLogger-flusher",
+                daemon=True
+            )
+            self._flusher.start()
     
     def _generate_event_id(self) -> str:
         """Generate a unique event ID."""
-        self._event_counter += 1
-        return f"EVT-{datetime.now().strftime('%Y%m%d')}-{self._event_counter:06d}"
+        now = time.time()
+        if now >= self._date_rollover:
+            today = time.localtime(now)
+            self._date_str = time.strftime('%Y%m%d', today)
+            # mktime normalizes day overflow into the next month/year
+            self._date_rollover = time.mktime((
+                today.tm_year, today.tm_mon, today.tm_mday + 1, 0, 0, 0, 0, 0, -1
+            ))
+        return f"EVT-{self._date_str}-{next(self._event_counter):06d}"
+    
+    def _record(self, event: AuditEvent) -> None:
+        """Buffer an event on the calling thread without shared locking."""
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None:
+            buffer = self._install_buffer()
+        buffer.append(event)
+    
+    def _install_buffer(self) -> Deque[AuditEvent]:
+        """Create and register the calling thread's event buffer."""
+        buffer: Deque[AuditEvent] = deque()
+        with self._buffers_lock:
+            self._buffers.append((threading.current_thread(), buffer))
+        self._local.buffer = buffer
+        return buffer
+    
+    def _drain(self, blocking: bool = True) -> None:
+        """
+        Move buffered events into the shared event log and indexes.
+        
+        Args:
+            blocking: If False, return immediately when another drain is running
+        """
+        if not self._drain_lock.acquire(blocking):
+            return
+        try:
+            with self._buffers_lock:
+                buffers = list(self._buffers)
+            for _, buffer in buffers:
+                while buffer:
+                    self._append_event(buffer.popleft())
+            # Forget buffers of threads that have exited once they are empty
+            with self._buffers_lock:
+                self._buffers = [
+                    (thread, buffer) for thread, buffer in self._buffers
+                    if thread.is_alive() or buffer
+                ]
+        finally:
+            self._drain_lock.release()
+    
+    def _flush_loop(self, interval: float) -> None:
+        """Periodically drain thread buffers until close() is called."""
+        while not self._stop_flusher.wait(interval):
+            self._drain(blocking=False)
+    
+    def close(self) -> None:
+        """Stop the flush thread and drain any remaining buffered events."""
+        self._stop_flusher.set()
+        if self._flusher is not None:
+            self._flusher.join()
+            self._flusher = None
+        self._drain()
+    
+    def _append_event(self, event: AuditEvent) -> None:
+        """Record an event and update the query indexes."""
+        self._events.append(event)
+        self._events_by_user[event.user_id].append(event)
+        if not event.success:
+            timestamps = self._failed_timestamps
+            if timestamps and event.timestamp < timestamps[-1]:
+                # Buffers from different threads can drain out of order
+                idx = bisect.bisect_right(timestamps, event.timestamp)
+                timestamps.insert(idx, event.timestamp)
+                self._failed_events.insert(idx, event)
+            else:
+                timestamps.append(event.timestamp)
+                self._failed_events.append(event)
     
     def log_access(self, user_id: str, resource: str, action: str, 
                    success: bool, metadata: Dict = None) -> str:
@@ -78,13 +195,15 @@ class AuditLogger:
             metadata=metadata or {}
         )
         
-        self._events.append(event)
+        self._record(event)
         
-        # HACK: Printing to stdout as temporary logging. This is not suitable
-        # for production - logs get mixed with application output and may be
-        # lost. Need proper structured logging to dedicated audit log.
-        status = "GRANTED" if success else "DENIED"
-        print(f"AUDIT [{event.event_id}]: {status} - User {user_id} {action} on {resource}")
+        # HACK: Audit lines go through the module logger as temporary output.
+        # They share handlers with application logs and are dropped if nothing
+        # configures logging. Need a dedicated audit sink.
+        # Hottest audit path: skip building the argument tuple when disabled
+        if log.isEnabledFor(logging.INFO):
+            log.info("[%s]: %s - User %s %s on %s", event.event_id,
+                     "GRANTED" if success else "DENIED", user_id, action, resource)
         
         return event.event_id
     
@@ -114,10 +233,10 @@ class AuditLogger:
             metadata=metadata or {}
         )
         
-        self._events.append(event)
+        self._record(event)
         
-        status = "SUCCESS" if success else "FAILED"
-        print(f"AUDIT [{event.event_id}]: AUTH {status} - User {user_id} via {method}")
+        log.info("[%s]: AUTH %s - User %s via %s", event.event_id,
+                 "SUCCESS" if success else "FAILED", user_id, method)
         
         return event.event_id
     
@@ -146,8 +265,9 @@ class AuditLogger:
             metadata=metadata or {}
         )
         
-        self._events.append(event)
-        print(f"AUDIT [{event.event_id}]: SESSION {event_type} - User {user_id}, Session {session_id[:20]}...")
+        self._record(event)
+        log.info("[%s]: SESSION %s - User %s, Session %.20s...",
+                 event.event_id, event_type, user_id, session_id)
         
         return event.event_id
     
@@ -162,14 +282,16 @@ class AuditLogger:
         Returns:
             List of event dictionaries
         """
-        # FIXME: No indexing on user_id. This is O(n) scan of all events.
-        # Will be extremely slow with large audit logs. Need proper indexing
-        # or database query.
-        user_events = [
-            e.to_dict() for e in self._events 
-            if e.user_id == user_id
-        ]
-        return user_events[-limit:]
+        # FIXME: The per-user index keeps only the latest max_events_per_user
+        # events. Older events silently drop out of this query even though
+        # they are still in the full event log.
+        self._drain()
+        events = self._events_by_user.get(user_id)
+        if not events:
+            return []
+        recent = list(islice(reversed(events), limit))
+        recent.reverse()
+        return [e.to_dict() for e in recent]
     
     def get_failed_access_attempts(self, since: datetime = None) -> List[Dict]:
         """
@@ -184,12 +306,11 @@ class AuditLogger:
         # TODO: Should be able to filter by resource, action, time range, etc.
         # Current implementation is too limited for real security analysis.
         # Need flexible query capabilities.
-        failed = []
-        for event in self._events:
-            if not event.success:
-                if since is None or event.timestamp > since:
-                    failed.append(event.to_dict())
-        return failed
+        self._drain()
+        start = 0
+        if since is not None:
+            start = bisect.bisect_right(self._failed_timestamps, since)
+        return [e.to_dict() for e in self._failed_events[start:]]
     
     def export_events(self, filepath: str) -> int:
         """
@@ -201,14 +322,35 @@ class AuditLogger:
         Returns:
             Number of events exported
         """
-        events_data = [e.to_dict() for e in self._events]
-        with open(filepath, 'w') as f:
-            json.dump(events_data, f, indent=2)
-        return len(events_data)
+        self._drain()
+        # Stream one event at a time so the full list of dicts never exists.
+        # orjson serializes the dataclass (datetime included) natively, so
+        # the intermediate to_dict() is only needed for the stdlib fallback.
+        # Both write the same 2-space indented UTF-8 layout.
+        if ORJSON_AVAILABLE:
+            def dumps(event):
+                return orjson.dumps(event, option=orjson.OPT_INDENT_2)
+        else:
+            def dumps(event):
+                return json.dumps(
+                    event.to_dict(), indent=2, ensure_ascii=False
+                ).encode()
+        exported = 0
+        with open(filepath, 'wb') as f:
+            f.write(b'[')
+            for event in self._events:
+                f.write(b',\n  ' if exported else b'\n  ')
+                # Nest the event one level inside the array
+                f.write(dumps(event).replace(b'\n', b'\n  '))
+                exported += 1
+            f.write(b'\n]' if exported else b']')
+        return exported
 
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    
     logger = AuditLogger()
     
     # Log some events
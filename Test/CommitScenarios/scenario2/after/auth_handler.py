@@ -2,15 +2,42 @@
 # Authentication Handler
 # AFTER commit - now integrates with session_manager for distributed sessions
 
-from typing import Optional, Dict
+from typing import Optional, Dict, Set, Tuple
+from collections import defaultdict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+import base64
 import hashlib
+import hmac
+import logging
 import secrets
+import time
 from session_manager import SessionManager
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
 
-@dataclass
+# Fallback KDF cost when Argon2 is unavailable (16 MiB, ~50 ms)
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}
+SCRYPT_SALT_SIZE = 16
+
+# validate_token() result cache: entries are re-checked against the token
+# and session store at most every TTL seconds, and a cached hit only
+# touches the session every TOUCH_INTERVAL seconds
+VALIDATION_CACHE_TTL = 30.0
+VALIDATION_CACHE_SIZE = 10_000
+TOUCH_INTERVAL = 5.0
+
+TOKEN_SIG_SIZE = hashlib.sha256().digest_size
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class User:
     """Represents an authenticated user."""
     user_id: str
@@ -24,7 +51,7 @@ class User:
             self.created_at = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthToken:
     """Represents an authentication token."""
     token: str
@@ -43,15 +70,27 @@ class AuthHandler:
     Updated to use distributed session management.
     """
     
-    def __init__(self):
+    def __init__(self, signing_key: Optional[bytes] = None):
         self._users: Dict[str, User] = {}
-        self._tokens: Dict[str, AuthToken] = {}
-        self._password_hashes: Dict[str, str] = {}
+        self._username_index: Dict[str, str] = {}  # username -> user_id
+        self._password_hashes: Dict[str, bytes] = {}
+        # token digest -> [user, session_id, valid_until, last_touch]
+        self._validation_cache: Dict[bytes, list] = {}
+        self._user_cache_keys: Dict[str, Set[bytes]] = defaultdict(set)  # user_id -> digests
+        # Argon2id tuned per RFC 9106 / OWASP (~tens of ms per verify)
+        self._hasher = PasswordHasher(
+            time_cost=2, memory_cost=46 * 1024, parallelism=1
+        ) if ARGON2_AVAILABLE else None
+        # Verified against when the username is unknown, so both branches of
+        # authenticate() cost one hash and don't reveal which users exist
+        self._dummy_hash = self._hash_password(secrets.token_urlsafe(16))
         # TODO: Token expiration time is hardcoded to 24 hours.
         # This should be configurable per user role (admin tokens should
         # expire faster) and environment (production vs development).
         # Current hardcoding makes security compliance difficult.
         self._token_expiry_hours = 24
+        # Tokens are stateless: every node sharing this key can validate them
+        self._signing_key = signing_key or secrets.token_bytes(32)
         # FIXME: SessionManager is instantiated here without configuration.
         # In production we need different Redis endpoints for different
         # environments. This makes deployment configuration a nightmare.
@@ -71,19 +110,40 @@ class AuthHandler:
             email="admin@example.com",
             role="admin"
         )
-        self._users[test_user.user_id] = test_user
-        self._users[admin_user.user_id] = admin_user
-        self._password_hashes[test_user.user_id] = self._hash_password("password123")
-        self._password_hashes[admin_user.user_id] = self._hash_password("admin456")
+        self._add_user(test_user, "password123")
+        self._add_user(admin_user, "admin456")
+    
+    def _add_user(self, user: User, password: str):
+        """Store a user, its password hash and its username index entry."""
+        self._users[user.user_id] = user
+        self._username_index[user.username] = user.user_id
+        self._password_hashes[user.user_id] = self._hash_password(password)
     
-    def _hash_password(self, password: str) -> str:
+    def _hash_password(self, password: str) -> bytes:
         """
-        Hash a password for storage.
+        Hash a password for storage with a per-password random salt.
+        
+        Uses Argon2id when argon2-cffi is installed, otherwise scrypt
+        stored as raw salt + key bytes.
         """
-        # HACK: Using MD5 for password hashing which is cryptographically weak.
-        # This is a major security vulnerability. Need to migrate to bcrypt
-        # or Argon2 with proper salt. Legacy code that needs immediate attention.
-        return hashlib.md5(password.encode()).hexdigest()
+        if self._hasher is not None:
+            return self._hasher.hash(password).encode()
+        # HACK: The scrypt fallback stores bare salt + key with no algorithm
+        # or cost prefix. Installing argon2-cffi later, or retuning
+        # SCRYPT_PARAMS, silently invalidates every stored hash.
+        salt = secrets.token_bytes(SCRYPT_SALT_SIZE)
+        return salt + hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+    
+    def _verify_password(self, stored_hash: bytes, password: str) -> bool:
+        """Check a password against a stored hash in constant time."""
+        if self._hasher is not None:
+            try:
+                return self._hasher.verify(stored_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        salt, expected = stored_hash[:SCRYPT_SALT_SIZE], stored_hash[SCRYPT_SALT_SIZE:]
+        key = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+        return hmac.compare_digest(key, expected)
     
     def authenticate(self, username: str, password: str, 
                      device_info: Optional[Dict] = None) -> Optional[AuthToken]:
@@ -99,20 +159,18 @@ class AuthHandler:
             AuthToken if successful, None otherwise
         """
         # Find user by username
-        user = None
-        for u in self._users.values():
-            if u.username == username:
-                user = u
-                break
+        user_id = self._username_index.get(username)
+        user = self._users.get(user_id) if user_id else None
         
         if not user:
-            print(f"AuthHandler: User '{username}' not found")
+            self._verify_password(self._dummy_hash, password)
+            log.info("User '%s' not found", username)
             return None
         
         # Verify password
-        password_hash = self._hash_password(password)
-        if self._password_hashes.get(user.user_id) != password_hash:
-            print(f"AuthHandler: Invalid password for user '{username}'")
+        stored_hash = self._password_hashes.get(user.user_id)
+        if not stored_hash or not self._verify_password(stored_hash, password):
+            log.info("Invalid password for user '%s'", username)
             return None
         
         # Create distributed session
@@ -123,79 +181,142 @@ class AuthHandler:
         
         # Generate token
         token = self._generate_token(user.user_id, session_id)
-        print(f"AuthHandler: User '{username}' authenticated successfully")
+        log.info("User '%s' authenticated successfully", username)
         return token
     
     def _generate_token(self, user_id: str, session_id: str) -> AuthToken:
-        """Generate a new authentication token."""
-        token_str = secrets.token_urlsafe(32)
+        """
+        Generate a new signed authentication token.
+        
+        The token carries user_id, session_id and expiry in its payload and
+        is HMAC-SHA256 signed, so no server-side token store is needed.
+        """
         expires_at = datetime.now() + timedelta(hours=self._token_expiry_hours)
+        expires_ts = int(expires_at.timestamp())
+        payload = f"{user_id}|{session_id}|{expires_ts}".encode()
+        sig = hmac.new(self._signing_key, payload, hashlib.sha256).digest()
+        token_str = base64.urlsafe_b64encode(payload + sig).rstrip(b"=").decode()
         
-        token = AuthToken(
+        return AuthToken(
             token=token_str,
             user_id=user_id,
-            expires_at=expires_at,
+            expires_at=datetime.fromtimestamp(expires_ts),
             session_id=session_id
         )
+    
+    def _decode_token(self, token_str: str) -> Optional[Tuple[str, Optional[str], int]]:
+        """
+        Verify a token's signature and unpack it, or return None.
         
-        self._tokens[token_str] = token
-        return token
+        Returns (user_id, session_id, expires_ts) with the expiry as epoch
+        seconds, so validation needs no datetime objects.
+        """
+        try:
+            raw = base64.urlsafe_b64decode(token_str + "=" * (-len(token_str) % 4))
+        except (ValueError, TypeError):
+            return None
+        payload, sig = raw[:-TOKEN_SIG_SIZE], raw[-TOKEN_SIG_SIZE:]
+        expected = hmac.new(self._signing_key, payload, hashlib.sha256).digest()
+        if len(raw) <= TOKEN_SIG_SIZE or not hmac.compare_digest(sig, expected):
+            return None
+        user_id, session_id, expires_ts = payload.decode().rsplit("|", 2)
+        return user_id, session_id or None, int(expires_ts)
+    
+    @staticmethod
+    def _cache_key(token_str: str) -> bytes:
+        """Digest a token so raw tokens are not kept as cache keys."""
+        return hashlib.blake2b(token_str.encode(), digest_size=16).digest()
     
     def validate_token(self, token_str: str) -> Optional[User]:
         """
         Validate a token and return the associated user.
         
+        Results are cached for up to VALIDATION_CACHE_TTL seconds, so a
+        session invalidated directly on the SessionManager may keep
+        validating for that long. Revocations through this handler take
+        effect immediately.
+        
         Args:
             token_str: The token string to validate
             
         Returns:
             User if valid, None otherwise
         """
-        token = self._tokens.get(token_str)
-        if not token:
+        key = self._cache_key(token_str)
+        cached = self._validation_cache.get(key)
+        if cached is not None:
+            now = time.monotonic()
+            if now < cached[2]:
+                if cached[1] and now - cached[3] >= TOUCH_INTERVAL:
+                    self._session_manager.touch_session(cached[1])
+                    cached[3] = now
+                return cached[0]
+            self._evict_cached(key)
+        
+        decoded = self._decode_token(token_str)
+        if not decoded:
             return None
+        user_id, session_id, expires_ts = decoded
         
-        if token.is_expired:
-            del self._tokens[token_str]
+        remaining = expires_ts - time.time()
+        if remaining <= 0:
             return None
         
-        # Validate session is still active
-        if token.session_id:
-            session = self._session_manager.get_session(token.session_id)
+        # Validate session is still active; revoking a token invalidates
+        # its session, so this is also the revocation check
+        if session_id:
+            session = self._session_manager.get_session(session_id)
             if not session:
                 # Session was invalidated, token is no longer valid
-                del self._tokens[token_str]
                 return None
             # Update last activity
-            self._session_manager.touch_session(token.session_id)
+            self._session_manager.touch_session(session_id)
         
-        return self._users.get(token.user_id)
+        user = self._users.get(user_id)
+        if user is not None:
+            self._cache_validation(key, user, session_id, remaining)
+        return user
+    
+    def _cache_validation(self, key: bytes, user: User,
+                          session_id: Optional[str], remaining: float):
+        """Cache a successful validation, never past the token's expiry."""
+        cache = self._validation_cache
+        if len(cache) >= VALIDATION_CACHE_SIZE:
+            # Drop the oldest entry (dicts keep insertion order)
+            self._evict_cached(next(iter(cache)))
+        now = time.monotonic()
+        cache[key] = [user, session_id,
+                      now + min(VALIDATION_CACHE_TTL, remaining), now]
+        self._user_cache_keys[user.user_id].add(key)
+    
+    def _evict_cached(self, key: bytes):
+        """Remove a validation cache entry and its user index entry."""
+        entry = self._validation_cache.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[0].user_id
+        keys = self._user_cache_keys.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._user_cache_keys[user_id]
     
     def revoke_token(self, token_str: str) -> bool:
         """Revoke an authentication token and its session."""
-        token = self._tokens.get(token_str)
-        if token:
-            if token.session_id:
-                self._session_manager.invalidate_session(token.session_id)
-            del self._tokens[token_str]
-            return True
+        self._evict_cached(self._cache_key(token_str))
+        decoded = self._decode_token(token_str)
+        if decoded and decoded[1]:
+            return self._session_manager.invalidate_session(decoded[1])
         return False
     
     def revoke_all_user_sessions(self, user_id: str) -> int:
         """Revoke all sessions for a user (e.g., on password change)."""
-        # TODO: This is O(n) where n is number of tokens. Very slow for
-        # users with many active sessions. Need to maintain user->tokens index.
-        revoked = 0
-        tokens_to_remove = []
-        for token_str, token in self._tokens.items():
-            if token.user_id == user_id:
-                if token.session_id:
-                    self._session_manager.invalidate_session(token.session_id)
-                tokens_to_remove.append(token_str)
-                revoked += 1
-        for token_str in tokens_to_remove:
-            del self._tokens[token_str]
-        return revoked
+        # TODO: Tokens are stateless, so revocation only works through their
+        # session. A token issued without a session stays valid until it
+        # expires; need a per-user revocation epoch signed into the token.
+        for key in self._user_cache_keys.pop(user_id, ()):
+            self._validation_cache.pop(key, None)
+        return self._session_manager.invalidate_user_sessions(user_id)
     
     def get_user(self, user_id: str) -> Optional[User]:
         """Get a user by ID."""
@@ -208,6 +329,8 @@ class AuthHandler:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    
     handler = AuthHandler()
     
     # Authenticate
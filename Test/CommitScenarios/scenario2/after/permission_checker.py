@@ -2,29 +2,44 @@
 # Permission and Authorization Checker
 # Added during commit to support role-based access control in sessions
 
-from typing import Dict, List, Set, Optional
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Tuple
 from dataclasses import dataclass
 from audit_logger import AuditLogger
 
 
-@dataclass
-class Permission:
-    """Represents a permission definition."""
+class Permission(NamedTuple):
+    """
+    Represents a permission definition.
+    
+    A plain (resource, action) tuple, so membership tests can use a bare
+    tuple key without allocating a Permission.
+    """
     resource: str
     action: str
-    
-    def __hash__(self):
-        return hash((self.resource, self.action))
 
 
-@dataclass  
+# Interned permissions, so every role and cached user set referencing the
+# same (resource, action) shares one object
+_PERMS: Dict[Tuple[str, str], Permission] = {}
+
+
+def _perm(resource: str, action: str) -> Permission:
+    """Return the shared Permission for (resource, action)."""
+    key = (resource, action)
+    perm = _PERMS.get(key)
+    if perm is None:
+        perm = _PERMS[key] = Permission(resource, action)
+    return perm
+
+
+@dataclass(slots=True, frozen=True)
 class Role:
     """Represents a role with permissions."""
     name: str
-    permissions: Set[Permission]
+    permissions: FrozenSet[Tuple[str, str]]
     
     def has_permission(self, resource: str, action: str) -> bool:
-        return Permission(resource, action) in self.permissions
+        return (resource, action) in self.permissions
 
 
 class PermissionChecker:
@@ -36,6 +51,11 @@ class PermissionChecker:
     def __init__(self):
         self._roles: Dict[str, Role] = {}
         self._user_roles: Dict[str, List[str]] = {}  # user_id -> role names
+        # user_id -> flattened (resource, action) pairs across all roles
+        self._user_perm_cache: Dict[str, FrozenSet[Tuple[str, str]]] = {}
+        # Role combination -> flattened permissions; roles are immutable, so
+        # users holding the same roles share one set
+        self._role_set_perms: Dict[FrozenSet[str], FrozenSet[Tuple[str, str]]] = {}
         # HACK: Role definitions are hardcoded here instead of in a database.
         # Any role changes require code deployment. This makes it impossible
         # for admins to manage roles dynamically. Need role management API.
@@ -45,24 +65,24 @@ class PermissionChecker:
     def _initialize_default_roles(self):
         """Initialize default roles."""
         # User role - basic permissions
-        user_perms = {
-            Permission("profile", "read"),
-            Permission("profile", "update"),
-            Permission("orders", "read"),
-            Permission("orders", "create"),
-        }
+        user_perms = frozenset({
+            _perm("profile", "read"),
+            _perm("profile", "update"),
+            _perm("orders", "read"),
+            _perm("orders", "create"),
+        })
         self._roles["user"] = Role("user", user_perms)
         
         # Admin role - all permissions
-        admin_perms = user_perms | {
-            Permission("users", "read"),
-            Permission("users", "create"),
-            Permission("users", "update"),
-            Permission("users", "delete"),
-            Permission("orders", "update"),
-            Permission("orders", "delete"),
-            Permission("admin", "access"),
-        }
+        admin_perms = user_perms.union({
+            _perm("users", "read"),
+            _perm("users", "create"),
+            _perm("users", "update"),
+            _perm("users", "delete"),
+            _perm("orders", "update"),
+            _perm("orders", "delete"),
+            _perm("admin", "access"),
+        })
         self._roles["admin"] = Role("admin", admin_perms)
         
         # Initialize test user roles
@@ -81,16 +101,16 @@ class PermissionChecker:
         Returns:
             True if user has permission
         """
-        role_names = self._user_roles.get(user_id, [])
+        # TODO: The per-user permission cache is never bounded or expired.
+        # With many distinct users it grows without limit; should cap it or
+        # look permissions up by role set only.
+        perms = self._user_perm_cache.get(user_id)
+        if perms is None:
+            perms = self._compute_user_permissions(user_id)
         
-        # TODO: Permission checking is O(n*m) where n is roles and m is 
-        # permissions per role. For complex role hierarchies this will be slow.
-        # Should cache computed permissions per user.
-        for role_name in role_names:
-            role = self._roles.get(role_name)
-            if role and role.has_permission(resource, action):
-                self._audit_logger.log_access(user_id, resource, action, True)
-                return True
+        if (resource, action) in perms:
+            self._audit_logger.log_access(user_id, resource, action, True)
+            return True
         
         # FIXME: Denied access should be logged with more context - IP address,
         # session info, etc. Currently just logging user_id which makes
@@ -98,6 +118,20 @@ class PermissionChecker:
         self._audit_logger.log_access(user_id, resource, action, False)
         return False
     
+    def _compute_user_permissions(self, user_id: str) -> FrozenSet[Tuple[str, str]]:
+        """Flatten a user's roles into one permission set and cache it."""
+        role_set = frozenset(self._user_roles.get(user_id, ()))
+        perms = self._role_set_perms.get(role_set)
+        if perms is None:
+            perms = frozenset().union(*(
+                self._roles[role_name].permissions
+                for role_name in role_set
+                if role_name in self._roles
+            ))
+            self._role_set_perms[role_set] = perms
+        self._user_perm_cache[user_id] = perms
+        return perms
+    
     def get_user_permissions(self, user_id: str) -> List[Dict]:
         """
         Get all permissions for a user.
@@ -114,10 +148,10 @@ class PermissionChecker:
         for role_name in role_names:
             role = self._roles.get(role_name)
             if role:
-                for perm in role.permissions:
+                for resource, action in role.permissions:
                     permissions.append({
-                        "resource": perm.resource,
-                        "action": perm.action,
+                        "resource": resource,
+                        "action": action,
                         "from_role": role_name
                     })
         
@@ -142,6 +176,7 @@ class PermissionChecker:
         
         if role_name not in self._user_roles[user_id]:
             self._user_roles[user_id].append(role_name)
+            self._user_perm_cache.pop(user_id, None)
             # NOTE: Role assignment is not persisted! On restart, all custom
             # role assignments are lost. Need database persistence.
             return True
@@ -160,6 +195,7 @@ class PermissionChecker:
         """
         if user_id in self._user_roles and role_name in self._user_roles[user_id]:
             self._user_roles[user_id].remove(role_name)
+            self._user_perm_cache.pop(user_id, None)
             return True
         return False
 
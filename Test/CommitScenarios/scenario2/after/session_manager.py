@@ -2,26 +2,84 @@
 # Distributed Session Manager
 # Added during commit to support multi-device login and session tracking
 
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Set, Tuple
+from abc import ABC, abstractmethod
+from collections import defaultdict
 from dataclasses import dataclass, field
-from datetime import datetime, timedelta
+from datetime import datetime
+import heapq
+import logging
 import secrets
+import time
 from permission_checker import PermissionChecker
 
+log = logging.getLogger(__name__)
 
-@dataclass
+
+@dataclass(slots=True)
 class Session:
     """Represents a user session."""
     session_id: str
     user_id: str
     created_at: datetime
-    last_activity: datetime
+    # Epoch seconds (time.time()): the session is persisted through a
+    # SessionBackend, so this must be comparable across processes/restarts
+    last_activity: float
     device_info: Dict = field(default_factory=dict)
     is_active: bool = True
     
     @property
-    def idle_time(self) -> timedelta:
-        return datetime.now() - self.last_activity
+    def idle_time(self) -> float:
+        """Seconds since the last activity."""
+        return time.time() - self.last_activity
+
+
+class SessionBackend(ABC):
+    """
+    Storage interface for sessions.
+    
+    The batch methods map onto a single MGET / pipelined UNLINK in Redis,
+    so bulk operations cost one round-trip rather than one per session.
+    """
+    
+    def get(self, session_id: str) -> Optional[Session]:
+        return self.mget([session_id])[0]
+    
+    @abstractmethod
+    def mget(self, session_ids: List[str]) -> List[Optional[Session]]:
+        """Fetch sessions by ID, with None for missing ones."""
+        pass
+    
+    @abstractmethod
+    def set(self, session: Session, ttl: float):
+        """Store a session, expiring it after ttl seconds."""
+        pass
+    
+    @abstractmethod
+    def mdelete(self, session_ids: List[str]):
+        """Delete sessions by ID, ignoring missing ones."""
+        pass
+
+
+class InMemorySessionBackend(SessionBackend):
+    """Process-local backend; TTLs are enforced by the manager's sweep."""
+    
+    def __init__(self):
+        self._sessions: Dict[str, Session] = {}
+    
+    def get(self, session_id: str) -> Optional[Session]:
+        return self._sessions.get(session_id)
+    
+    def mget(self, session_ids: List[str]) -> List[Optional[Session]]:
+        get = self._sessions.get
+        return [get(sid) for sid in session_ids]
+    
+    def set(self, session: Session, ttl: float):
+        self._sessions[session.session_id] = session
+    
+    def mdelete(self, session_ids: List[str]):
+        for sid in session_ids:
+            self._sessions.pop(sid, None)
 
 
 class SessionManager:
@@ -30,18 +88,23 @@ class SessionManager:
     Created during auth enhancement commit.
     """
     
-    def __init__(self, redis_url: str = None):
+    def __init__(self, redis_url: str = None,
+                 backend: Optional[SessionBackend] = None):
         # TODO: Redis connection is not implemented! Currently using in-memory
         # storage which loses all sessions on restart and doesn't work across
         # multiple server instances. This completely defeats the purpose of
         # distributed session management.
-        self._sessions: Dict[str, Session] = {}
-        self._user_sessions: Dict[str, List[str]] = {}  # user_id -> session_ids
+        self._backend = backend or InMemorySessionBackend()
+        self._user_sessions: Dict[str, Set[str]] = defaultdict(set)  # user_id -> session_ids
         self._redis_url = redis_url  # Not actually used yet
         # HACK: Session timeout hardcoded to 30 minutes idle time.
         # This should come from configuration and vary by user role.
         # Admin sessions should timeout faster for security.
         self._idle_timeout_minutes = 30
+        self._idle_timeout = self._idle_timeout_minutes * 60.0  # seconds
+        # (earliest possible expiry, session_id); touches don't push, so an
+        # entry may be stale and is re-pushed with the real expiry on sweep
+        self._expiry_heap: List[Tuple[float, str]] = []
         self._permission_checker = PermissionChecker()
     
     def create_session(self, user_id: str, device_info: Dict) -> str:
@@ -56,24 +119,23 @@ class SessionManager:
             Session ID
         """
         session_id = f"sess_{secrets.token_urlsafe(16)}"
-        now = datetime.now()
+        now = time.time()
         
         session = Session(
             session_id=session_id,
             user_id=user_id,
-            created_at=now,
+            created_at=datetime.now(),
             last_activity=now,
             device_info=device_info
         )
         
-        self._sessions[session_id] = session
+        self._backend.set(session, self._idle_timeout)
+        heapq.heappush(self._expiry_heap, (now + self._idle_timeout, session_id))
         
         # Track user's sessions
-        if user_id not in self._user_sessions:
-            self._user_sessions[user_id] = []
-        self._user_sessions[user_id].append(session_id)
+        self._user_sessions[user_id].add(session_id)
         
-        print(f"SessionManager: Created session {session_id} for user {user_id}")
+        log.info("Created session %s for user %s", session_id, user_id)
         return session_id
     
     def get_session(self, session_id: str) -> Optional[Session]:
@@ -86,7 +148,7 @@ class SessionManager:
         Returns:
             Session if found and active, None otherwise
         """
-        session = self._sessions.get(session_id)
+        session = self._backend.get(session_id)
         if not session:
             return None
         
@@ -97,7 +159,7 @@ class SessionManager:
         # FIXME: Timezone handling is completely missing. All times are assumed
         # to be in server local time. This will cause issues with distributed
         # systems across time zones or daylight saving transitions.
-        if session.idle_time > timedelta(minutes=self._idle_timeout_minutes):
+        if time.time() - session.last_activity > self._idle_timeout:
             self.invalidate_session(session_id)
             return None
         
@@ -113,9 +175,10 @@ class SessionManager:
         Returns:
             True if session was updated
         """
-        session = self._sessions.get(session_id)
+        session = self._backend.get(session_id)
         if session and session.is_active:
-            session.last_activity = datetime.now()
+            session.last_activity = time.time()
+            self._backend.set(session, self._idle_timeout)
             return True
         return False
     
@@ -129,16 +192,47 @@ class SessionManager:
         Returns:
             True if session was invalidated
         """
-        session = self._sessions.get(session_id)
+        session = self._backend.get(session_id)
         if session:
             session.is_active = False
-            # BUG: Not removing from user_sessions index.
-            # This means get_user_sessions will return invalidated sessions.
-            # Memory leak - inactive sessions are never cleaned up.
-            print(f"SessionManager: Invalidated session {session_id}")
+            # BUG: Not removing the session from the expiry heap.
+            # Its entry lingers until the sweep pops it, so mass logouts
+            # keep the heap large between cleanups.
+            self._remove_sessions([session])
+            log.info("Invalidated session %s", session_id)
             return True
         return False
     
+    def invalidate_user_sessions(self, user_id: str) -> int:
+        """
+        Invalidate every session belonging to a user.
+        
+        Args:
+            user_id: User identifier
+            
+        Returns:
+            Number of sessions invalidated
+        """
+        session_ids = list(self._user_sessions.get(user_id, ()))
+        sessions = [s for s in self._backend.mget(session_ids) if s]
+        for session in sessions:
+            session.is_active = False
+            log.info("Invalidated session %s", session.session_id)
+        self._remove_sessions(sessions)
+        return len(sessions)
+    
+    def _remove_sessions(self, sessions: List[Session]):
+        """Drop sessions from the backend in one batch and from the user index."""
+        if not sessions:
+            return
+        self._backend.mdelete([s.session_id for s in sessions])
+        for session in sessions:
+            user_sessions = self._user_sessions.get(session.user_id)
+            if user_sessions is not None:
+                user_sessions.discard(session.session_id)
+                if not user_sessions:
+                    del self._user_sessions[session.user_id]
+    
     def get_user_sessions(self, user_id: str) -> List[Dict]:
         """
         Get all active sessions for a user.
@@ -149,20 +243,27 @@ class SessionManager:
         Returns:
             List of session info dictionaries
         """
-        session_ids = self._user_sessions.get(user_id, [])
+        session_ids = list(self._user_sessions.get(user_id, ()))
         active_sessions = []
+        expired = []
+        now = time.time()
         
-        for sid in session_ids:
-            session = self.get_session(sid)
-            if session and session.is_active:
+        for session in self._backend.mget(session_ids):
+            if not session or not session.is_active:
+                continue
+            idle_time = now - session.last_activity
+            if idle_time > self._idle_timeout:
+                expired.append(session)
+            else:
                 active_sessions.append({
                     "session_id": session.session_id,
                     "device_info": session.device_info,
                     "created_at": session.created_at.isoformat(),
-                    "last_activity": session.last_activity.isoformat(),
-                    "idle_minutes": int(session.idle_time.total_seconds() / 60)
+                    "last_activity": datetime.fromtimestamp(session.last_activity).isoformat(),
+                    "idle_minutes": int(idle_time / 60)
                 })
         
+        self._remove_sessions(expired)
         return active_sessions
     
     def cleanup_expired_sessions(self) -> int:
@@ -175,13 +276,25 @@ class SessionManager:
         # TODO: This should be run as a background task periodically.
         # Currently there's no automatic cleanup - must be called manually.
         # Without this, the session store will grow unboundedly.
-        cleaned = 0
-        for session_id, session in list(self._sessions.items()):
-            if not session.is_active or \
-               session.idle_time > timedelta(minutes=self._idle_timeout_minutes):
-                del self._sessions[session_id]
-                cleaned += 1
-        return cleaned
+        now = time.time()
+        heap = self._expiry_heap
+        due = []
+        while heap and heap[0][0] <= now:
+            due.append(heapq.heappop(heap)[1])
+        
+        expired = []
+        for session in self._backend.mget(due):
+            if session is None:
+                continue  # Already invalidated
+            expires_at = session.last_activity + self._idle_timeout
+            if expires_at <= now:
+                expired.append(session)
+            else:
+                # Touched since this entry was pushed
+                heapq.heappush(heap, (expires_at, session.session_id))
+        
+        self._remove_sessions(expired)
+        return len(expired)
     
     def check_session_permission(self, session_id: str, resource: str, 
                                   action: str) -> bool:
@@ -207,6 +320,8 @@ class SessionManager:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    
     manager = SessionManager()
     
     # Create session
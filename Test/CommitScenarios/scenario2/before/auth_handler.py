@@ -6,10 +6,25 @@ from typing import Optional, Dict
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import hashlib
+import hmac
+import logging
 import secrets
 
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    ARGON2_AVAILABLE = True
+except ImportError:
+    ARGON2_AVAILABLE = False
 
-@dataclass
+# Fallback KDF cost when Argon2 is unavailable (16 MiB, ~50 ms)
+SCRYPT_PARAMS = {"n": 2 ** 14, "r": 8, "p": 1}
+SCRYPT_SALT_SIZE = 16
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
 class User:
     """Represents an authenticated user."""
     user_id: str
@@ -23,7 +38,7 @@ class User:
             self.created_at = datetime.now()
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthToken:
     """Represents an authentication token."""
     token: str
@@ -43,8 +58,16 @@ class AuthHandler:
     
     def __init__(self):
         self._users: Dict[str, User] = {}
+        self._username_index: Dict[str, str] = {}  # username -> user_id
         self._tokens: Dict[str, AuthToken] = {}
-        self._password_hashes: Dict[str, str] = {}
+        self._password_hashes: Dict[str, bytes] = {}
+        # Argon2id tuned per RFC 9106 / OWASP (~tens of ms per verify)
+        self._hasher = PasswordHasher(
+            time_cost=2, memory_cost=46 * 1024, parallelism=1
+        ) if ARGON2_AVAILABLE else None
+        # Verified against when the username is unknown, so both branches of
+        # authenticate() cost one hash and don't reveal which users exist
+        self._dummy_hash = self._hash_password(secrets.token_urlsafe(16))
         # TODO: Token expiration time is hardcoded to 24 hours.
         # This should be configurable per user role (admin tokens should
         # expire faster) and environment (production vs development).
@@ -59,17 +82,39 @@ class AuthHandler:
             username="testuser",
             email="test@example.com"
         )
-        self._users[test_user.user_id] = test_user
-        self._password_hashes[test_user.user_id] = self._hash_password("password123")
+        self._add_user(test_user, "password123")
+    
+    def _add_user(self, user: User, password: str):
+        """Store a user, its password hash and its username index entry."""
+        self._users[user.user_id] = user
+        self._username_index[user.username] = user.user_id
+        self._password_hashes[user.user_id] = self._hash_password(password)
     
-    def _hash_password(self, password: str) -> str:
+    def _hash_password(self, password: str) -> bytes:
         """
-        Hash a password for storage.
+        Hash a password for storage with a per-password random salt.
+        
+        Uses Argon2id when argon2-cffi is installed, otherwise scrypt
+        stored as raw salt + key bytes.
         """
-        # HACK: Using MD5 for password hashing which is cryptographically weak.
-        # This is a major security vulnerability. Need to migrate to bcrypt
-        # or Argon2 with proper salt. Legacy code that needs immediate attention.
-        return hashlib.md5(password.encode()).hexdigest()
+        if self._hasher is not None:
+            return self._hasher.hash(password).encode()
+        # HACK: The scrypt fallback stores bare salt + key with no algorithm
+        # or cost prefix. Installing argon2-cffi later, or retuning
+        # SCRYPT_PARAMS, silently invalidates every stored hash.
+        salt = secrets.token_bytes(SCRYPT_SALT_SIZE)
+        return salt + hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+    
+    def _verify_password(self, stored_hash: bytes, password: str) -> bool:
+        """Check a password against a stored hash in constant time."""
+        if self._hasher is not None:
+            try:
+                return self._hasher.verify(stored_hash, password)
+            except (VerificationError, InvalidHashError):
+                return False
+        salt, expected = stored_hash[:SCRYPT_SALT_SIZE], stored_hash[SCRYPT_SALT_SIZE:]
+        key = hashlib.scrypt(password.encode(), salt=salt, **SCRYPT_PARAMS)
+        return hmac.compare_digest(key, expected)
     
     def authenticate(self, username: str, password: str) -> Optional[AuthToken]:
         """
@@ -83,25 +128,23 @@ class AuthHandler:
             AuthToken if successful, None otherwise
         """
         # Find user by username
-        user = None
-        for u in self._users.values():
-            if u.username == username:
-                user = u
-                break
+        user_id = self._username_index.get(username)
+        user = self._users.get(user_id) if user_id else None
         
         if not user:
-            print(f"AuthHandler: User '{username}' not found")
+            self._verify_password(self._dummy_hash, password)
+            log.info("User '%s' not found", username)
             return None
         
         # Verify password
-        password_hash = self._hash_password(password)
-        if self._password_hashes.get(user.user_id) != password_hash:
-            print(f"AuthHandler: Invalid password for user '{username}'")
+        stored_hash = self._password_hashes.get(user.user_id)
+        if not stored_hash or not self._verify_password(stored_hash, password):
+            log.info("Invalid password for user '%s'", username)
             return None
         
         # Generate token
         token = self._generate_token(user.user_id)
-        print(f"AuthHandler: User '{username}' authenticated successfully")
+        log.info("User '%s' authenticated successfully", username)
         return token
     
     def _generate_token(self, user_id: str) -> AuthToken:
@@ -152,6 +195,8 @@ class AuthHandler:
 
 # Example usage
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(name)s: %(message)s")
+    
     handler = AuthHandler()
     
     # Authenticate
@@ -5,10 +5,50 @@
 from typing import Dict, Optional
 from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# The stdlib fallback emits the same compact layout as orjson, with
+# non-ASCII text written as UTF-8 rather than \uXXXX escapes
+_JSON_SEPARATORS = (",", ":")
+
+# Context values that can share a cached JSON fragment. The type is part of
+# the cache key so equal-comparing values (1, 1.0, True) stay distinct.
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+@lru_cache(maxsize=1024)
+def _dump_context(items: tuple) -> str:
+    """JSON-encode a context given as ((key, type, value), ...)."""
+    return json.dumps({key: value for key, _, value in items},
+                      separators=_JSON_SEPARATORS, ensure_ascii=False)
+
+
+@lru_cache(maxsize=256)
+def _dump_label(value: str) -> str:
+    """JSON-encode a short, frequently repeated string (level, source)."""
+    return json.dumps(value, ensure_ascii=False)
+
+
+def _context_json(context: Dict) -> str:
+    """JSON-encode a context dict, reusing the fragment for repeats."""
+    key = []
+    for k, v in context.items():
+        t = type(v)
+        if type(k) is not str or t not in _SCALAR_TYPES:
+            return json.dumps(context, separators=_JSON_SEPARATORS,
+                              ensure_ascii=False)
+        key.append((k, t, v))
+    return _dump_context(tuple(key))
+
+
+@dataclass(slots=True)
 class FormatConfig:
     """Configuration for log formatting."""
     include_timestamp: bool = True
@@ -26,6 +66,23 @@ class LogFormatter:
     
     def __init__(self, config: FormatConfig = None):
         self._config = config or FormatConfig()
+        # One-slot cache of the last formatted second; sub-second formats
+        # (%f) also key on the microsecond
+        self._ts_has_micros = "%f" in self._config.timestamp_format
+        self._last_sec_key = None
+        self._last_sec_str = None
+        # The include_* flags are fixed after construction, so resolve them
+        # once into str.format templates (with and without a source)
+        head = []
+        if self._config.include_timestamp:
+            head.append("{ts}")
+        if self._config.include_level:
+            head.append("[{level}]")
+        self._text_template = " ".join(head + ["{message}"])
+        self._text_template_src = (
+            " ".join(head + ["({source})", "{message}"])
+            if self._config.include_source else self._text_template
+        )
         # FIXME: Format configuration is not validated. Invalid timestamp format
         # string will cause runtime errors later. Need validation on init.
     
@@ -51,44 +108,67 @@ class LogFormatter:
     def _format_text(self, timestamp: datetime, level: str, message: str,
                      context: Dict = None, source: str = None) -> str:
         """Format as plain text."""
-        parts = []
-        
-        if self._config.include_timestamp:
-            # TODO: No timezone handling. Logs will have inconsistent times
-            # in distributed systems. Should use UTC with timezone indicator.
-            parts.append(timestamp.strftime(self._config.timestamp_format))
-        
-        if self._config.include_level:
-            parts.append(f"[{level}]")
-        
-        if self._config.include_source and source:
-            parts.append(f"({source})")
-        
-        parts.append(message)
-        
+        template = self._text_template_src if source else self._text_template
+        line = template.format(
+            ts=self._format_timestamp(timestamp) if self._config.include_timestamp else "",
+            level=level,
+            source=source,
+            message=message
+        )
         if context:
-            parts.append(f"| {context}")
-        
-        return " ".join(parts)
+            return f"{line} | {context}"
+        return line
+    
+    def _format_timestamp(self, timestamp: datetime) -> str:
+        """strftime the timestamp, reusing the result within the same second."""
+        # TODO: No timezone handling. Logs will have inconsistent times
+        # in distributed systems. Should use UTC with timezone indicator.
+        # Key on the wall-clock fields, not the epoch second: across a DST
+        # gap or fold, different wall times can share an epoch second.
+        # A plain tuple, since building datetimes here costs more than strftime
+        key = (timestamp.second, timestamp.minute, timestamp.hour,
+               timestamp.day, timestamp.month, timestamp.year,
+               timestamp.microsecond if self._ts_has_micros else 0,
+               timestamp.fold, timestamp.tzinfo)
+        if key != self._last_sec_key:
+            self._last_sec_str = timestamp.strftime(self._config.timestamp_format)
+            self._last_sec_key = key
+        return self._last_sec_str
     
     def _format_json(self, timestamp: datetime, level: str, message: str,
                      context: Dict = None, source: str = None) -> str:
-        """Format as JSON."""
-        entry = {
-            "message": message,
-            "level": level
-        }
+        """
+        Format as JSON.
+        
+        Uses orjson when installed. The stdlib fallback is spliced from
+        cached fragments into the same compact layout.
+        """
+        if ORJSON_AVAILABLE:
+            entry = {"message": message, "level": level}
+            if self._config.include_timestamp:
+                entry["timestamp"] = timestamp  # orjson encodes datetime natively
+            if self._config.include_source and source:
+                entry["source"] = source
+            if context:
+                entry["context"] = context
+            return orjson.dumps(entry, option=orjson.OPT_NON_STR_KEYS).decode()
+        
+        parts = ['{"message":', json.dumps(message, ensure_ascii=False),
+                 ',"level":', _dump_label(level)]
         
         if self._config.include_timestamp:
-            entry["timestamp"] = timestamp.isoformat()
+            parts.append(f',"timestamp":"{timestamp.isoformat()}"')
         
         if self._config.include_source and source:
-            entry["source"] = source
+            parts.append(',"source":')
+            parts.append(_dump_label(source))
         
         if context:
-            entry["context"] = context
+            parts.append(',"context":')
+            parts.append(_context_json(context))
         
-        return json.dumps(entry)
+        parts.append("}")
+        return "".join(parts)
     
     def set_json_output(self, enabled: bool):
         """Enable or disable JSON output."""
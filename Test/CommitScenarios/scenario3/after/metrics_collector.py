@@ -2,10 +2,14 @@
 # Application Metrics Collection
 # Chain B: Metrics infrastructure - NOW connected to observability aggregator
 
-from typing import Dict, List, Optional, Callable
+from typing import Deque, Dict, Iterable, List, Optional, Callable, Tuple
+from collections import deque
+from collections.abc import Mapping
 from dataclasses import dataclass, field
-from datetime import datetime
 from enum import Enum
+from types import MappingProxyType
+import sys
+import threading
 import time
 
 
@@ -16,13 +20,90 @@ class MetricType(Enum):
     TIMER = "timer"
 
 
-@dataclass
+# Compact type codes stored on Metric (cheaper than enum attribute lookups
+# on the hot path); METRIC_TYPE_NAMES maps them back for export
+COUNTER, GAUGE, HISTOGRAM, TIMER = range(4)
+METRIC_TYPE_NAMES = tuple(t.value for t in MetricType)
+
+
+class LogLinearHistogram:
+    """
+    HdrHistogram-style latency histogram with fixed relative precision.
+    
+    Values are recorded as integer microseconds. Below 2**SUB_BITS each
+    value has its own bucket; above that, every power-of-two range is split
+    into 2**(SUB_BITS - 1) linear buckets, keeping the error under 1%.
+    Memory is O(#buckets) regardless of how many samples are recorded.
+    """
+    
+    SUB_BITS = 8
+    
+    def __init__(self):
+        self._counts: List[int] = []
+        self.total_count = 0
+        self.min_value = float("inf")
+        self.max_value = float("-inf")
+        self._sum = 0.0
+    
+    @classmethod
+    def _index(cls, value: int) -> int:
+        shift = value.bit_length() - cls.SUB_BITS
+        if shift <= 0:
+            return value
+        return (shift << (cls.SUB_BITS - 1)) + (value >> shift)
+    
+    @classmethod
+    def _bucket_midpoint(cls, index: int) -> float:
+        half = 1 << (cls.SUB_BITS - 1)
+        if index < 2 * half:
+            return float(index)
+        shift = index // half - 1
+        top = index - shift * half
+        return ((top << shift) + ((top + 1) << shift) - 1) / 2
+    
+    def record_value(self, value_ms: float):
+        """Record a duration in milliseconds."""
+        index = self._index(max(int(value_ms * 1000), 0))
+        counts = self._counts
+        if index >= len(counts):
+            counts.extend([0] * (index + 1 - len(counts)))
+        counts[index] += 1
+        self.total_count += 1
+        self._sum += value_ms
+        if value_ms < self.min_value:
+            self.min_value = value_ms
+        if value_ms > self.max_value:
+            self.max_value = value_ms
+    
+    def get_mean_value(self) -> float:
+        return self._sum / self.total_count
+    
+    def get_value_at_percentile(self, percentile: float) -> float:
+        """Duration in milliseconds at or below which `percentile`% fall."""
+        target = max(1, -(-self.total_count * percentile // 100))
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= target:
+                value = self._bucket_midpoint(index) / 1000
+                # Bucket midpoints can overshoot the recorded extremes
+                return min(max(value, self.min_value), self.max_value)
+        return self.max_value
+
+
+@dataclass(slots=True)
 class Metric:
-    """Represents a metric measurement."""
+    """
+    Represents a metric measurement.
+    
+    `type` is a type code (COUNTER, GAUGE, ...) and `timestamp` is epoch
+    nanoseconds from time.time_ns(); convert with METRIC_TYPE_NAMES and
+    datetime.fromtimestamp(timestamp / 1e9) when exporting.
+    """
     name: str
-    type: MetricType
+    type: int
     value: float
-    timestamp: datetime
+    timestamp: int
     tags: Dict = field(default_factory=dict)
 
 
@@ -32,15 +113,26 @@ class MetricsCollector:
     Now integrated with observability aggregator for unified telemetry.
     """
     
-    def __init__(self, namespace: str = "app"):
+    def __init__(self, namespace: str = "app", max_metrics: int = 10000):
         self._namespace = namespace
-        self._metrics: List[Metric] = []
-        self._counters: Dict[str, float] = {}
+        # Short name -> interned "namespace.name", built once per metric
+        self._name_cache: Dict[str, str] = {}
+        # Ring buffer of recent measurements; the oldest are evicted when full
+        self._metrics: Deque[Metric] = deque(maxlen=max_metrics)
+        # Counters are striped per thread (LongAdder-style) so increments
+        # never contend; reads sum across all shards
+        self._counter_local = threading.local()
+        self._counter_shards: List[Dict[str, float]] = []
+        self._shards_lock = threading.Lock()
         self._gauges: Dict[str, float] = {}
-        # HACK: Storing all metrics in memory indefinitely. For high-throughput
-        # apps, this will consume massive amounts of memory. Need proper
-        # time-series storage with aggregation and downsampling.
-        self._timers: Dict[str, List[float]] = {}
+        # HACK: Metrics only live in process memory (bounded buffer and
+        # histograms). Need proper time-series storage with aggregation
+        # and downsampling.
+        self._timers: Dict[str, LogLinearHistogram] = {}
+        # full name -> (histogram.total_count, stats); reused until the
+        # histogram records another value
+        self._timer_stats_cache: Dict[str, Tuple[int, Dict]] = {}
+        self._timer_stats_view = TimerStatsView(self)
         self._aggregator_callback: Optional[Callable] = None
     
     def register_aggregator(self, callback: Callable):
@@ -49,19 +141,35 @@ class MetricsCollector:
     
     def _full_name(self, name: str) -> str:
         """Get fully qualified metric name."""
-        return f"{self._namespace}.{name}"
+        full_name = self._name_cache.get(name)
+        if full_name is None:
+            full_name = self._name_cache.setdefault(
+                name, sys.intern(f"{self._namespace}.{name}")
+            )
+        return full_name
     
-    def _notify_aggregator(self, metric: Metric):
-        """Notify aggregator of new metric."""
+    def _notify_aggregator(self, metric, telemetry_type: str = "metric"):
+        """Notify aggregator of a new metric (or a list, as "metric_batch")."""
         # BUG: Aggregator notification happens before the metric is fully
         # recorded. If aggregator reads back from collector, it might not
         # see the latest value. Race condition potential.
         if self._aggregator_callback:
             try:
-                self._aggregator_callback("metric", metric)
+                self._aggregator_callback(telemetry_type, metric)
             except Exception as e:
                 print(f"MetricsCollector: Aggregator error: {e}")
     
+    def _new_counter_shard(self) -> Dict[str, float]:
+        """Create and register the calling thread's counter shard."""
+        shard = self._counter_local.shard = {}
+        with self._shards_lock:
+            self._counter_shards.append(shard)
+        return shard
+    
+    def _counter_total(self, full_name: str) -> float:
+        """Sum a counter across all thread shards."""
+        return sum(shard.get(full_name, 0) for shard in tuple(self._counter_shards))
+    
     def increment(self, name: str, value: float = 1, tags: Dict = None):
         """
         Increment a counter metric.
@@ -72,17 +180,57 @@ class MetricsCollector:
             tags: Metric tags
         """
         full_name = self._full_name(name)
-        self._counters[full_name] = self._counters.get(full_name, 0) + value
+        try:
+            shard = self._counter_local.shard
+        except AttributeError:
+            shard = self._new_counter_shard()
+        shard[full_name] = shard.get(full_name, 0) + value
         
-        metric = Metric(
-            name=full_name,
-            type=MetricType.COUNTER,
-            value=self._counters[full_name],
-            timestamp=datetime.now(),
-            tags=tags or {}
-        )
-        self._metrics.append(metric)
-        self._notify_aggregator(metric)
+        # Only pay for the Metric record when someone is listening
+        if self._aggregator_callback:
+            # Counter records carry the running total at increment time
+            metric = Metric(
+                name=full_name,
+                type=COUNTER,
+                value=self._counter_total(full_name),
+                timestamp=time.time_ns(),
+                tags=tags or {}
+            )
+            self._metrics.append(metric)
+            self._notify_aggregator(metric)
+    
+    def increment_many(self, items: Iterable[Tuple[str, float, Optional[Dict]]]):
+        """
+        Increment several counters, notifying the aggregator once.
+        
+        Args:
+            items: (name, value, tags) tuples
+        """
+        try:
+            shard = self._counter_local.shard
+        except AttributeError:
+            shard = self._new_counter_shard()
+        full_name = self._full_name
+        counter_total = self._counter_total
+        listening = self._aggregator_callback is not None
+        batch = []
+        now = time.time_ns()
+        
+        for name, value, tags in items:
+            name = full_name(name)
+            shard[name] = shard.get(name, 0) + value
+            if listening:
+                batch.append(Metric(
+                    name=name,
+                    type=COUNTER,
+                    value=counter_total(name),
+                    timestamp=now,
+                    tags=tags or {}
+                ))
+        
+        if batch:
+            self._metrics.extend(batch)
+            self._notify_aggregator(batch, "metric_batch")
     
     def gauge(self, name: str, value: float, tags: Dict = None):
         """
@@ -98,9 +246,9 @@ class MetricsCollector:
         
         metric = Metric(
             name=full_name,
-            type=MetricType.GAUGE,
+            type=GAUGE,
             value=value,
-            timestamp=datetime.now(),
+            timestamp=time.time_ns(),
             tags=tags or {}
         )
         self._metrics.append(metric)
@@ -128,15 +276,16 @@ class MetricsCollector:
             tags: Metric tags
         """
         full_name = self._full_name(name)
-        if full_name not in self._timers:
-            self._timers[full_name] = []
-        self._timers[full_name].append(duration_ms)
+        histogram = self._timers.get(full_name)
+        if histogram is None:
+            histogram = self._timers[full_name] = LogLinearHistogram()
+        histogram.record_value(duration_ms)
         
         metric = Metric(
             name=full_name,
-            type=MetricType.TIMER,
+            type=TIMER,
             value=duration_ms,
-            timestamp=datetime.now(),
+            timestamp=time.time_ns(),
             tags=tags or {}
         )
         self._metrics.append(metric)
@@ -144,7 +293,7 @@ class MetricsCollector:
     
     def get_counter(self, name: str) -> float:
         """Get current counter value."""
-        return self._counters.get(self._full_name(name), 0)
+        return self._counter_total(self._full_name(name))
     
     def get_gauge(self, name: str) -> float:
         """Get current gauge value."""
@@ -152,30 +301,74 @@ class MetricsCollector:
     
     def get_timer_stats(self, name: str) -> Optional[Dict]:
         """Get timer statistics."""
-        full_name = self._full_name(name)
-        values = self._timers.get(full_name)
-        if not values:
+        stats = self._timer_stats(self._full_name(name))
+        return dict(stats) if stats is not None else None
+    
+    def _timer_stats(self, full_name: str) -> Optional[Dict]:
+        """Statistics for a timer by full name, cached per sample count."""
+        histogram = self._timers.get(full_name)
+        if histogram is None:
             return None
         
-        # TODO: No percentile calculations (p50, p95, p99). This limits
-        # usefulness for SLA monitoring. Need proper histogram buckets.
-        return {
-            "count": len(values),
-            "min": min(values),
-            "max": max(values),
-            "avg": sum(values) / len(values)
+        cached = self._timer_stats_cache.get(full_name)
+        if cached is not None and cached[0] == histogram.total_count:
+            return cached[1]
+        
+        # TODO: Percentiles (p50, p95, p99) are histogram bucket midpoints
+        # over the whole process lifetime, not a sliding window. This limits
+        # usefulness for SLA monitoring; need windowed histograms.
+        stats = {
+            "count": histogram.total_count,
+            "min": histogram.min_value,
+            "max": histogram.max_value,
+            "avg": histogram.get_mean_value(),
+            "p50": histogram.get_value_at_percentile(50),
+            "p95": histogram.get_value_at_percentile(95),
+            "p99": histogram.get_value_at_percentile(99)
         }
+        self._timer_stats_cache[full_name] = (histogram.total_count, stats)
+        return stats
     
     def get_all_metrics(self) -> Dict:
-        """Get all current metric values."""
+        """
+        Get all current metric values.
+        
+        Gauges and timers are live read-only views rather than copies;
+        take dict() of them to snapshot or JSON-encode.
+        """
+        counters: Dict[str, float] = {}
+        for shard in tuple(self._counter_shards):
+            for full_name, value in list(shard.items()):
+                counters[full_name] = counters.get(full_name, 0) + value
         return {
-            "counters": dict(self._counters),
-            "gauges": dict(self._gauges),
-            "timers": {k: self.get_timer_stats(k.replace(f"{self._namespace}.", ""))
-                      for k in self._timers}
+            "counters": counters,
+            "gauges": MappingProxyType(self._gauges),
+            "timers": self._timer_stats_view
         }
 
 
+class TimerStatsView(Mapping):
+    """Read-only mapping of timer name to stats, computed on access."""
+    
+    def __init__(self, collector: MetricsCollector):
+        self._collector = collector
+    
+    def __getitem__(self, full_name: str) -> Dict:
+        stats = self._collector._timer_stats(full_name)
+        if stats is None:
+            raise KeyError(full_name)
+        return stats
+    
+    def __iter__(self):
+        return iter(list(self._collector._timers))
+    
+    def __len__(self) -> int:
+        return len(self._collector._timers)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
 class TimerContext:
     """Context manager for timing code blocks."""
     
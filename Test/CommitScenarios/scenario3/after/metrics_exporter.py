@@ -2,10 +2,24 @@
 # Metrics Export to Monitoring Systems
 # Chain B: Part of the metrics chain
 
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
 import json
+import threading
+import time
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+LABEL_CACHE_SIZE = 1024
+
+# StatsD type suffix per metric type; anything else is sent as a gauge
+STATSD_TYPES = {"counter": "c", "gauge": "g", "timer": "ms"}
 
 
 @dataclass
@@ -14,6 +28,7 @@ class ExportConfig:
     endpoint: str = "http://localhost:9090"
     batch_size: int = 100
     format: str = "prometheus"  # prometheus, statsd, json
+    flush_interval: float = 0.1  # seconds; 0 disables the sender thread
 
 
 class MetricsExporter:
@@ -24,7 +39,27 @@ class MetricsExporter:
     
     def __init__(self, config: ExportConfig = None):
         self._config = config or ExportConfig()
-        self._buffer: List[Dict] = []
+        # Producers only append here; the sender thread ships batches of
+        # batch_size (or whatever is pending every flush_interval). Without
+        # a sender, add_metric flushes inline at batch_size as before.
+        self._pending: Deque[Dict] = deque()
+        self._max_pending = 10 * self._config.batch_size
+        self.dropped = 0
+        self._shedding = False
+        self._flush_lock = threading.Lock()
+        self._batch_ready = threading.Event()
+        self._stop_sender = threading.Event()
+        self._sender: Optional[threading.Thread] = None
+        if self._config.flush_interval:
+            self._sender = threading.Thread(
+                target=self._send_loop,
+                args=(self._config.flush_interval,),
+                name="MetricsExporter-sender",
+                daemon=True
+            )
+            self._sender.start()
+        # Rendered Prometheus label blocks, keyed by the tag items
+        self._label_cache: Dict[Tuple, str] = {}
         # TODO: Export endpoint is not configurable at runtime. Changing
         # the monitoring backend requires code changes and redeployment.
         # Should read from environment or config file.
@@ -39,73 +74,149 @@ class MetricsExporter:
             value: Metric value
             metric_type: Type (counter, gauge, etc.)
             tags: Metric tags/labels
-            timestamp: Measurement timestamp
+            timestamp: Measurement timestamp (defaults to now)
         """
         metric = {
             "name": name,
             "value": value,
             "type": metric_type,
             "tags": tags or {},
-            "timestamp": (timestamp or datetime.now()).isoformat()
+            # Epoch ns; only the JSON format renders it, at send time
+            "timestamp": (time.time_ns() if timestamp is None
+                          else int(timestamp.timestamp() * 1e9))
         }
         
-        self._buffer.append(metric)
+        pending = self._pending
+        if len(pending) >= self._max_pending:
+            # FIXME: Metrics are dropped when the sender falls behind. Shedding
+            # is logged and counted, but producers get no backpressure.
+            if not self._shedding:
+                self._shedding = True
+                print(f"MetricsExporter: Sender is {len(pending)} metrics "
+                      f"behind, dropping new metrics")
+            self.dropped += 1
+            return
+        pending.append(metric)
         
-        # FIXME: Auto-flush when buffer is full is synchronous and blocks.
-        # If export fails, the calling code is blocked. Should use async
-        # export with backpressure handling.
-        if len(self._buffer) >= self._config.batch_size:
-            self.flush()
+        if len(pending) >= self._config.batch_size:
+            if self._sender is None:
+                self.flush()
+            else:
+                self._batch_ready.set()
     
     def flush(self) -> int:
         """
-        Flush buffered metrics to the endpoint.
+        Flush all pending metrics to the endpoint, one batch at a time.
         
         Returns:
             Number of metrics exported
         """
-        if not self._buffer:
+        count = 0
+        with self._flush_lock:
+            while self._pending:
+                count += self._send_batch()
+            if self._shedding:
+                self._shedding = False
+                print(f"MetricsExporter: Caught up, {self.dropped} metrics "
+                      f"dropped so far")
+        return count
+    
+    def _send_batch(self) -> int:
+        """Pop up to batch_size pending metrics and send them."""
+        pending = self._pending
+        popleft = pending.popleft
+        batch = [popleft() for _ in range(min(len(pending), self._config.batch_size))]
+        if not batch:
             return 0
         
-        count = len(self._buffer)
-        
         # Format based on config
         if self._config.format == "prometheus":
-            payload = self._format_prometheus()
+            payload = self._format_prometheus(batch)
         elif self._config.format == "statsd":
-            payload = self._format_statsd()
+            payload = self._format_statsd(batch)
         else:
-            payload = self._format_json()
+            payload = self._format_json(batch)
         
         # TODO: Actually send to endpoint! Currently just printing.
         # HTTP client not implemented. This exporter does nothing useful.
         print(f"MetricsExporter: Would send to {self._config.endpoint}:")
         print(payload[:200] + "..." if len(payload) > 200 else payload)
         
-        self._buffer.clear()
-        return count
+        return len(batch)
+    
+    def _send_loop(self, interval: float):
+        """Ship a batch whenever one fills up, or every interval, until close()."""
+        while not self._stop_sender.is_set():
+            self._batch_ready.wait(interval)
+            self._batch_ready.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"MetricsExporter: Export error: {e}")
     
-    def _format_prometheus(self) -> str:
+    def close(self):
+        """Stop the sender thread and flush any remaining metrics."""
+        self._stop_sender.set()
+        self._batch_ready.set()
+        if self._sender is not None:
+            self._sender.join()
+            self._sender = None
+        self.flush()
+    
+    def _format_prometheus(self, batch: List[Dict]) -> str:
         """Format metrics for Prometheus."""
-        lines = []
-        for metric in self._buffer:
-            labels = ",".join(f'{k}="{v}"' for k, v in metric["tags"].items())
-            label_str = f"{{{labels}}}" if labels else ""
-            lines.append(f'{metric["name"]}{label_str} {metric["value"]}')
-        return "\n".join(lines)
+        parts = []
+        append = parts.append
+        label_str = self._label_str
+        for metric in batch:
+            append(metric["name"])
+            append(label_str(metric["tags"]))
+            append(" ")
+            append(str(metric["value"]))
+            append("\n")
+        parts.pop()  # No trailing newline
+        return "".join(parts)
+    
+    def _label_str(self, tags: Dict) -> str:
+        """Render a Prometheus label block, caching string-valued tag sets."""
+        if not tags:
+            return ""
+        items = tuple(tags.items())
+        # Only string values are cached: 1, 1.0 and True hash alike but
+        # render differently
+        cacheable = all(type(v) is str for _, v in items)
+        if cacheable:
+            cached = self._label_cache.get(items)
+            if cached is not None:
+                return cached
+        rendered = "{" + ",".join(f'{k}="{v}"' for k, v in items) + "}"
+        if cacheable:
+            if len(self._label_cache) >= LABEL_CACHE_SIZE:
+                self._label_cache.clear()
+            self._label_cache[items] = rendered
+        return rendered
     
-    def _format_statsd(self) -> str:
+    def _format_statsd(self, batch: List[Dict]) -> str:
         """Format metrics for StatsD."""
-        lines = []
-        type_map = {"counter": "c", "gauge": "g", "timer": "ms"}
-        for metric in self._buffer:
-            stat_type = type_map.get(metric["type"], "g")
-            lines.append(f'{metric["name"]}:{metric["value"]}|{stat_type}')
-        return "\n".join(lines)
+        stat_type = STATSD_TYPES.get
+        return "\n".join([
+            f'{metric["name"]}:{metric["value"]}|{stat_type(metric["type"], "g")}'
+            for metric in batch
+        ])
     
-    def _format_json(self) -> str:
-        """Format metrics as JSON."""
-        return json.dumps(self._buffer, indent=2)
+    def _format_json(self, batch: List[Dict]) -> str:
+        """Format metrics as JSON, using orjson when installed."""
+        fromtimestamp = datetime.fromtimestamp
+        if ORJSON_AVAILABLE:
+            # orjson encodes datetime natively, in isoformat()
+            return orjson.dumps([
+                {**metric, "timestamp": fromtimestamp(metric["timestamp"] / 1e9)}
+                for metric in batch
+            ], option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        return json.dumps([
+            {**metric, "timestamp": fromtimestamp(metric["timestamp"] / 1e9).isoformat()}
+            for metric in batch
+        ], indent=2)
 
 
 # Example usage
@@ -116,7 +227,7 @@ if __name__ == "__main__":
     exporter.add_metric("response_time_ms", 45.2, "timer", {"endpoint": "/api"})
     exporter.add_metric("active_users", 128, "gauge")
     
-    exporter.flush()
+    exporter.close()
 
 
 
@@ -3,18 +3,39 @@
 # NEW FILE - Developer commit that bridges logging and metrics chains
 # This creates a merged 6-node chain from two previously isolated chains
 
-from typing import Dict, List, Optional, Any, Callable
+from typing import Deque, Dict, List, Optional, Any, Callable, Tuple
+from collections import deque
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 import json
+import threading
+import time
 
 # Import from both chains - creating the bridge
 from log_service import get_logger, LogService
 from log_formatter import LogFormatter
-from metrics_collector import get_metrics, MetricsCollector
+from metrics_collector import get_metrics, Metric, MetricsCollector, METRIC_TYPE_NAMES
 from metrics_exporter import MetricsExporter
 
+# Downsampled history: one-minute tumbling windows kept for a day
+WINDOW_SECONDS = 60
+WINDOW_RETENTION = 24 * 60  # windows
+WINDOW_NS = WINDOW_SECONDS * 1_000_000_000
+
+DASHBOARD_CACHE_TTL = 1.0  # seconds
+
+# Most recent record IDs kept per correlation ID, so one runaway trace
+# can't grow its index entry without bound
+MAX_RECORDS_PER_CORRELATION = 1024
+
+# Correlation ID of the request being handled. Each thread and asyncio task
+# sees its own value, and tasks inherit it from whoever created them.
+_current_correlation_id: ContextVar[Optional[str]] = ContextVar(
+    "correlation_id", default=None
+)
+
 
 class TelemetryType(Enum):
     LOG = "log"
@@ -23,12 +44,12 @@ class TelemetryType(Enum):
     EVENT = "event"
 
 
-@dataclass
+@dataclass(slots=True)
 class TelemetryRecord:
     """Unified telemetry record combining logs and metrics."""
     record_id: str
     type: TelemetryType
-    timestamp: datetime
+    timestamp: int  # epoch nanoseconds
     source: str
     data: Dict
     correlation_id: Optional[str] = None
@@ -44,9 +65,19 @@ class ObservabilityAggregator:
     between the logging chain and metrics chain.
     """
     
-    def __init__(self, app_name: str = "app"):
+    def __init__(self, app_name: str = "app", max_records: int = 10000,
+                 flush_interval: Optional[float] = 0.05):
         self._app_name = app_name
-        self._records: List[TelemetryRecord] = []
+        # Ring buffer of recent records; see _push for eviction
+        self._records: Deque[TelemetryRecord] = deque(maxlen=max_records)
+        self._records_by_id: Dict[str, TelemetryRecord] = {}
+        # Live records by window index, in push order, for time-range queries
+        self._records_by_window: Dict[int, Deque[TelemetryRecord]] = {}
+        # Per-minute counts that outlive the raw records: window index
+        # (epoch ns // WINDOW_NS) -> {"count": n, "errors": n}
+        self._windows: Dict[int, Dict[str, int]] = {}
+        # (time.monotonic() when built, dashboard data)
+        self._dashboard_cache: Optional[Tuple[float, Dict]] = None
         self._record_counter = 0
         
         # TODO: Connecting to both logging and metrics creates tight coupling.
@@ -57,19 +88,38 @@ class ObservabilityAggregator:
         self._formatter = LogFormatter()
         self._exporter = MetricsExporter()
         
-        # Register callbacks to receive telemetry
-        self._logger.register_aggregator(self._on_telemetry)
-        self._metrics.register_aggregator(self._on_telemetry)
+        # Producers only append to this queue; records are built and indexed
+        # by the drain thread or before a query.
+        # FIXME: No accounting when the queue is full! The oldest pending items
+        # are dropped silently rather than blocking the producer, so gaps in
+        # a trace can't be told apart from telemetry that was never emitted.
+        self._queue: Deque[Tuple[str, Any, Optional[str]]] = deque(maxlen=8192)
+        self._drain_lock = threading.Lock()
+        # Guards _records, _records_by_id and _correlation_index. The error
+        # metric feedback path is independent of the record store and takes
+        # _metrics_lock instead, so neither serialises behind the other.
+        self._records_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._stop_drainer = threading.Event()
+        self._drainer: Optional[threading.Thread] = None
+        if flush_interval:
+            self._drainer = threading.Thread(
+                target=self._drain_loop,
+                args=(flush_interval,),
+                name="ObservabilityAggregator-drainer",
+                daemon=True
+            )
+            self._drainer.start()
         
-        # HACK: Correlation tracking is simplistic. Using a global current_id
-        # that gets overwritten. In async/multi-threaded scenarios, this will
-        # cause incorrect correlation. Need thread-local or context-based tracking.
-        self._current_correlation_id: Optional[str] = None
+        # HACK: Correlation tracking is simplistic. The ID is a ContextVar read
+        # when telemetry is queued, so work handed to thread pools without
+        # copying the context loses it. Need explicit trace propagation.
         
-        # FIXME: No buffer size limit! Records grow unboundedly. Combined with
-        # the inherited memory issues from both logging and metrics chains,
-        # this makes the memory leak problem even worse.
-        self._correlation_index: Dict[str, List[str]] = {}
+        # Register callbacks to receive telemetry
+        self._logger.register_aggregator(self._enqueue)
+        self._metrics.register_aggregator(self._enqueue)
+        
+        self._correlation_index: Dict[str, Deque[str]] = {}
     
     def _generate_record_id(self) -> str:
         """Generate unique record ID."""
@@ -78,25 +128,71 @@ class ObservabilityAggregator:
     
     def set_correlation_id(self, correlation_id: str):
         """Set current correlation ID for request tracing."""
-        self._current_correlation_id = correlation_id
+        _current_correlation_id.set(correlation_id)
     
     def clear_correlation_id(self):
         """Clear correlation ID."""
-        self._current_correlation_id = None
+        _current_correlation_id.set(None)
     
-    def _on_telemetry(self, telemetry_type: str, data: Any):
+    def _enqueue(self, telemetry_type: str, data: Any):
         """
         Callback for receiving telemetry from subsystems.
         
+        Captures the current correlation ID and queues the item; the cost to
+        the producer is a single deque append.
+        """
+        self._queue.append((telemetry_type, data, _current_correlation_id.get()))
+    
+    def _drain(self, blocking: bool = True):
+        """
+        Process queued telemetry into records and indexes.
+        
+        Args:
+            blocking: If False, return immediately when another drain is running
+        """
+        if not self._drain_lock.acquire(blocking):
+            return
+        try:
+            queue = self._queue
+            while queue:
+                self._on_telemetry(*queue.popleft())
+        finally:
+            self._drain_lock.release()
+    
+    def _drain_loop(self, interval: float):
+        """Periodically drain the telemetry queue until close() is called."""
+        while not self._stop_drainer.wait(interval):
+            self._drain(blocking=False)
+    
+    def close(self):
+        """Stop the drain thread, process remaining telemetry, close the exporter."""
+        self._stop_drainer.set()
+        if self._drainer is not None:
+            self._drainer.join()
+            self._drainer = None
+        self._drain()
+        self._exporter.close()
+    
+    def _on_telemetry(self, telemetry_type: str, data: Any,
+                      correlation_id: Optional[str]):
+        """
+        Build and store a record for one queued telemetry item.
+        
         Args:
-            telemetry_type: "log" or "metric"
-            data: LogEntry or Metric object
+            telemetry_type: "log", "metric" or "metric_batch"
+            data: LogEntry, Metric, or list of Metrics
+            correlation_id: Correlation ID current when it was emitted
         """
-        record_id = self._generate_record_id()
+        if telemetry_type == "metric_batch":
+            batch = [self._metric_record(m, correlation_id) for m in data]
+            with self._records_lock:
+                for record in batch:
+                    self._push(record)
+            return
         
         if telemetry_type == "log":
             record = TelemetryRecord(
-                record_id=record_id,
+                record_id=self._generate_record_id(),
                 type=TelemetryType.LOG,
                 timestamp=data.timestamp,
                 source=data.source,
@@ -105,37 +201,102 @@ class ObservabilityAggregator:
                     "message": data.message,
                     "context": data.context
                 },
-                correlation_id=self._current_correlation_id
+                correlation_id=correlation_id
             )
         else:  # metric
-            record = TelemetryRecord(
-                record_id=record_id,
-                type=TelemetryType.METRIC,
-                timestamp=data.timestamp,
-                source=self._app_name,
-                data={
-                    "name": data.name,
-                    "value": data.value,
-                    "type": data.type.value
-                },
-                correlation_id=self._current_correlation_id,
-                tags=data.tags
-            )
-        
-        self._records.append(record)
+            record = self._metric_record(data, correlation_id)
         
-        # Index by correlation ID
-        if record.correlation_id:
-            if record.correlation_id not in self._correlation_index:
-                self._correlation_index[record.correlation_id] = []
-            self._correlation_index[record.correlation_id].append(record_id)
+        with self._records_lock:
+            self._push(record)
         
         # Auto-export errors to metrics
         # BUG: This creates a feedback loop! Logging an error generates a metric,
         # which if it fails, could log an error, generating another metric...
         # Need circuit breaker to prevent infinite loops.
         if telemetry_type == "log" and data.level.value in ("ERROR", "CRITICAL"):
-            self._metrics.increment("errors", tags={"source": data.source})
+            # Attribute the derived metric to the error's own request
+            token = _current_correlation_id.set(correlation_id)
+            try:
+                with self._metrics_lock:
+                    self._metrics.increment("errors", tags={"source": data.source})
+            finally:
+                _current_correlation_id.reset(token)
+    
+    def _metric_record(self, metric: Metric,
+                       correlation_id: Optional[str]) -> TelemetryRecord:
+        """Build the telemetry record for a metric."""
+        return TelemetryRecord(
+            record_id=self._generate_record_id(),
+            type=TelemetryType.METRIC,
+            timestamp=metric.timestamp,
+            source=self._app_name,
+            data={
+                "name": metric.name,
+                "value": metric.value,
+                "type": METRIC_TYPE_NAMES[metric.type]
+            },
+            correlation_id=correlation_id,
+            tags=metric.tags
+        )
+    
+    def _push(self, record: TelemetryRecord):
+        """
+        Append a record, dropping the oldest one from the indexes if full.
+        
+        Caller must hold _records_lock.
+        """
+        records = self._records
+        if len(records) == records.maxlen:
+            old = records[0]
+            del self._records_by_id[old.record_id]
+            if old.correlation_id:
+                ids = self._correlation_index[old.correlation_id]
+                # Oldest, so at the front unless the trace's cap rotated it out
+                if ids and ids[0] == old.record_id:
+                    ids.popleft()
+                if not ids:
+                    del self._correlation_index[old.correlation_id]
+            bucket = old.timestamp // WINDOW_NS
+            window_records = self._records_by_window[bucket]
+            window_records.popleft()  # Pushed first, so at the front too
+            if not window_records:
+                del self._records_by_window[bucket]
+        records.append(record)
+        self._records_by_id[record.record_id] = record
+        self._count_in_window(record)
+        
+        bucket = record.timestamp // WINDOW_NS
+        window_records = self._records_by_window.get(bucket)
+        if window_records is None:
+            window_records = self._records_by_window[bucket] = deque()
+        window_records.append(record)
+        
+        # Index by correlation ID
+        if record.correlation_id:
+            ids = self._correlation_index.get(record.correlation_id)
+            if ids is None:
+                ids = self._correlation_index[record.correlation_id] = deque(
+                    maxlen=MAX_RECORDS_PER_CORRELATION
+                )
+            ids.append(record.record_id)
+    
+    def _count_in_window(self, record: TelemetryRecord):
+        """
+        Add a record to its tumbling window, expiring windows past retention.
+        
+        Caller must hold _records_lock.
+        """
+        bucket = record.timestamp // WINDOW_NS
+        window = self._windows.get(bucket)
+        if window is None:
+            window = self._windows[bucket] = {"count": 0, "errors": 0}
+            cutoff = bucket - WINDOW_RETENTION
+            for old in [b for b in self._windows if b <= cutoff]:
+                del self._windows[old]
+        window["count"] += 1
+        if (record.type == TelemetryType.LOG
+                and record.data.get("level") in ("ERROR", "CRITICAL")):
+            window["errors"] += 1
     
     def get_correlated_telemetry(self, correlation_id: str) -> List[Dict]:
         """
@@ -147,22 +308,25 @@ class ObservabilityAggregator:
         Returns:
             List of telemetry records
         """
-        # TODO: This is O(n) where n is all records. For large systems with
-        # millions of records, this will be extremely slow. Need proper
-        # indexing in a time-series database.
-        record_ids = self._correlation_index.get(correlation_id, [])
-        return [
-            self._record_to_dict(r) 
-            for r in self._records 
-            if r.record_id in record_ids
-        ]
+        # TODO: This drains the queue and holds the record lock while
+        # resolving IDs, so frequent trace lookups contend with ingestion.
+        # Need a read-optimized index or a time-series database.
+        self._drain()
+        records_by_id = self._records_by_id
+        with self._records_lock:
+            records = [
+                records_by_id[rid]
+                for rid in self._correlation_index.get(correlation_id, [])
+                if rid in records_by_id
+            ]
+        return [self._record_to_dict(r) for r in records]
     
     def _record_to_dict(self, record: TelemetryRecord) -> Dict:
         """Convert record to dictionary."""
         return {
             "record_id": record.record_id,
             "type": record.type.value,
-            "timestamp": record.timestamp.isoformat(),
+            "timestamp": datetime.fromtimestamp(record.timestamp / 1e9).isoformat(),
             "source": record.source,
             "data": record.data,
             "correlation_id": record.correlation_id,
@@ -176,16 +340,20 @@ class ObservabilityAggregator:
         Returns:
             Health summary dictionary
         """
+        self._drain()
         now = datetime.now()
-        last_hour = now - timedelta(hours=1)
+        current = int(now.timestamp() // WINDOW_SECONDS)
         
-        # Count recent errors
-        recent_errors = sum(
-            1 for r in self._records
-            if r.type == TelemetryType.LOG 
-            and r.data.get("level") in ("ERROR", "CRITICAL")
-            and r.timestamp > last_hour
-        )
+        with self._records_lock:
+            # Count errors in the last hour's windows (to minute granularity)
+            windows = self._windows
+            recent_errors = sum(
+                windows[b]["errors"]
+                for b in range(current - 3600 // WINDOW_SECONDS + 1, current + 1)
+                if b in windows
+            )
+            total_records = len(self._records)
+            active_correlations = len(self._correlation_index)
         
         # HACK: Health calculation logic is hardcoded. Thresholds should be
         # configurable per environment. What's "healthy" in dev is different
@@ -200,9 +368,9 @@ class ObservabilityAggregator:
             "status": health_status,
             "timestamp": now.isoformat(),
             "metrics": {
-                "total_records": len(self._records),
+                "total_records": total_records,
                 "recent_errors": recent_errors,
-                "active_correlations": len(self._correlation_index)
+                "active_correlations": active_correlations
             }
         }
     
@@ -225,27 +393,57 @@ class ObservabilityAggregator:
         Returns:
             List of matching records
         """
-        # NOTE: Full table scan for every query. This is acceptable for small
-        # datasets but will not scale. Need to implement proper query engine
-        # or use external time-series database.
+        self._drain()
+        # Compare as epoch ns, like the stored timestamps
+        since_ns = int(since.timestamp() * 1e9) if since else None
+        until_ns = int(until.timestamp() * 1e9) if until else None
+        # NOTE: Only the time bounds are indexed (per-minute windows); type
+        # and source filters still scan every candidate record. Need to
+        # implement proper query engine or use external time-series database.
         results = []
         
-        for record in reversed(self._records):  # Most recent first
-            if len(results) >= limit:
-                break
-            
-            if telemetry_type and record.type != telemetry_type:
-                continue
-            if since and record.timestamp < since:
-                continue
-            if until and record.timestamp > until:
-                continue
-            if source and record.source != source:
-                continue
-            
-            results.append(self._record_to_dict(record))
+        with self._records_lock:
+            if since_ns is None and until_ns is None:
+                candidates = reversed(self._records)  # Most recent first
+            else:
+                candidates = self._records_between(since_ns, until_ns)
+            for record in candidates:
+                if len(results) >= limit:
+                    break
+                
+                if telemetry_type and record.type != telemetry_type:
+                    continue
+                if since_ns is not None and record.timestamp < since_ns:
+                    continue
+                if until_ns is not None and record.timestamp > until_ns:
+                    continue
+                if source and record.source != source:
+                    continue
+                
+                results.append(record)
         
-        return results
+        return [self._record_to_dict(r) for r in results]
+    
+    def _records_between(self, since_ns: Optional[int],
+                         until_ns: Optional[int]):
+        """
+        Yield records from the windows overlapping [since_ns, until_ns],
+        newest window first. Callers still filter on the exact bounds.
+        
+        Caller must hold _records_lock.
+        """
+        by_window = self._records_by_window
+        if not by_window:
+            return
+        first, last = min(by_window), max(by_window)
+        if since_ns is not None:
+            first = max(first, since_ns // WINDOW_NS)
+        if until_ns is not None:
+            last = min(last, until_ns // WINDOW_NS)
+        for bucket in range(last, first - 1, -1):
+            window_records = by_window.get(bucket)
+            if window_records:
+                yield from reversed(window_records)
     
     def export_dashboard_data(self) -> Dict:
         """
@@ -258,8 +456,20 @@ class ObservabilityAggregator:
         # TODO: Dashboard data generation is synchronous and expensive.
         # Should be cached and refreshed in background. Every dashboard
         # refresh causes a full scan of all telemetry.
-        return {
-            "health": self.get_health_summary(),
+        # Viewers refreshing within DASHBOARD_CACHE_TTL share one rebuild
+        cached = self._dashboard_cache
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < DASHBOARD_CACHE_TTL:
+            return cached[1]
+        
+        health = self.get_health_summary()  # Drains pending telemetry
+        with self._records_lock:
+            active_traces = list(self._correlation_index.keys())[-10:]
+        # Gauges and timers come back as live views; copy them so the cached
+        # payload stays fixed and JSON-serializable
+        all_metrics = self._metrics.get_all_metrics()
+        data = {
+            "health": health,
             "recent_logs": self.query_telemetry(
                 telemetry_type=TelemetryType.LOG, 
                 limit=20
@@ -268,9 +478,18 @@ class ObservabilityAggregator:
                 telemetry_type=TelemetryType.METRIC,
                 limit=20
             ),
-            "all_metrics": self._metrics.get_all_metrics(),
-            "active_traces": list(self._correlation_index.keys())[-10:]
+            "all_metrics": {
+                "counters": all_metrics["counters"],
+                "gauges": dict(all_metrics["gauges"]),
+                "timers": {
+                    name: dict(stats)
+                    for name, stats in all_metrics["timers"].items()
+                },
+            },
+            "active_traces": active_traces
         }
+        self._dashboard_cache = (now, data)
+        return data
 
 
 # Singleton instance
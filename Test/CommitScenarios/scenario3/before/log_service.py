@@ -2,11 +2,14 @@
 # Application Logging Service
 # Chain A: Logging infrastructure (isolated chain with 2 nodes)
 
-from typing import Dict, List, Optional
+from typing import Deque, Dict, List, Optional
 from dataclasses import dataclass
+from collections import deque
 from datetime import datetime
 from enum import Enum
+from itertools import islice
 import json
+import time
 
 
 class LogLevel(Enum):
@@ -17,10 +20,10 @@ class LogLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
-@dataclass
+@dataclass(slots=True)
 class LogEntry:
     """Represents a log entry."""
-    timestamp: datetime
+    timestamp: int  # epoch nanoseconds from time.time_ns()
     level: LogLevel
     message: str
     context: Dict
@@ -35,12 +38,15 @@ class LogService:
     
     def __init__(self, app_name: str = "app"):
         self._app_name = app_name
-        self._entries: List[LogEntry] = []
         self._handlers: List[callable] = []
         # TODO: Log storage is in-memory only. All logs are lost on restart.
         # Need to implement persistent storage (file, database, or log service).
         # This makes debugging production issues nearly impossible.
         self._max_entries = 10000
+        # HACK: Ring buffer silently drops the oldest logs once full, without
+        # any archiving or rotation. Important debug info may be lost.
+        # Need proper log rotation with archival to secondary storage.
+        self._entries: Deque[LogEntry] = deque(maxlen=self._max_entries)
     
     def add_handler(self, handler: callable):
         """Add a log handler callback."""
@@ -61,22 +67,16 @@ class LogService:
             Created LogEntry
         """
         entry = LogEntry(
-            timestamp=datetime.now(),
+            timestamp=time.time_ns(),
             level=level,
             message=message,
             context=context or {},
             source=source or self._app_name
         )
         
+        # Bounded deque: appending evicts the oldest entry once full
         self._entries.append(entry)
         
-        # Trim old entries
-        # HACK: Simple truncation when limit reached. This discards oldest logs
-        # without any archiving or rotation. Important debug info may be lost.
-        # Need proper log rotation with archival to secondary storage.
-        if len(self._entries) > self._max_entries:
-            self._entries = self._entries[-self._max_entries:]
-        
         # Call handlers
         for handler in self._handlers:
             try:
@@ -108,18 +108,20 @@ class LogService:
     
     def get_entries(self, level: LogLevel = None, limit: int = 100) -> List[Dict]:
         """Get log entries, optionally filtered by level."""
-        entries = self._entries
         if level:
-            entries = [e for e in entries if e.level == level]
+            entries = [e for e in self._entries if e.level == level][-limit:]
+        else:
+            entries = list(islice(reversed(self._entries), limit))
+            entries.reverse()
         return [
             {
-                "timestamp": e.timestamp.isoformat(),
+                "timestamp": datetime.fromtimestamp(e.timestamp / 1e9).isoformat(),
                 "level": e.level.value,
                 "message": e.message,
                 "context": e.context,
                 "source": e.source
             }
-            for e in entries[-limit:]
+            for e in entries
         ]
 
 
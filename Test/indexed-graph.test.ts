@@ -0,0 +1,73 @@
+/**
+ * Test/indexed-graph.test.ts
+ *
+ * Tests for the CSR graph used by SIR and chain analysis (src/utils/indexedGraph.ts).
+ * Test IDs: IG-1 through IG-5
+ */
+
+import { IndexedGraph, findWeaklyConnectedChains } from '../src/utils/indexedGraph';
+import { RelationshipType, TechnicalDebt, WeightedEdge } from '../src/models';
+
+const edge = (sourceId: string, targetId: string, weight: number): WeightedEdge => ({
+    sourceId,
+    targetId,
+    type: RelationshipType.CALL,
+    weight,
+    hops: 1
+});
+
+const idsOf = (graph: IndexedGraph, nodes: Int32Array): string[] =>
+    Array.from(nodes, node => graph.ids[node]);
+
+describe('IG-1 to IG-5: IndexedGraph', () => {
+    test('IG-1: indexes listed nodes, then edge sources, then edge targets', () => {
+        const graph = IndexedGraph.fromEdges(['a', 'b'], [edge('c', 'd', 1), edge('e', 'a', 1)]);
+
+        expect(graph.ids).toEqual(['a', 'b', 'c', 'e', 'd']);
+        expect(graph.indexOf('e')).toBe(3);
+        expect(graph.indexOf('missing')).toBe(-1);
+    });
+
+    test('IG-2: keeps out-edges grouped by source in input order', () => {
+        const graph = IndexedGraph.fromEdges(
+            ['a', 'b', 'c'],
+            [edge('b', 'c', 0.5), edge('a', 'c', 0.8), edge('a', 'b', 0.6)]
+        );
+        const a = graph.indexOf('a');
+
+        expect(idsOf(graph, graph.targets.subarray(graph.offsets[a], graph.offsets[a + 1])))
+            .toEqual(['c', 'b']);
+        expect(graph.weightedOutDegree(a)).toBeCloseTo(1.4, 10);
+        expect(graph.weightedOutDegree(graph.indexOf('c'))).toBe(0);
+    });
+
+    test('IG-3: strongly connected components come sinks first', () => {
+        const graph = IndexedGraph.fromEdges(
+            ['a', 'b', 'c', 'd'],
+            [edge('a', 'b', 1), edge('b', 'c', 1), edge('c', 'b', 1), edge('c', 'd', 1)]
+        );
+        const { componentOf, components } = graph.stronglyConnectedComponents();
+
+        expect(components.map(c => idsOf(graph, c).sort())).toEqual([['d'], ['b', 'c'], ['a']]);
+        expect(componentOf[graph.indexOf('b')]).toBe(componentOf[graph.indexOf('c')]);
+    });
+
+    test('IG-4: weakly connected components ignore edge direction', () => {
+        const graph = IndexedGraph.fromEdges(
+            ['a', 'b', 'c', 'd', 'e'],
+            [edge('b', 'a', 1), edge('c', 'b', 1), edge('d', 'e', 1)]
+        );
+        const { componentOf, components } = graph.weaklyConnectedComponents([0, 1, 2, 3, 4]);
+
+        expect(components.map(c => idsOf(graph, c))).toEqual([['a', 'b', 'c'], ['d', 'e']]);
+        expect(componentOf[graph.indexOf('c')]).toBe(0);
+        expect(componentOf[graph.indexOf('e')]).toBe(1);
+    });
+
+    test('IG-5: chains are multi-node components with their edge weight', () => {
+        const debts = ['a', 'b', 'c', 'd'].map(id => ({ id } as TechnicalDebt));
+        const chains = findWeaklyConnectedChains(debts, [edge('b', 'a', 0.5), edge('a', 'b', 0.25)]);
+
+        expect(chains).toEqual([{ id: 'chain-1', nodes: ['a', 'b'], length: 2, totalWeight: 0.75 }]);
+    });
+});
@@ -0,0 +1,88 @@
+/**
+ * Test/llm-cache.test.ts
+ *
+ * Tests for the persistent LLM response cache (src/utils/llmCache.ts).
+ * Test IDs: LC-1 through LC-6
+ */
+
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+import { LLMResponseCache } from '../src/utils/llmCache';
+
+describe('LC-1 to LC-6: LLMResponseCache', () => {
+    let dir: string;
+    let file: string;
+
+    beforeEach(() => {
+        dir = fs.mkdtempSync(path.join(os.tmpdir(), 'rapidpay-llm-cache-'));
+        file = path.join(dir, 'llm-cache.jsonl');
+    });
+
+    afterEach(() => {
+        fs.rmSync(dir, { recursive: true, force: true });
+    });
+
+    test('LC-1: key depends on model, system and user message', () => {
+        const k = LLMResponseCache.key('gpt-4o', 'sys', 'user');
+        expect(k).toMatch(/^[0-9a-f]{64}$/);
+        expect(LLMResponseCache.key('gpt-4o', 'sys', 'user')).toBe(k);
+        expect(LLMResponseCache.key('gpt-4o-mini', 'sys', 'user')).not.toBe(k);
+        expect(LLMResponseCache.key('gpt-4o', 'sy', 'suser')).not.toBe(k);
+    });
+
+    test('LC-2: second lookup is served without calling the model', async () => {
+        const cache = new LLMResponseCache(null);
+        const complete = jest.fn().mockResolvedValue('CLASSIFICATION: TRUE\nCONFIDENCE: 90');
+
+        const first  = await cache.getOrFetch('m', 's', 'TODO: fix', complete);
+        const second = await cache.getOrFetch('m', 's', 'TODO: fix', complete);
+
+        expect(first).toBe(second);
+        expect(complete).toHaveBeenCalledTimes(1);
+    });
+
+    test('LC-3: concurrent identical prompts share one call', async () => {
+        const cache = new LLMResponseCache(null);
+        const complete = jest.fn().mockResolvedValue('CLASSIFICATION: FALSE\nCONFIDENCE: 20');
+
+        await Promise.all([1, 2, 3].map(() => cache.getOrFetch('m', 's', 'FIXME', complete)));
+
+        expect(complete).toHaveBeenCalledTimes(1);
+    });
+
+    test('LC-4: entries persist across instances through the cache file', async () => {
+        await new LLMResponseCache(file).getOrFetch('m', 's', 'HACK', async () => 'cached');
+
+        const complete = jest.fn().mockResolvedValue('fresh');
+        const text = await new LLMResponseCache(file).getOrFetch('m', 's', 'HACK', complete);
+
+        expect(text).toBe('cached');
+        expect(complete).not.toHaveBeenCalled();
+    });
+
+    test('LC-5: errors and empty responses are not cached', async () => {
+        const cache = new LLMResponseCache(file);
+
+        await expect(cache.getOrFetch('m', 's', 'x', async () => { throw new Error('429'); }))
+            .rejects.toThrow('429');
+        await cache.getOrFetch('m', 's', 'x', async () => '');
+
+        expect(cache.get(LLMResponseCache.key('m', 's', 'x'))).toBeUndefined();
+        expect(fs.existsSync(file)).toBe(false);
+    });
+
+    test('LC-6: prompts differing only in line endings or trailing whitespace share an entry', async () => {
+        const cache = new LLMResponseCache(null);
+        const complete = jest.fn().mockResolvedValue('CLASSIFICATION: TRUE\nCONFIDENCE: 80');
+
+        await cache.getOrFetch('m', 's', 'Comment: TODO fix\n\nCode Context:\n    if (x) {\n        y();\n    }', complete);
+        await cache.getOrFetch('m', 's', 'Comment: TODO fix  \r\n\r\nCode Context:\r\n    if (x) {\t\r\n        y();\r\n    }\r\n', complete);
+
+        expect(complete).toHaveBeenCalledTimes(1);
+        expect(LLMResponseCache.key('m', 's', 'TODO fix')).not.toBe(LLMResponseCache.key('m', 's', 'TODO: fix'));
+        // Indentation is significant (e.g. Python blocks)
+        expect(LLMResponseCache.key('m', 's', 'if x:\n    y()\nz()'))
+            .not.toBe(LLMResponseCache.key('m', 's', 'if x:\n    y()\n    z()'));
+    });
+});
@@ -4,7 +4,7 @@
  * Tests for the pluggable LLM provider system (Section 3.1 of the paper).
  *
  * All tests mock the actual SDK clients so no real API calls are made.
- * Test IDs: LP-1 through LP-15
+ * Test IDs: LP-1 through LP-17
  */
 
 import { createLLMProvider, buildLLMConfigFromVSCode } from '../src/utils/llmFactory';
@@ -23,7 +23,7 @@ import {
     PROMPT2_SYSTEM,
     PROMPT3_SYSTEM,
 } from '../src/utils/llmProvider';
-import { OpenAIProvider } from '../src/utils/openaiClient';
+import { OpenAIProvider, classifySATD, initializeOpenAICLI } from '../src/utils/openaiClient';
 import { AnthropicProvider } from '../src/utils/anthropicClient';
 import { GeminiProvider } from '../src/utils/geminiClient';
 import { TechnicalDebt } from '../src/models';
@@ -275,6 +275,43 @@ describe('LP-15: Provider swap — output shape is provider-independent', () =>
     });
 });
 
+// ---------------------------------------------------------------------------
+// LP-16 to LP-17  — Screening model for Prompt 1
+// ---------------------------------------------------------------------------
+
+describe('LP-16 to LP-17: Screening model escalation', () => {
+
+    const mockAnswers = (...answers: string[]): jest.Mock => {
+        const create = jest.fn();
+        for (const content of answers) {
+            create.mockResolvedValueOnce({ choices: [{ message: { content } }] });
+        }
+        const { OpenAI } = require('openai');
+        (OpenAI as jest.Mock).mockImplementation(() => ({ chat: { completions: { create } } }));
+        return create;
+    };
+
+    test('LP-16: a confident screening answer is final', async () => {
+        const create = mockAnswers('CLASSIFICATION: FALSE\nCONFIDENCE: 95');
+        initializeOpenAICLI('sk-screen', 'gpt-4o', 'gpt-4o-mini');
+
+        const r = await classifySATD('// returns the user id', 'int id() { return uid; }');
+
+        expect(r).toEqual(expect.objectContaining({ isSATD: false, confidence: 0.95 }));
+        expect(create.mock.calls.map(call => call[0].model)).toEqual(['gpt-4o-mini']);
+    });
+
+    test('LP-17: a low-confidence screening answer is escalated to the main model', async () => {
+        const create = mockAnswers('CLASSIFICATION: TRUE\nCONFIDENCE: 60', 'CLASSIFICATION: TRUE\nCONFIDENCE: 85');
+        initializeOpenAICLI('sk-screen', 'gpt-4o', 'gpt-4o-mini');
+
+        const r = await classifySATD('// works for now', 'cache.clear();');
+
+        expect(r).toEqual(expect.objectContaining({ isSATD: true, confidence: 0.85 }));
+        expect(create.mock.calls.map(call => call[0].model)).toEqual(['gpt-4o-mini', 'gpt-4o']);
+    });
+});
+
 // ---------------------------------------------------------------------------
 // Response parser unit tests (shared across all providers)
 // ---------------------------------------------------------------------------
@@ -6,6 +6,9 @@
 // Increase timeout for integration tests
 jest.setTimeout(30000);
 
+// Keep LLM responses in memory only; never read or write ~/.rapidpay
+process.env.RAPIDPAY_LLM_CACHE = 'off';
+
 // Mock console methods to reduce noise during tests
 const originalConsoleLog = console.log;
 const originalConsoleError = console.error;
@@ -364,6 +364,29 @@ describe('SIR: SATD Impact Ripple Score Calculation', () => {
                 expect(ranked[i - 1].sirScore).toBeGreaterThanOrEqual(ranked[i].sirScore || 0);
             }
         });
+
+        test('SIR-21: shared-graph analysis matches findChains then calculateSIRScores', () => {
+            const debts = [
+                createMockDebt('a', 'file.py', 10),
+                createMockDebt('b', 'file.py', 20),
+                createMockDebt('c', 'file.py', 30),
+                createMockDebt('d', 'other.py', 5)
+            ];
+            
+            const relationships: SatdRelationship[] = [
+                createMockRelationship('a', 'b', 0.8),
+                createMockRelationship('b', 'c', 0.6)
+            ];
+            
+            const separate = chainAnalyzer.findChains(debts, relationships);
+            const combined = chainAnalyzer.analyzeChainsAndSIR(debts, relationships);
+            
+            expect(combined.chains).toEqual(separate.chains);
+            expect(combined.relationships).toEqual(separate.relationships);
+            expect(combined.debtItems).toEqual(
+                chainAnalyzer.calculateSIRScores(debts, separate.relationships)
+            );
+        });
     });
 });
 
@@ -7,7 +7,7 @@ CSV datasets for subsequent SATD analysis. This is the first step in the
 RQ1 evaluation pipeline.
 
 Usage:
-    python 01_data_collection.py [--repos AC,RE,SC] [--clone]
+    python 01_data_collection.py [--repos AC,RE,SC] [--clone] [--jobs N]
     
 Output:
     - results/[REPO]_all_comments.csv: All extracted comments
@@ -24,6 +24,7 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Generator
 from dataclasses import dataclass, asdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
 # Add RQ1 directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
@@ -32,7 +33,7 @@ from utils import (
     load_config, get_rq1_config, get_repository_config, get_satd_patterns,
     get_repos_dir, get_results_dir, get_subject_systems, get_excluded_directories,
     ensure_directory, save_json_report, log_progress, generate_comment_id,
-    classify_satd_type, save_dicts_as_csv
+    get_comment_hash_length, classify_satd_type, save_dicts_as_csv
 )
 
 
@@ -40,6 +41,12 @@ from utils import (
 # Comment Extraction Patterns
 # ============================================================================
 
+# Source files handed to each worker process at a time
+FILES_PER_TASK = 32
+
+# Repositories cloned concurrently by --clone
+CLONE_JOBS = 4
+
 # Language-specific comment patterns
 COMMENT_PATTERNS = {
     'java': {
@@ -86,6 +93,24 @@ COMMENT_PATTERNS = {
     }
 }
 
+# Language of each extension, first match in COMMENT_PATTERNS order
+LANGUAGE_BY_EXTENSION = {}
+for _lang, _config in COMMENT_PATTERNS.items():
+    for _ext in _config['extensions']:
+        LANGUAGE_BY_EXTENSION.setdefault(_ext, _lang)
+
+# Compiled (single-line, multi-line) comment regexes per language. Python
+# docstrings match both """ and ''' quotes; other languages use /* */.
+_PYTHON_MULTI_LINE = re.compile(r'("""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\')')
+_C_STYLE_MULTI_LINE = re.compile(r'/\*[\s\S]*?\*/')
+COMPILED_COMMENT_PATTERNS = {
+    _lang: (
+        re.compile(_config['single_line'], re.MULTILINE),
+        _PYTHON_MULTI_LINE if _lang == 'python' else _C_STYLE_MULTI_LINE
+    )
+    for _lang, _config in COMMENT_PATTERNS.items()
+}
+
 
 @dataclass
 class ExtractedComment:
@@ -140,7 +165,10 @@ def clone_repository(repo_id: str, repo_config: Dict, repos_dir: Path) -> Path:
     
     ensure_directory(repos_dir)
     
-    cmd = ['git', 'clone', '--depth', str(depth), url, str(repo_path)]
+    # Only the default branch's working tree is scanned, so skip other
+    # branches and tags
+    cmd = ['git', 'clone', '--depth', str(depth), '--single-branch', '--no-tags',
+           url, str(repo_path)]
     
     try:
         subprocess.run(cmd, check=True, capture_output=True, text=True)
@@ -152,12 +180,39 @@ def clone_repository(repo_id: str, repo_config: Dict, repos_dir: Path) -> Path:
     return repo_path
 
 
+def clone_repositories(repo_ids: List[str], jobs: int = CLONE_JOBS) -> Dict[str, str]:
+    """
+    Clone all missing repositories, up to `jobs` at a time.
+    
+    Args:
+        repo_ids: Repository identifiers
+        jobs: Maximum concurrent clones
+        
+    Returns:
+        Mapping of repo_id to error message for clones that failed
+    """
+    repos_dir = get_repos_dir()
+    pending = [r for r in repo_ids if not (repos_dir / r).exists()]
+    errors = {}
+    
+    def clone(repo_id: str):
+        repo_config = get_repository_config(repo_id)
+        if not repo_config:
+            return  # Reported by process_repository
+        try:
+            clone_repository(repo_id, repo_config, repos_dir)
+        except Exception as e:
+            errors[repo_id] = str(e)
+    
+    if pending:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(clone, pending))
+    return errors
+
+
 def get_language_for_extension(ext: str) -> Optional[str]:
     """Get the programming language for a file extension."""
-    for lang, config in COMMENT_PATTERNS.items():
-        if ext.lower() in config['extensions']:
-            return lang
-    return None
+    return LANGUAGE_BY_EXTENSION.get(ext.lower())
 
 
 # ============================================================================
@@ -180,59 +235,57 @@ def extract_comments_from_file(
     Yields:
         ExtractedComment objects
     """
-    patterns = COMMENT_PATTERNS.get(language)
+    patterns = COMPILED_COMMENT_PATTERNS.get(language)
     if not patterns:
         return
+    single_line_pattern, multi_pattern = patterns
     
     try:
         with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
             content = f.read()
-            lines = content.split('\n')
     except Exception as e:
         log_progress(f"Error reading {file_path}: {e}", level="WARNING")
         return
     
+    # Per-file invariants, kept out of the per-comment loops
     relative_path = str(file_path.relative_to(repo_root))
-    
-    # Extract single-line comments
-    single_line_pattern = patterns['single_line']
-    for line_num, line in enumerate(lines, 1):
-        match = re.search(single_line_pattern, line)
-        if match:
-            comment_text = match.group(1).strip()
-            if comment_text:
-                is_explicit, is_implicit, matched = classify_satd_type(comment_text)
-                
-                yield ExtractedComment(
-                    id=generate_comment_id(relative_path, line_num, comment_text),
-                    file=relative_path,
-                    line=line_num,
-                    content=comment_text,
-                    is_multi_line=False,
-                    language=language,
-                    is_explicit_satd=is_explicit,
-                    is_implicit_satd=is_implicit,
-                    matched_patterns=matched
-                )
+    satd_patterns = get_satd_patterns()
+    hash_length = get_comment_hash_length()
+    
+    # Extract single-line comments: one MULTILINE scan of the whole file
+    # finds the first comment marker on each line, as a per-line search would
+    line_num = 1
+    line_pos = 0
+    for match in single_line_pattern.finditer(content):
+        line_num += content.count('\n', line_pos, match.start())
+        line_pos = match.start()
+        
+        comment_text = match.group(1).strip()
+        if comment_text:
+            is_explicit, is_implicit, matched = classify_satd_type(comment_text, satd_patterns)
+            
+            yield ExtractedComment(
+                id=generate_comment_id(relative_path, line_num, comment_text, hash_length),
+                file=relative_path,
+                line=line_num,
+                content=comment_text,
+                is_multi_line=False,
+                language=language,
+                is_explicit_satd=is_explicit,
+                is_implicit_satd=is_implicit,
+                matched_patterns=matched
+            )
     
     # Extract multi-line comments
-    multi_start = patterns['multi_line_start']
-    multi_end = patterns['multi_line_end']
-    
-    # For Python docstrings, handle triple quotes
-    if language == 'python':
-        # Match both """ and '''
-        multi_pattern = r'("""[\s\S]*?"""|\'\'\'[\s\S]*?\'\'\')'
-    else:
-        # For C-style comments
-        multi_pattern = r'/\*[\s\S]*?\*/'
-    
-    for match in re.finditer(multi_pattern, content):
+    line_num = 1
+    line_pos = 0
+    for match in multi_pattern.finditer(content):
         comment_text = match.group(0)
         
-        # Find the line number
+        # Find the line number, counting only the newlines since the last match
         start_pos = match.start()
-        line_num = content[:start_pos].count('\n') + 1
+        line_num += content.count('\n', line_pos, start_pos)
+        line_pos = start_pos
         
         # Clean up the comment (remove delimiters)
         if language == 'python':
@@ -241,10 +294,10 @@ def extract_comments_from_file(
             cleaned = comment_text[2:-2].strip()
         
         if cleaned:
-            is_explicit, is_implicit, matched = classify_satd_type(cleaned)
+            is_explicit, is_implicit, matched = classify_satd_type(cleaned, satd_patterns)
             
             yield ExtractedComment(
-                id=generate_comment_id(relative_path, line_num, cleaned[:100]),
+                id=generate_comment_id(relative_path, line_num, cleaned[:100], hash_length),
                 file=relative_path,
                 line=line_num,
                 content=cleaned,
@@ -256,18 +309,30 @@ def extract_comments_from_file(
             )
 
 
+def _extract_comments_worker(job: Tuple[Path, str, Path]) -> List[ExtractedComment]:
+    """Process-pool entry point: extract all comments from one file."""
+    file_path, language, repo_root = job
+    return list(extract_comments_from_file(file_path, language, repo_root))
+
+
 def extract_comments_from_repository(
     repo_path: Path,
     repo_config: Dict,
-    excluded_dirs: List[str]
+    excluded_dirs: List[str],
+    workers: Optional[int] = None
 ) -> List[ExtractedComment]:
     """
     Extract all comments from a repository.
     
+    Source files are collected in a single walk, then scanned in a pool
+    of worker processes; comments come back in walk order either way.
+    
     Args:
         repo_path: Path to the repository
         repo_config: Repository configuration
         excluded_dirs: Directories to exclude from scanning
+        workers: Number of worker processes (default: CPU count;
+            1 scans in-process)
         
     Returns:
         List of extracted comments
@@ -275,37 +340,49 @@ def extract_comments_from_repository(
     comments = []
     extensions = repo_config.get('extensions', [])
     
-    # Build set of extensions to process
-    ext_set = set(extensions)
+    # Build sets of extensions to process and directory names to prune
+    ext_set = frozenset(extensions)
+    excluded = frozenset(excluded_dirs)
     
     log_progress(f"Scanning repository: {repo_path}")
     log_progress(f"Extensions: {extensions}")
     log_progress(f"Excluded dirs: {excluded_dirs}")
     
-    file_count = 0
+    jobs = []
     
     for root, dirs, files in os.walk(repo_path):
-        # Skip excluded directories
-        dirs[:] = [d for d in dirs if d not in excluded_dirs and not d.startswith('.')]
+        # Prune excluded and hidden directories (.git) so os.walk never enters them
+        dirs[:] = [d for d in dirs if d not in excluded and not d.startswith('.')]
         
         for filename in files:
             ext = Path(filename).suffix.lower()
             if ext not in ext_set:
                 continue
             
-            file_path = Path(root) / filename
             language = get_language_for_extension(ext)
-            
             if language:
-                file_count += 1
-                for comment in extract_comments_from_file(file_path, language, repo_path):
-                    comments.append(comment)
-                
-                # Progress report
-                if file_count % 100 == 0:
-                    log_progress(f"Processed {file_count} files, found {len(comments)} comments so far")
-    
-    log_progress(f"Completed: {file_count} files, {len(comments)} comments extracted")
+                jobs.append((Path(root) / filename, language, repo_path))
+    
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_extract_comments_worker, jobs, chunksize=FILES_PER_TASK)
+    else:
+        executor = None
+        results = map(_extract_comments_worker, jobs)
+    
+    try:
+        for file_count, file_comments in enumerate(results, 1):
+            comments.extend(file_comments)
+            
+            # Progress report
+            if file_count % 100 == 0:
+                log_progress(f"Processed {file_count} files, found {len(comments)} comments so far")
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    
+    log_progress(f"Completed: {len(jobs)} files, {len(comments)} comments extracted")
     return comments
 
 
@@ -313,13 +390,15 @@ def extract_comments_from_repository(
 # Main Execution
 # ============================================================================
 
-def process_repository(repo_id: str, clone: bool = False) -> Dict:
+def process_repository(repo_id: str, clone: bool = False,
+                       workers: Optional[int] = None) -> Dict:
     """
     Process a single repository: clone if needed, extract comments, save CSV.
     
     Args:
         repo_id: Repository identifier
         clone: Whether to clone if not present
+        workers: Worker processes for comment extraction
         
     Returns:
         Dictionary with processing results
@@ -352,7 +431,7 @@ def process_repository(repo_id: str, clone: bool = False) -> Dict:
     excluded_dirs = get_excluded_directories()
     start_time = datetime.now()
     
-    comments = extract_comments_from_repository(repo_path, repo_config, excluded_dirs)
+    comments = extract_comments_from_repository(repo_path, repo_config, excluded_dirs, workers)
     
     duration = (datetime.now() - start_time).total_seconds()
     
@@ -419,6 +498,18 @@ def main():
         action='store_true',
         help='Clone repositories if they do not exist'
     )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=CLONE_JOBS,
+        help=f'Repositories cloned concurrently by --clone (default: {CLONE_JOBS})'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Worker processes for comment extraction (default: CPU count)'
+    )
     
     args = parser.parse_args()
     
@@ -441,8 +532,14 @@ def main():
         'repositories': {}
     }
     
+    # Clone everything up front, in parallel; the downloads are network-bound
+    clone_errors = clone_repositories(repo_ids, args.jobs) if args.clone else {}
+    
     for repo_id in repo_ids:
-        result = process_repository(repo_id, clone=args.clone)
+        if repo_id in clone_errors:
+            result = {'error': clone_errors[repo_id]}
+        else:
+            result = process_repository(repo_id, clone=args.clone, workers=args.workers)
         results[repo_id] = result
         
         if 'error' in result:
@@ -20,6 +20,7 @@ import sys
 import json
 import random
 import argparse
+from bisect import bisect_right
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional, Set
@@ -36,6 +37,14 @@ from utils import (
 )
 
 
+# Synthetic edge annotation outcomes, in cumulative-rate order
+EDGE_OUTCOMES = (
+    ('correct_relevant', 'Dependency exists and is relevant to joint SATD reasoning'),
+    ('correct_marginal', 'Dependency exists but unlikely to matter for SATD'),
+    ('incorrect', 'No such dependency found in code'),
+)
+
+
 # ============================================================================
 # Data Structures
 # ============================================================================
@@ -260,12 +269,12 @@ def sample_edges(
     Returns:
         List of sampled edges
     """
-    random.seed(random_seed)
+    rng = random.Random(random_seed)
     
     if len(edges) <= sample_size:
         return edges
     
-    return random.sample(edges, sample_size)
+    return rng.sample(edges, sample_size)
 
 
 def generate_synthetic_edge_annotations(
@@ -291,22 +300,18 @@ def generate_synthetic_edge_annotations(
     Returns:
         List of EdgeAnnotation objects
     """
-    random.seed(random_seed)
+    rng = random.Random(random_seed)
+    
+    # One roll per edge, in edge order; the outcome is the first cumulative
+    # rate the roll falls below
+    draw = rng.random
+    rolls = [draw() for _ in edges]
+    cutoffs = (correct_relevant_rate, correct_relevant_rate + correct_marginal_rate)
     
     annotations = []
     
-    for i, edge in enumerate(edges):
-        roll = random.random()
-        
-        if roll < correct_relevant_rate:
-            correctness = 'correct_relevant'
-            notes = 'Dependency exists and is relevant to joint SATD reasoning'
-        elif roll < correct_relevant_rate + correct_marginal_rate:
-            correctness = 'correct_marginal'
-            notes = 'Dependency exists but unlikely to matter for SATD'
-        else:
-            correctness = 'incorrect'
-            notes = 'No such dependency found in code'
+    for i, (edge, roll) in enumerate(zip(edges, rolls)):
+        correctness, notes = EDGE_OUTCOMES[bisect_right(cutoffs, roll)]
         
         annotation = EdgeAnnotation(
             edge_id=f"edge-{i}",
@@ -176,12 +176,12 @@ def sample_chains(
     Returns:
         List of sampled chains
     """
-    random.seed(random_seed)
+    rng = random.Random(random_seed)
     
     if len(chains) <= sample_size:
         return chains
     
-    return random.sample(chains, sample_size)
+    return rng.sample(chains, sample_size)
 
 
 def generate_synthetic_chain_annotations(
@@ -204,7 +204,7 @@ def generate_synthetic_chain_annotations(
     Returns:
         List of ChainAnnotation objects
     """
-    random.seed(random_seed)
+    rng = random.Random(random_seed)
     
     annotations = []
     
@@ -213,14 +213,14 @@ def generate_synthetic_chain_annotations(
         length = chain.get('length', len(nodes))
         
         # Determine coherence rating
-        if random.random() < high_coherence_rate:
+        if rng.random() < high_coherence_rate:
             # High coherence (4 or 5)
-            rating = random.choice([4, 5])
+            rating = rng.choice([4, 5])
             notes = "Chain represents related SATD items that should be considered together"
             would_consider = True
         else:
             # Lower coherence (1-3)
-            rating = random.randint(1, 3)
+            rating = rng.randint(1, 3)
             if rating == 1:
                 notes = "Chain items are structurally related but belong to independent features"
                 would_consider = False
@@ -229,7 +229,7 @@ def generate_synthetic_chain_annotations(
                 would_consider = False
             else:
                 notes = "Moderate connection, might consider together in some cases"
-                would_consider = random.random() > 0.5
+                would_consider = rng.random() > 0.5
         
         # Extract leaf nodes (nodes with no outgoing edges)
         leaf_nodes = chain.get('leaf_nodes', nodes[-1:] if nodes else [])
@@ -438,7 +438,7 @@ def generate_synthetic_chains(
     Returns:
         List of synthetic chain dictionaries
     """
-    random.seed(42)
+    rng = random.Random(42)
     
     if satd_count == 0:
         return []
@@ -449,12 +449,12 @@ def generate_synthetic_chains(
     chains = []
     for i in range(num_chains):
         # Chain length follows rough distribution from paper (avg ~2.8)
-        length = random.choices(
+        length = rng.choices(
             [2, 3, 4, 5, 6, 7],
             weights=[0.3, 0.3, 0.2, 0.1, 0.07, 0.03]
         )[0]
         
-        nodes = [f"satd-{random.randint(0, satd_count-1)}" for _ in range(length)]
+        nodes = [f"satd-{rng.randint(0, satd_count-1)}" for _ in range(length)]
         
         chains.append({
             'id': f'chain-{i}',
@@ -462,8 +462,8 @@ def generate_synthetic_chains(
             'length': length,
             'root_node': nodes[0],
             'leaf_nodes': [nodes[-1]],
-            'total_weight': round(random.uniform(1.0, 5.0), 2),
-            'max_sir_score': round(random.uniform(0.3, 0.9), 3)
+            'total_weight': round(rng.uniform(1.0, 5.0), 2),
+            'max_sir_score': round(rng.uniform(0.3, 0.9), 3)
         })
     
     return chains
@@ -345,6 +345,21 @@ def determine_actual_satd(entry: GroundTruthEntry, confidence: float) -> bool:
     return confidence > 0.7
 
 
+# Debt type keywords in priority order, each list compiled to one
+# alternation so a comment is scanned once per type rather than per word
+DEBT_TYPE_KEYWORDS = tuple(
+    (debt_type, re.compile('|'.join(map(re.escape, keywords))))
+    for debt_type, keywords in (
+        ('Design', ['architecture', 'design', 'pattern', 'refactor', 'restructure']),
+        ('Test', ['test', 'spec', 'coverage', 'unit', 'integration']),
+        ('Documentation', ['doc', 'comment', 'javadoc', 'readme', 'explain']),
+        ('Defect', ['bug', 'error', 'crash', 'fail', 'broken', 'wrong']),
+        ('Requirement', ['feature', 'implement', 'add', 'support', 'incomplete']),
+        ('Implementation', ['hack', 'workaround', 'quick', 'temp', 'dirty']),
+    )
+)
+
+
 def classify_debt_type(content: str) -> str:
     """
     Classify the type of technical debt.
@@ -365,24 +380,10 @@ def classify_debt_type(content: str) -> str:
     """
     content_lower = content.lower()
     
-    # Check for specific patterns
-    if any(word in content_lower for word in ['architecture', 'design', 'pattern', 'refactor', 'restructure']):
-        return 'Design'
-    
-    if any(word in content_lower for word in ['test', 'spec', 'coverage', 'unit', 'integration']):
-        return 'Test'
-    
-    if any(word in content_lower for word in ['doc', 'comment', 'javadoc', 'readme', 'explain']):
-        return 'Documentation'
-    
-    if any(word in content_lower for word in ['bug', 'error', 'crash', 'fail', 'broken', 'wrong']):
-        return 'Defect'
-    
-    if any(word in content_lower for word in ['feature', 'implement', 'add', 'support', 'incomplete']):
-        return 'Requirement'
-    
-    if any(word in content_lower for word in ['hack', 'workaround', 'quick', 'temp', 'dirty']):
-        return 'Implementation'
+    # First category, in priority order, with a keyword anywhere in the text
+    for debt_type, keywords in DEBT_TYPE_KEYWORDS:
+        if keywords.search(content_lower):
+            return debt_type
     
     # Default based on pattern type
     return 'Implementation'
@@ -370,17 +370,23 @@ def normalize_path(path: str) -> str:
 # SATD Pattern Matching
 # ============================================================================
 
-def classify_satd_type(content: str) -> Tuple[bool, bool, List[str]]:
+def classify_satd_type(
+    content: str,
+    patterns: Optional[Dict[str, List[str]]] = None
+) -> Tuple[bool, bool, List[str]]:
     """
     Classify whether a comment matches explicit or implicit SATD patterns.
     
     Args:
         content: The comment content to classify
+        patterns: SATD patterns from get_satd_patterns(); loaded from the
+            config when omitted, so pass them in when classifying many comments
         
     Returns:
         Tuple of (is_explicit, is_implicit, matched_patterns)
     """
-    patterns = get_satd_patterns()
+    if patterns is None:
+        patterns = get_satd_patterns()
     matched = []
     is_explicit = False
     is_implicit = False
@@ -444,10 +450,17 @@ def get_repo_path(repo_id: str) -> Path:
     return get_repos_dir() / repo_id
 
 
-def generate_comment_id(file: str, line: int, content: str) -> str:
-    """Generate a unique ID for a comment."""
+def get_comment_hash_length() -> int:
+    """Get the number of hash characters in a comment ID."""
     config = load_config()
-    hash_length = config.get("global_settings", {}).get("comment_hash_length", 12)
+    return config.get("global_settings", {}).get("comment_hash_length", 12)
+
+
+def generate_comment_id(file: str, line: int, content: str,
+                        hash_length: Optional[int] = None) -> str:
+    """Generate a unique ID for a comment (hash_length defaults to the config)."""
+    if hash_length is None:
+        hash_length = get_comment_hash_length()
     
     unique_string = f"{file}:{line}:{content}"
     hash_value = hashlib.md5(unique_string.encode()).hexdigest()[:hash_length]
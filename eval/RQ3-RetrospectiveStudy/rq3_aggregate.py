@@ -14,12 +14,15 @@ Usage:
     python rq3_aggregate.py --no-write # just print, don't update CSVs
 """
 import csv, os, sys, argparse
+from types import MappingProxyType
 
 BASE = os.path.dirname(os.path.abspath(__file__))
 RESULTS = os.path.join(BASE, 'rq3_results')
-K_VALUES = [1, 3, 5, 10]
-PROJECTS = ['AC','SF','TF','RE','VS','AN','SC','PO','KU','FI']
-STRATEGIES = ['recency','effort_only','sir_only','caig_full']
+K_VALUES = (1, 3, 5, 10)
+PROJECTS = ('AC','SF','TF','RE','VS','AN','SC','PO','KU','FI')
+STRATEGIES = ('recency','effort_only','sir_only','caig_full')
+STRATEGY_LABELS = MappingProxyType({'sir_only':'SIROnly','caig_full':'CAIG',
+                                    'recency':'Recency','effort_only':'EffortOnly'})
 
 def read_replay(proj):
     path = os.path.join(RESULTS, f'rq3_raw_replay_{proj}.csv')
@@ -28,18 +31,21 @@ def read_replay(proj):
     with open(path, encoding='utf-8', newline='') as f:
         return list(csv.DictReader(f))
 
+def rank(r):
+    """Rank of one replay row: paper_rank if available, else rank_of_first_hit."""
+    v = r.get('paper_rank') or r.get('rank_of_first_hit','9999')
+    try: return int(v)
+    except: return 9999
+
 def compute_metrics(rows):
     """rows: list of dicts for one (project, strategy)."""
     n = len(rows)
     if n == 0:
         return {f'hit_at_{k}': 0.0 for k in K_VALUES} | {'mrr': 0.0, 'n': 0}
-    # Use paper_rank if available, else rank_of_first_hit
-    def rank(r):
-        v = r.get('paper_rank') or r.get('rank_of_first_hit','9999')
-        try: return int(v)
-        except: return 9999
-    hits = {k: sum(1 for r in rows if rank(r) <= k) / n for k in K_VALUES}
-    mrr = sum(1.0/max(1,rank(r)) for r in rows) / n
+    # Parse each row's rank once for all k and the MRR
+    ranks = [rank(r) for r in rows]
+    hits = {k: sum(1 for x in ranks if x <= k) / n for k in K_VALUES}
+    mrr = sum(1.0/max(1,x) for x in ranks) / n
     return {f'hit_at_{k}': round(hits[k],4) for k in K_VALUES} | {'mrr': round(mrr,4), 'n': n}
 
 def load_precomputed(fname):
@@ -56,12 +62,16 @@ def main():
 
     print("\n=== RQ3 Aggregation ===\n")
 
-    # Load all raw data
+    # Load all raw data, split by strategy in one pass per project
     all_rows = {}
     for proj in PROJECTS:
-        rows = read_replay(proj)
+        by_strat = {strat: [] for strat in STRATEGIES}
+        for r in read_replay(proj):
+            bucket = by_strat.get(r.get('strategy'))
+            if bucket is not None:
+                bucket.append(r)
         for strat in STRATEGIES:
-            all_rows[(proj,strat)] = [r for r in rows if r.get('strategy')==strat]
+            all_rows[(proj,strat)] = by_strat[strat]
 
     # Compute per-project metrics
     per_proj = {}
@@ -91,9 +101,6 @@ def main():
     precomp_pp   = load_precomputed('rq3_per_project.csv')
     precomp_agg  = load_precomputed('rq3_hit_mrr_aggregate.csv')
 
-    strat_labels = {'sir_only':'SIROnly','caig_full':'CAIG',
-                    'recency':'Recency','effort_only':'EffortOnly'}
-
     # Macro-average rounds within paper tolerance; the paper's own Table 11
     # aggregate sits ~0.01 above the mean of its Table 12 per-project values
     # (rounding), so we treat deltas up to 0.015 as a match.
@@ -104,7 +111,7 @@ def main():
     print(f"{'Strategy':<12} {'Hit@1':>6} {'Hit@3':>6} {'Hit@5':>6} {'Hit@10':>7} {'MRR':>6}")
     for strat in ['sir_only','caig_full']:
         m = aggregate[strat]
-        label = strat_labels[strat]
+        label = STRATEGY_LABELS[strat]
         pc = precomp_agg.get(label,{})
         note = ''
         if pc:
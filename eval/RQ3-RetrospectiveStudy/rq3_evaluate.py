@@ -16,6 +16,7 @@ Usage:
     python rq3_evaluate.py --config config.yaml --output results/
     python rq3_evaluate.py --config config.yaml --output results/ --projects react,scipy
     python rq3_evaluate.py --config config.yaml --output results/ --quick   # fewer commits per project
+    python rq3_evaluate.py --config config.yaml --output results/ --no-scan-cache
 
 Outputs (in --output directory):
     rq3_hit_mrr_aggregate.csv          - Table: aggregate Hit@k / MRR
@@ -24,6 +25,7 @@ Outputs (in --output directory):
     rq3_time_to_resolution.csv         - Time-to-resolution counterfactual
     rq3_raw_replay_<project>.csv       - Raw per-commit replay data (for audit)
     rq3_summary.txt                    - Human-readable summary
+    scan_cache/<project>_<sha>.json    - Cached snapshot SATD scans (reused on re-runs)
 
 Author: RapidPay authors
 """
@@ -31,6 +33,7 @@ Author: RapidPay authors
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import logging
 import math
@@ -252,6 +255,11 @@ def _git(repo: str, *args: str, check: bool = True, capture: bool = True) -> str
     return result.stdout if capture else ""
 
 
+def git_resolve_commit(repo: str, ref: str) -> str:
+    """Resolve a ref or abbreviated hash to its full commit SHA."""
+    return _git(repo, "rev-parse", "--verify", f"{ref}^{{commit}}").strip()
+
+
 def git_commit_exists(repo: str, sha: str) -> bool:
     try:
         _git(repo, "cat-file", "-e", f"{sha}^{{commit}}")
@@ -470,12 +478,74 @@ def detect_satd_instances(repo: str, snapshot: str, project_id: str) -> List[SAT
     return instances
 
 
+def _scan_fingerprint() -> str:
+    """Digest of the lexical scan settings; a change invalidates cached scans."""
+    settings = {
+        "keywords": SATD_KEYWORDS,
+        "phrases": SATD_PHRASE_PATTERNS,
+        "extensions": sorted(SOURCE_EXTENSIONS),
+        "markers": {ext: list(m) for ext, m in sorted(COMMENT_MARKERS.items())},
+    }
+    blob = json.dumps(settings, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def load_satd_instances(
+    repo: str,
+    snapshot: str,
+    project_id: str,
+    cache_dir: Optional[Path] = None,
+) -> List[SATDInstance]:
+    """
+    Return the SATD instances at the snapshot, reusing an on-disk scan when
+    one exists for the same commit SHA and scan settings.
+
+    The snapshot tree is immutable, so a cached scan stays valid until the
+    keywords, phrases, extensions or comment markers change.
+    """
+    if cache_dir is None:
+        return detect_satd_instances(repo, snapshot, project_id)
+
+    sha = git_resolve_commit(repo, snapshot)
+    cache_path = cache_dir / f"{project_id}_{sha}.json"
+    fingerprint = _scan_fingerprint()
+    if cache_path.is_file():
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("fingerprint") == fingerprint:
+                instances = [SATDInstance(**d) for d in cached["instances"]]
+                log.info(
+                    "[%s] Loaded %d SATD instances from scan cache %s",
+                    project_id, len(instances), cache_path,
+                )
+                return instances
+            log.info("[%s] Scan settings changed; re-scanning.", project_id)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            log.warning("[%s] Ignoring unreadable scan cache %s: %s", project_id, cache_path, e)
+
+    instances = detect_satd_instances(repo, snapshot, project_id)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"fingerprint": fingerprint, "instances": [asdict(s) for s in instances]},
+            f,
+        )
+    os.replace(tmp_path, cache_path)
+    return instances
+
+
 # ---------------------------------------------------------------------------
 # Dependency graph + chains
 # ---------------------------------------------------------------------------
 
 @dataclass
 class DependencyEdge:
+    # Full-dependency projects produce hundreds of thousands of edges, so
+    # they carry no per-instance __dict__
+    __slots__ = ("src", "dst", "rel_type", "weight", "hops")
+
     src: str
     dst: str
     rel_type: str    # "call", "data", "control", "module"
@@ -518,26 +588,31 @@ def build_dependency_graph(
         by_file[s.file].append(s)
 
     # 1) module-level edges: pairs in the same file
+    w = (REL_WEIGHTS["module"][0] + REL_WEIGHTS["module"][1]) / 2
     for f, group in by_file.items():
         for i, a in enumerate(group):
             for b in group[i + 1 :]:
-                w = (REL_WEIGHTS["module"][0] + REL_WEIGHTS["module"][1]) / 2
                 edges.append(DependencyEdge(a.id, b.id, "module", w, 1))
                 edges.append(DependencyEdge(b.id, a.id, "module", w, 1))
 
     # 2) approximate call/data/control via proximity (within 200 lines, same file)
     if project.full_dependency:
+        # Treat short distance as call-like, with a slightly weaker data edge
+        # in the reverse direction
+        w = (REL_WEIGHTS["call"][0] + REL_WEIGHTS["call"][1]) / 2
+        wd = (REL_WEIGHTS["data"][0] + REL_WEIGHTS["data"][1]) / 2
         for f, group in by_file.items():
+            # Snapshot scans list a file's instances by ascending line, so
+            # the pairs within 200 lines of `a` are a prefix of the rest
+            ascending = all(x.line <= y.line for x, y in zip(group, group[1:]))
             for i, a in enumerate(group):
                 for b in group[i + 1 :]:
                     dist = abs(a.line - b.line)
                     if dist <= 200:
-                        # Treat short distance as call-like
-                        w = (REL_WEIGHTS["call"][0] + REL_WEIGHTS["call"][1]) / 2
                         edges.append(DependencyEdge(a.id, b.id, "call", w, 1))
-                        # Slightly weaker data edge in the reverse direction
-                        wd = (REL_WEIGHTS["data"][0] + REL_WEIGHTS["data"][1]) / 2
                         edges.append(DependencyEdge(b.id, a.id, "data", wd, 1))
+                    elif ascending:
+                        break
 
     # 3) module edges across files that share a common directory prefix of depth>=2
     dirs_to_satd: Dict[Tuple[str, ...], List[SATDInstance]] = defaultdict(list)
@@ -603,82 +678,219 @@ def find_chains(
 # SIR scoring (paper Algorithm 3)
 # ---------------------------------------------------------------------------
 
+def _reachability_from(
+    src: int, out_edges: List[List[Tuple[int, float]]], strength: List[float]
+) -> float:
+    """Reachability_w of one node by label-correcting search.
+
+    `strength` is a scratch list of -1.0 per node and is restored on return.
+    """
+    reached: List[int] = []
+    stack: List[Tuple[int, float]] = [(src, 0.0)]
+    while stack:
+        node, path_strength = stack.pop()
+        for dst, w in out_edges[node]:
+            ns = path_strength if path_strength > w else w
+            if dst == src:
+                continue
+            cur = strength[dst]
+            if ns > cur:
+                if cur < 0.0:
+                    reached.append(dst)
+                strength[dst] = ns
+                stack.append((dst, ns))
+    total = 0.0
+    for node in reached:
+        total += strength[node]
+        strength[node] = -1.0
+    return total
+
+
+def _reachability_scores(out_edges: List[List[Tuple[int, float]]]) -> List[float]:
+    """Reachability_w of every node, precomputed per connected component.
+
+    build_dependency_graph links every pair in both directions, so the graph
+    is undirected. A source that is not an articulation point of its
+    component reaches every other member, each through the heaviest edge of
+    the component that does not touch the source (or the source's own
+    heaviest edge, if that is larger). Those nodes all get the same strength,
+    so only articulation points need the per-source search -- or every node,
+    if some edge has no reverse.
+    """
+    n = len(out_edges)
+    reachability = [0.0] * n
+    strength = [-1.0] * n
+
+    pairs = {(u, v) for u, es in enumerate(out_edges) for v, _ in es}
+    if any((v, u) not in pairs for u, v in pairs):
+        for src in range(n):
+            reachability[src] = _reachability_from(src, out_edges, strength)
+        return reachability
+
+    # Components and articulation points (iterative Tarjan lowlink)
+    comp = [-1] * n
+    disc = [0] * n
+    low = [0] * n
+    cut = bytearray(n)
+    members: List[List[int]] = []
+    clock = 0
+    for root in range(n):
+        if comp[root] != -1:
+            continue
+        c = len(members)
+        group = [root]
+        members.append(group)
+        comp[root] = c
+        disc[root] = low[root] = clock
+        clock += 1
+        stack = [(root, -1, iter(out_edges[root]))]
+        children = 0
+        while stack:
+            node, parent, it = stack[-1]
+            for dst, _ in it:
+                if comp[dst] == -1:
+                    comp[dst] = c
+                    group.append(dst)
+                    disc[dst] = low[dst] = clock
+                    clock += 1
+                    stack.append((dst, node, iter(out_edges[dst])))
+                    break
+                if dst != parent and disc[dst] < low[node]:
+                    low[node] = disc[dst]
+            else:
+                stack.pop()
+                if stack:
+                    up = stack[-1][0]
+                    if low[node] < low[up]:
+                        low[up] = low[node]
+                    if up == root:
+                        children += 1
+                    elif low[node] >= disc[up]:
+                        cut[up] = 1
+        if children > 1:
+            cut[root] = 1
+
+    # Each component's edges, heaviest first
+    ranked: List[List[Tuple[float, int, int]]] = [[] for _ in members]
+    for u, es in enumerate(out_edges):
+        for v, w in es:
+            ranked[comp[u]].append((w, u, v))
+    for group_edges in ranked:
+        group_edges.sort(key=lambda e: e[0], reverse=True)
+
+    # Sum repeated strengths in the same order the search would
+    sums: Dict[Tuple[float, int], float] = {}
+    for src in range(n):
+        others = len(members[comp[src]]) - 1
+        if not others:
+            continue
+        if cut[src]:
+            reachability[src] = _reachability_from(src, out_edges, strength)
+            continue
+        m = max(w for dst, w in out_edges[src] if dst != src)
+        for w, u, v in ranked[comp[src]]:
+            if w <= m:
+                break
+            if u != src and v != src:
+                m = w
+                break
+        total = sums.get((m, others))
+        if total is None:
+            total = 0.0
+            for _ in range(others):
+                total += m
+            sums[(m, others)] = total
+        reachability[src] = total
+    return reachability
+
+
 def compute_sir_scores(
     instances: List[SATDInstance], edges: List[DependencyEdge]
 ) -> None:
     """Fill in sir_* fields on each instance, normalized to [0,1]."""
-    # Outgoing edges per node
-    out_edges: Dict[str, List[DependencyEdge]] = defaultdict(list)
+    # Instances are numbered once so the per-node loops below index flat
+    # lists instead of hashing ids; out_edges[i] holds (dst_index, weight)
+    index_of: Dict[str, int] = {s.id: i for i, s in enumerate(instances)}
+    n = len(instances)
+    out_edges: List[List[Tuple[int, float]]] = [[] for _ in range(n)]
     for e in edges:
-        out_edges[e.src].append(e)
+        out_edges[index_of[e.src]].append((index_of[e.dst], e.weight))
 
     # Fanout_w: sum of outgoing weights
-    fanout: Dict[str, float] = {s.id: 0.0 for s in instances}
-    for sid, es in out_edges.items():
-        fanout[sid] = sum(e.weight for e in es)
-
-    # ChainLen_w: longest weighted path (DFS with memoization + cycle guard)
-    chainlen: Dict[str, float] = {}
-
-    def dfs_chainlen(node: str, visiting: Set[str]) -> float:
-        if node in chainlen:
-            return chainlen[node]
-        if node in visiting:
-            return 0.0
-        visiting.add(node)
-        best = 0.0
-        for e in out_edges.get(node, []):
-            v = e.weight + dfs_chainlen(e.dst, visiting)
-            if v > best:
-                best = v
-        visiting.remove(node)
-        chainlen[node] = best
-        return best
+    fanout = [sum(w for _, w in es) if es else 0.0 for es in out_edges]
+
+    # ChainLen_w: longest weighted path (DFS with memoization + cycle guard).
+    # Iterative, so long same-file chains cannot hit the recursion limit; a
+    # node's value is fixed when its DFS frame finishes, and an edge back
+    # onto the current path contributes only its own weight.
+    chainlen = [0.0] * n
+    done = bytearray(n)
+    on_path = bytearray(n)
+    for root in range(n):
+        if done[root]:
+            continue
+        on_path[root] = 1
+        path = [root]
+        next_edge = [0]
+        best = [0.0]
+        while path:
+            node = path[-1]
+            es = out_edges[node]
+            pos = next_edge[-1]
+            if pos < len(es):
+                next_edge[-1] = pos + 1
+                dst, w = es[pos]
+                if done[dst]:
+                    v = w + chainlen[dst]
+                elif on_path[dst]:
+                    v = w + 0.0
+                else:
+                    on_path[dst] = 1
+                    path.append(dst)
+                    next_edge.append(0)
+                    best.append(0.0)
+                    continue
+                if v > best[-1]:
+                    best[-1] = v
+                continue
 
-    for s in instances:
-        dfs_chainlen(s.id, set())
+            path.pop()
+            next_edge.pop()
+            result = best.pop()
+            on_path[node] = 0
+            done[node] = 1
+            chainlen[node] = result
+            if path:
+                v = out_edges[path[-1]][next_edge[-1] - 1][1] + result
+                if v > best[-1]:
+                    best[-1] = v
 
     # Reachability_w: sum over reachable nodes of max single-edge weight on path
-    reachability: Dict[str, float] = {}
-    for s in instances:
-        visited: Dict[str, float] = {}
-        stack: List[Tuple[str, float]] = [(s.id, 0.0)]
-        while stack:
-            node, path_strength = stack.pop()
-            for e in out_edges.get(node, []):
-                ns = max(path_strength, e.weight)
-                if e.dst == s.id:
-                    continue
-                cur = visited.get(e.dst, -1.0)
-                if ns > cur:
-                    visited[e.dst] = ns
-                    stack.append((e.dst, ns))
-        reachability[s.id] = sum(visited.values())
+    reachability = _reachability_scores(out_edges)
 
     # Min-max normalize each component
-    def normalize(d: Dict[str, float]) -> Dict[str, float]:
-        if not d:
-            return d
-        vs = list(d.values())
+    def normalize(vs: List[float]) -> List[float]:
+        if not vs:
+            return vs
         lo, hi = min(vs), max(vs)
         rng = hi - lo or 1.0
-        return {k: (v - lo) / rng for k, v in d.items()}
+        return [(v - lo) / rng for v in vs]
 
     n_fanout = normalize(fanout)
     n_chainlen = normalize(chainlen)
     n_reach = normalize(reachability)
 
     a, b, g = SIR_WEIGHTS["alpha"], SIR_WEIGHTS["beta"], SIR_WEIGHTS["gamma"]
-    raw_sir: Dict[str, float] = {}
-    for s in instances:
-        s.sir_fanout = n_fanout.get(s.id, 0.0)
-        s.sir_chainlen = n_chainlen.get(s.id, 0.0)
-        s.sir_reachability = n_reach.get(s.id, 0.0)
-        raw_sir[s.id] = a * s.sir_fanout + b * s.sir_chainlen + g * s.sir_reachability
+    raw_sir = [
+        a * f + b * c + g * r for f, c, r in zip(n_fanout, n_chainlen, n_reach)
+    ]
 
     sir_norm = normalize(raw_sir)
-    for s in instances:
-        s.sir_score = sir_norm.get(s.id, 0.0)
+    for i, s in enumerate(instances):
+        s.sir_fanout = n_fanout[i]
+        s.sir_chainlen = n_chainlen[i]
+        s.sir_reachability = n_reach[i]
+        s.sir_score = sir_norm[i]
 
 
 # ---------------------------------------------------------------------------
@@ -909,6 +1121,22 @@ class CAIGRanking(RankingStrategy):
 
     def __init__(self, chain_of: Dict[str, str]) -> None:
         self.chain_of = chain_of
+        # Per-instance file path and file -> chains index, built once for
+        # the instance list being replayed rather than on every rank() call
+        self._indexed: Optional[List[SATDInstance]] = None
+        self._file_of: Dict[str, str] = {}
+        self._chains_of_file: Dict[str, Set[str]] = {}
+
+    def _index(self, instances: List[SATDInstance]) -> None:
+        if self._indexed is instances and len(self._file_of) == len(instances):
+            return
+        self._file_of = {}
+        self._chains_of_file = defaultdict(set)
+        for s in instances:
+            f_norm = Path(s.file).as_posix()
+            self._file_of[s.id] = f_norm
+            self._chains_of_file[f_norm].add(self.chain_of.get(s.id, s.id))
+        self._indexed = instances
 
     def rank(
         self,
@@ -935,29 +1163,25 @@ class CAIGRanking(RankingStrategy):
             else set()
         )
 
-        # Pre-index instances by chain
-        chain_to_ids: Dict[str, Set[str]] = defaultdict(set)
-        for s in instances:
-            cid = self.chain_of.get(s.id, s.id)
-            chain_to_ids[cid].add(s.id)
+        # Chains with at least one file in the most recent commit
+        self._index(instances)
+        file_of = self._file_of
         id_to_chain = self.chain_of
-
-        # File set per chain
-        chain_files: Dict[str, Set[str]] = defaultdict(set)
-        for s in instances:
-            chain_files[id_to_chain.get(s.id, s.id)].add(Path(s.file).as_posix())
+        latest_chains: Set[str] = set()
+        for f in latest_files:
+            latest_chains.update(self._chains_of_file.get(f, ()))
 
         cand = [s for s in instances if s.id not in already_addressed]
 
         scored: List[Tuple[str, float]] = []
         for s in cand:
-            f_norm = Path(s.file).as_posix()
+            f_norm = file_of[s.id]
             commit_rel = touched_recent.get(f_norm, 0.0) / max_touched
             cid = id_to_chain.get(s.id, s.id)
             # Fix potential proxy
             if f_norm in latest_files:
                 f_i = 1.0
-            elif chain_files[cid] & latest_files:
+            elif cid in latest_chains:
                 f_i = 0.5
             else:
                 f_i = 0.0
@@ -995,6 +1219,7 @@ class ProjectReplayResult:
 def replay_project(
     project: ProjectConfig,
     quick: bool = False,
+    scan_cache: Optional[Path] = None,
 ) -> ProjectReplayResult:
     log.info("=== Replaying project %s (%s) ===", project.project_id, project.name)
 
@@ -1006,8 +1231,8 @@ def replay_project(
         )
 
     # 1. Detect SATD at the snapshot
-    instances = detect_satd_instances(
-        project.repo_path, project.snapshot_commit, project.project_id
+    instances = load_satd_instances(
+        project.repo_path, project.snapshot_commit, project.project_id, scan_cache
     )
     if not instances:
         log.warning("[%s] No SATD instances detected; skipping.", project.project_id)
@@ -1381,8 +1606,7 @@ def write_csv(path: Path, rows: List[Dict[str, Any]]) -> None:
     with path.open("w", newline="", encoding="utf-8") as f:
         w = csv.DictWriter(f, fieldnames=fieldnames)
         w.writeheader()
-        for r in rows:
-            w.writerow(r)
+        w.writerows(rows)
     log.info("Wrote %s (%d rows)", path, len(rows))
 
 
@@ -1501,6 +1725,11 @@ def main() -> int:
         action="store_true",
         help="Quick mode: cap SATD instances and commits per project",
     )
+    parser.add_argument(
+        "--no-scan-cache",
+        action="store_true",
+        help="Always re-scan snapshots instead of reusing <output>/scan_cache/",
+    )
     args = parser.parse_args()
 
     out_dir = Path(args.output)
@@ -1510,6 +1739,7 @@ def main() -> int:
         "[%(asctime)s] %(levelname)s %(name)s: %(message)s"
     ))
     logging.getLogger().addHandler(fh)
+    scan_cache = None if args.no_scan_cache else out_dir / "scan_cache"
 
     try:
         projects = load_config(args.config)
@@ -1531,7 +1761,7 @@ def main() -> int:
     results: List[ProjectReplayResult] = []
     for p in projects:
         try:
-            r = replay_project(p, quick=args.quick)
+            r = replay_project(p, quick=args.quick, scan_cache=scan_cache)
             results.append(r)
             # Write raw per-project replay log
             write_raw_per_project(
@@ -10,6 +10,7 @@
 #   ./setup_repos.sh                  # clone all 10 (large download)
 #   ./setup_repos.sh --shallow        # use --filter=blob:none for faster clones
 #   ./setup_repos.sh --only react,scipy
+#   ./setup_repos.sh --jobs 8         # clone up to 8 repos at once (default 4)
 #
 # Disk space: full clones can total >50GB for all 10. Use --shallow when
 # possible. We need the full commit history (no --depth=1) but can defer
@@ -19,6 +20,7 @@ set -euo pipefail
 
 SHALLOW=0
 ONLY=""
+JOBS=4
 REPO_DIR="repos"
 CONFIG_FILE="config.yaml"
 
@@ -53,6 +55,7 @@ while [[ $# -gt 0 ]]; do
   case "$1" in
     --shallow) SHALLOW=1; shift ;;
     --only)    ONLY="$2"; shift 2 ;;
+    --jobs)    JOBS="$2"; shift 2 ;;
     -h|--help)
       grep '^#' "$0" | sed 's/^# \{0,1\}//'
       exit 0 ;;
@@ -71,12 +74,15 @@ clone_one() {
     return 0
   fi
   echo "[$dirname] Cloning from $url ..."
+  # --quiet: progress bars from concurrent clones would interleave
+  # Explicit returns: errexit does not apply to the backgrounded `||` below
   if [[ $SHALLOW -eq 1 ]]; then
-    git clone --filter=blob:none --no-checkout "$url" "$target"
-    (cd "$target" && git checkout HEAD)
+    git clone --quiet --filter=blob:none --no-checkout "$url" "$target" || return 1
+    (cd "$target" && git checkout --quiet HEAD) || return 1
   else
-    git clone "$url" "$target"
+    git clone --quiet "$url" "$target" || return 1
   fi
+  echo "[$dirname] Cloned"
 }
 
 pick_snapshot() {
@@ -126,6 +132,7 @@ if [[ -n "$ONLY" ]]; then
   IFS=',' read -ra SUBSET <<< "$ONLY"
 fi
 
+SELECTED=()
 for dirname in "${!REPOS[@]}"; do
   if [[ -n "$ONLY" ]]; then
     match=0
@@ -134,11 +141,50 @@ for dirname in "${!REPOS[@]}"; do
     done
     [[ $match -eq 1 ]] || continue
   fi
-  clone_one "$dirname"
+  SELECTED+=("$dirname")
+done
+
+# Clone up to $JOBS repos concurrently (the downloads are network-bound).
+# Each job is reaped with a plain `wait PID` (no bash 4.3 `wait -n`), oldest
+# first, so every clone's exit status is collected.
+declare -A CLONE_OF=()
+declare -A FAILED=()
+RUNNING=()
+reap_oldest() {
+  local pid="${RUNNING[0]}"
+  RUNNING=("${RUNNING[@]:1}")
+  if ! wait "$pid"; then
+    FAILED[${CLONE_OF[$pid]}]=1
+  fi
+}
+for dirname in "${SELECTED[@]}"; do
+  if [[ ${#RUNNING[@]} -ge $JOBS ]]; then
+    reap_oldest
+  fi
+  clone_one "$dirname" &
+  CLONE_OF[$!]="$dirname"
+  RUNNING+=("$!")
+done
+while [[ ${#RUNNING[@]} -gt 0 ]]; do
+  reap_oldest
+done
+
+# Snapshot selection rewrites config.yaml, so it runs serially
+for dirname in "${SELECTED[@]}"; do
+  if [[ -n "${FAILED[$dirname]:-}" ]]; then
+    echo "[$dirname] Clone failed; skipping snapshot selection"
+    continue
+  fi
   sha="$(pick_snapshot "$REPO_DIR/$dirname")"
   update_config "${IDS[$dirname]}" "$sha"
 done
 
+if [[ ${#FAILED[@]} -gt 0 ]]; then
+  echo
+  echo "ERROR: ${#FAILED[@]} clone(s) failed: ${!FAILED[*]}" >&2
+  exit 1
+fi
+
 echo
 echo "Done. Inspect $CONFIG_FILE and adjust horizon_months / snapshot_commit if needed."
 echo "Then run: python rq3_evaluate.py --config $CONFIG_FILE --output rq3_results/"
@@ -16,6 +16,7 @@ import {
     DEFAULT_RELATIONSHIP_WEIGHTS,
     MAX_DEPENDENCY_HOPS
 } from '../models';
+import { groupDebtItemsByFile } from '../utils/debtGrouping';
 import * as path from 'path';
 import * as parser from '@babel/parser';
 import traverse from '@babel/traverse';
@@ -55,11 +56,13 @@ export class CallGraphAnalyzer {
      * Find relationships between technical debt items based on call graphs
      * @param debtItems List of technical debt items to analyze
      * @param fileContentMap Map of file paths to their content
+     * @param debtByFile Debt items grouped by file, if the caller already has them
      * @returns List of call graph relationships with weighted edges
      */
     public async findRelationships(
         debtItems: TechnicalDebt[], 
-        fileContentMap: Map<string, string>
+        fileContentMap: Map<string, string>,
+        debtByFile: Map<string, TechnicalDebt[]> = groupDebtItemsByFile(debtItems)
     ): Promise<SatdRelationship[]> {
         if (!this.workspaceRoot) {
             return [];
@@ -67,9 +70,6 @@ export class CallGraphAnalyzer {
         
         const relationships: SatdRelationship[] = [];
         
-        // Map debt items by file for easier access
-        const debtByFile = this.groupDebtItemsByFile(debtItems);
-        
         // Build call graph for all files
         const callGraph = await this.buildCallGraph(debtByFile, fileContentMap);
         
@@ -190,24 +190,6 @@ export class CallGraphAnalyzer {
         return Math.max(weights.min, baseWeight - (range * normalizedHops));
     }
     
-    /**
-     * Group technical debt items by file
-     * @param debtItems List of technical debt items
-     * @returns Map of file paths to debt items in them
-     */
-    private groupDebtItemsByFile(debtItems: TechnicalDebt[]): Map<string, TechnicalDebt[]> {
-        const debtByFile = new Map<string, TechnicalDebt[]>();
-        
-        for (const item of debtItems) {
-            if (!debtByFile.has(item.file)) {
-                debtByFile.set(item.file, []);
-            }
-            debtByFile.get(item.file)!.push(item);
-        }
-        
-        return debtByFile;
-    }
-    
     /**
      * Check if a file is a JavaScript, TypeScript, or Python file
      * @param filePath Path to the file
@@ -627,21 +609,21 @@ export class CallGraphAnalyzer {
                                 if (methodsWithDebt.has(calledFunc)) {
                                     const calleeDebt = methodsWithDebt.get(calledFunc)!;
                                     
+                                    // Hop count depends only on the two functions
+                                    const { exists, hops } = this.checkDependencyWithinHops(
+                                        `${filePath}:${funcName}`,
+                                        `${filePath}:${calledFunc}`,
+                                        callGraph
+                                    );
+                                    
+                                    if (!exists || hops > this.maxHops) continue;
+                                    
+                                    const weight = this.calculateEdgeWeight(hops);
+                                    
                                     for (const sourceDebt of callerDebt) {
                                         for (const targetDebt of calleeDebt) {
                                             if (sourceDebt.id === targetDebt.id) continue;
                                             
-                                            // Check hop count
-                                            const { exists, hops } = this.checkDependencyWithinHops(
-                                                `${filePath}:${funcName}`,
-                                                `${filePath}:${calledFunc}`,
-                                                callGraph
-                                            );
-                                            
-                                            if (!exists || hops > this.maxHops) continue;
-                                            
-                                            const weight = this.calculateEdgeWeight(hops);
-                                            
                                             const edge: WeightedEdge = {
                                                 sourceId: sourceDebt.id,
                                                 targetId: targetDebt.id,
@@ -667,6 +649,10 @@ export class CallGraphAnalyzer {
                     }
                 }
             } else if (ast && ['.js', '.jsx', '.ts', '.tsx'].includes(ext)) {
+                // Caller/callee method pairs already linked; repeated call
+                // sites of the same method add no new relationship
+                const linkedCalls = new Set<string>();
+                
                 traverse(ast, {
                     FunctionDeclaration: {
                         enter(path) {
@@ -727,7 +713,9 @@ export class CallGraphAnalyzer {
                                 }
                             }
                             
-                            if (methodsWithDebt.has(calledMethod)) {
+                            const callKey = `${currentMethod}\0${calledMethod}`;
+                            if (methodsWithDebt.has(calledMethod) && !linkedCalls.has(callKey)) {
+                                linkedCalls.add(callKey);
                                 const calleeDebt = methodsWithDebt.get(calledMethod)!;
                                 
                                 for (const sourceDebt of callerDebt) {
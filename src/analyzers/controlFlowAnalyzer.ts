@@ -16,6 +16,7 @@ import {
     DEFAULT_RELATIONSHIP_WEIGHTS,
     MAX_DEPENDENCY_HOPS
 } from '../models';
+import { groupDebtItemsByFile } from '../utils/debtGrouping';
 import * as path from 'path';
 import * as parser from '@babel/parser';
 import traverse from '@babel/traverse';
@@ -54,11 +55,13 @@ export class ControlFlowAnalyzer {
      * Find relationships between technical debt items based on control flow
      * @param debtItems List of technical debt items to analyze
      * @param fileContentMap Map of file paths to their content
+     * @param debtByFile Debt items grouped by file, if the caller already has them
      * @returns List of control flow relationships with weighted edges
      */
     public async findRelationships(
         debtItems: TechnicalDebt[], 
-        fileContentMap: Map<string, string>
+        fileContentMap: Map<string, string>,
+        debtByFile: Map<string, TechnicalDebt[]> = groupDebtItemsByFile(debtItems)
     ): Promise<SatdRelationship[]> {
         if (!this.workspaceRoot) {
             return [];
@@ -66,9 +69,6 @@ export class ControlFlowAnalyzer {
         
         const relationships: SatdRelationship[] = [];
         
-        // Map debt items by file for easier access
-        const debtByFile = this.groupDebtItemsByFile(debtItems);
-        
         // For each file with debt, analyze its control flow
         for (const [filePath, debtsInFile] of debtByFile.entries()) {
             const fileContent = fileContentMap.get(filePath);
@@ -104,19 +104,25 @@ export class ControlFlowAnalyzer {
     }
     
     /**
-     * Group technical debt items by file
+     * Map each line number (1..lineCount) to the first debt item, in list
+     * order, whose line lies within `radius` lines of it
      */
-    private groupDebtItemsByFile(debtItems: TechnicalDebt[]): Map<string, TechnicalDebt[]> {
-        const debtByFile = new Map<string, TechnicalDebt[]>();
+    private indexDebtByLine(
+        debtsInFile: TechnicalDebt[],
+        lineCount: number,
+        radius: number
+    ): Array<TechnicalDebt | undefined> {
+        const debtByLine = new Array<TechnicalDebt | undefined>(lineCount + 1);
         
-        for (const item of debtItems) {
-            if (!debtByFile.has(item.file)) {
-                debtByFile.set(item.file, []);
+        // Fill in reverse so earlier debt items overwrite later ones
+        for (let d = debtsInFile.length - 1; d >= 0; d--) {
+            const debt = debtsInFile[d];
+            const end = Math.min(lineCount, debt.line + radius);
+            for (let line = Math.max(1, Math.ceil(debt.line - radius)); line <= end; line++) {
+                debtByLine[line] = debt;
             }
-            debtByFile.get(item.file)!.push(item);
         }
-        
-        return debtByFile;
+        return debtByLine;
     }
     
     /**
@@ -163,6 +169,11 @@ export class ControlFlowAnalyzer {
         let currentIndent = 0;
         let controlStack: Array<{ indent: number; startLine: number; type: string }> = [];
         
+        // Debt whose ±3 line window covers each line (first listed wins), and
+        // the control structure (if any) opened at each line
+        const debtByLine = this.indexDebtByLine(debtsInFile, lines.length, 3);
+        const structureByStartLine = new Map<number, typeof controlStructures[number]>();
+        
         for (let i = 0; i < lines.length; i++) {
             const line = lines[i];
             const lineNumber = i + 1;
@@ -174,30 +185,28 @@ export class ControlFlowAnalyzer {
             // Check for control structure keywords
             const controlMatch = line.match(/^\s*(if|elif|else|for|while|try|except|finally|with)\s*[:(]/);
             if (controlMatch) {
-                const debtAtLine = debtsInFile.find(debt => {
-                    const start = Math.max(1, debt.line - 3);
-                    const end = debt.line + 3;
-                    return lineNumber >= start && lineNumber <= end;
-                });
+                const debtAtLine = debtByLine[lineNumber];
                 
                 controlStack.push({ indent, startLine: lineNumber, type: controlMatch[1] });
                 
                 if (debtAtLine) {
-                    controlStructures.push({
+                    const structure = {
                         type: controlMatch[1],
                         startLine: lineNumber,
                         endLine: lineNumber, // Will be updated
                         debt: debtAtLine,
-                        affectedLines: new Set(),
+                        affectedLines: new Set<number>(),
                         nestingDepth: controlStack.length
-                    });
+                    };
+                    controlStructures.push(structure);
+                    structureByStartLine.set(lineNumber, structure);
                 }
             }
             
             // Update control structure end lines based on indentation
             while (controlStack.length > 0 && indent <= controlStack[controlStack.length - 1].indent) {
                 const popped = controlStack.pop()!;
-                const structure = controlStructures.find(s => s.startLine === popped.startLine);
+                const structure = structureByStartLine.get(popped.startLine);
                 if (structure) {
                     structure.endLine = lineNumber - 1;
                 }
@@ -213,7 +222,7 @@ export class ControlFlowAnalyzer {
         
         // Close any remaining control structures
         for (const ctrl of controlStack) {
-            const structure = controlStructures.find(s => s.startLine === ctrl.startLine);
+            const structure = structureByStartLine.get(ctrl.startLine);
             if (structure) {
                 structure.endLine = lines.length;
             }
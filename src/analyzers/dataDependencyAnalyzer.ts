@@ -16,12 +16,19 @@ import {
     DEFAULT_RELATIONSHIP_WEIGHTS,
     MAX_DEPENDENCY_HOPS
 } from '../models';
+import { groupDebtItemsByFile } from '../utils/debtGrouping';
 import * as path from 'path';
 import * as parser from '@babel/parser';
 import traverse from '@babel/traverse';
 import { NodePath } from '@babel/traverse';
 import * as t from '@babel/types';
 
+/** Python keywords never treated as variable uses */
+const PYTHON_KEYWORDS = new Set([
+    'def', 'class', 'if', 'else', 'elif', 'for', 'while', 'return', 'import', 'from', 'as',
+    'try', 'except', 'finally', 'with', 'True', 'False', 'None'
+]);
+
 /**
  * Analyzes data dependencies between technical debt items.
  * If data produced or modified by code associated with SATD A 
@@ -56,11 +63,13 @@ export class DataDependencyAnalyzer {
      * Find relationships between technical debt items based on data dependencies
      * @param debtItems List of technical debt items to analyze
      * @param fileContentMap Map of file paths to their content
+     * @param debtByFile Debt items grouped by file, if the caller already has them
      * @returns List of data dependency relationships with weighted edges
      */
     public async findRelationships(
         debtItems: TechnicalDebt[], 
-        fileContentMap: Map<string, string>
+        fileContentMap: Map<string, string>,
+        debtByFile: Map<string, TechnicalDebt[]> = groupDebtItemsByFile(debtItems)
     ): Promise<SatdRelationship[]> {
         if (!this.workspaceRoot) {
             return [];
@@ -68,9 +77,6 @@ export class DataDependencyAnalyzer {
         
         const relationships: SatdRelationship[] = [];
         
-        // Map debt items by file for easier access
-        const debtByFile = this.groupDebtItemsByFile(debtItems);
-        
         // For each file with debt, analyze its data dependencies
         for (const [filePath, debtsInFile] of debtByFile.entries()) {
             const fileContent = fileContentMap.get(filePath);
@@ -103,22 +109,6 @@ export class DataDependencyAnalyzer {
         return relationships;
     }
     
-    /**
-     * Group technical debt items by file
-     */
-    private groupDebtItemsByFile(debtItems: TechnicalDebt[]): Map<string, TechnicalDebt[]> {
-        const debtByFile = new Map<string, TechnicalDebt[]>();
-        
-        for (const item of debtItems) {
-            if (!debtByFile.has(item.file)) {
-                debtByFile.set(item.file, []);
-            }
-            debtByFile.get(item.file)!.push(item);
-        }
-        
-        return debtByFile;
-    }
-    
     /**
      * Check if a file is a JavaScript or TypeScript file
      */
@@ -163,60 +153,61 @@ export class DataDependencyAnalyzer {
         const variableDefs = new Map<string, Array<{ line: number; debt?: TechnicalDebt }>>();
         const variableUses = new Map<string, Array<{ line: number; debt?: TechnicalDebt }>>();
         
+        // Debt whose ±5 line window covers each line (first listed wins)
+        const debtByLine = this.indexDebtByLine(debtsInFile, lines.length, 5);
+        
         for (let i = 0; i < lines.length; i++) {
             const line = lines[i];
             const lineNumber = i + 1;
             
-            // Find debt at this location
-            const debtAtLine = debtsInFile.find(debt => {
-                const start = Math.max(1, debt.line - 5);
-                const end = debt.line + 5;
-                return lineNumber >= start && lineNumber <= end;
-            });
+            // Only lines near a debt item record definitions or uses
+            const debtAtLine = debtByLine[lineNumber];
+            if (!debtAtLine) continue;
             
             // Check for variable assignments (definitions)
             const assignmentMatch = line.match(/^\s*([a-zA-Z_][a-zA-Z0-9_]*)\s*=/);
-            if (assignmentMatch && debtAtLine) {
-                const varName = assignmentMatch[1];
-                if (!variableDefs.has(varName)) {
-                    variableDefs.set(varName, []);
+            const assignedName = assignmentMatch ? assignmentMatch[1] : undefined;
+            if (assignedName) {
+                if (!variableDefs.has(assignedName)) {
+                    variableDefs.set(assignedName, []);
                 }
-                variableDefs.get(varName)!.push({ line: lineNumber, debt: debtAtLine });
+                variableDefs.get(assignedName)!.push({ line: lineNumber, debt: debtAtLine });
             }
             
             // Check for variable uses (excluding assignment targets)
             const identifiers = line.match(/[a-zA-Z_][a-zA-Z0-9_]*/g) || [];
             for (const identifier of identifiers) {
                 // Skip if this is the assignment target
-                if (line.match(new RegExp(`^\\s*${identifier}\\s*=`))) continue;
+                if (identifier === assignedName) continue;
                 // Skip common keywords
-                if (['def', 'class', 'if', 'else', 'elif', 'for', 'while', 'return', 'import', 'from', 'as', 'try', 'except', 'finally', 'with', 'True', 'False', 'None'].includes(identifier)) continue;
+                if (PYTHON_KEYWORDS.has(identifier)) continue;
                 
-                if (debtAtLine) {
-                    if (!variableUses.has(identifier)) {
-                        variableUses.set(identifier, []);
-                    }
-                    variableUses.get(identifier)!.push({ line: lineNumber, debt: debtAtLine });
+                if (!variableUses.has(identifier)) {
+                    variableUses.set(identifier, []);
                 }
+                variableUses.get(identifier)!.push({ line: lineNumber, debt: debtAtLine });
             }
         }
         
-        // Create relationships between definitions and uses
+        // Create relationships between definitions and uses. Uses are in line
+        // order, so each definition only scans the uses after it, up to the
+        // first one beyond maxHops.
         for (const [varName, defs] of variableDefs.entries()) {
             const uses = variableUses.get(varName) || [];
             
             for (const def of defs) {
-                for (const use of uses) {
-                    // Skip if same debt or use before definition
-                    if (!def.debt || !use.debt) continue;
-                    if (def.debt.id === use.debt.id) continue;
-                    if (use.line <= def.line) continue;
+                for (let u = this.firstUseAfter(uses, def.line); u < uses.length; u++) {
+                    const use = uses[u];
                     
                     // Check hop count (line distance as proxy)
                     const distance = use.line - def.line;
                     const hops = Math.ceil(distance / 10); // Approximate hops
                     
-                    if (hops > this.maxHops) continue;
+                    if (hops > this.maxHops) break;
+                    
+                    // Skip if same debt
+                    if (!def.debt || !use.debt) continue;
+                    if (def.debt.id === use.debt.id) continue;
                     
                     const weight = this.calculateEdgeWeight(def.line, use.line);
                     
@@ -244,6 +235,45 @@ export class DataDependencyAnalyzer {
         return relationships;
     }
     
+    /**
+     * Map each line number (1..lineCount) to the first debt item, in list
+     * order, whose line lies within `radius` lines of it
+     */
+    private indexDebtByLine(
+        debtsInFile: TechnicalDebt[],
+        lineCount: number,
+        radius: number
+    ): Array<TechnicalDebt | undefined> {
+        const debtByLine = new Array<TechnicalDebt | undefined>(lineCount + 1);
+        
+        // Fill in reverse so earlier debt items overwrite later ones
+        for (let d = debtsInFile.length - 1; d >= 0; d--) {
+            const debt = debtsInFile[d];
+            const end = Math.min(lineCount, debt.line + radius);
+            for (let line = Math.max(1, Math.ceil(debt.line - radius)); line <= end; line++) {
+                debtByLine[line] = debt;
+            }
+        }
+        return debtByLine;
+    }
+    
+    /**
+     * Index of the first use (uses sorted by line) strictly after `line`
+     */
+    private firstUseAfter(uses: Array<{ line: number }>, line: number): number {
+        let low = 0;
+        let high = uses.length;
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (uses[mid].line <= line) {
+                low = mid + 1;
+            } else {
+                high = mid;
+            }
+        }
+        return low;
+    }
+    
     /**
      * Find data dependencies within a single file (JS/TS)
      */
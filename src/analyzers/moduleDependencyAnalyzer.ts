@@ -16,6 +16,7 @@ import {
     DEFAULT_RELATIONSHIP_WEIGHTS,
     MAX_DEPENDENCY_HOPS
 } from '../models';
+import { groupDebtItemsByFile } from '../utils/debtGrouping';
 import * as path from 'path';
 import * as parser from '@babel/parser';
 import traverse from '@babel/traverse';
@@ -57,11 +58,13 @@ export class ModuleDependencyAnalyzer {
      * Find relationships between technical debt items based on module dependencies
      * @param debtItems List of technical debt items to analyze
      * @param fileContentMap Map of file paths to their content
+     * @param debtByFile Debt items grouped by file, if the caller already has them
      * @returns List of module dependency relationships with weighted edges
      */
     public async findRelationships(
         debtItems: TechnicalDebt[], 
-        fileContentMap: Map<string, string>
+        fileContentMap: Map<string, string>,
+        debtByFile: Map<string, TechnicalDebt[]> = groupDebtItemsByFile(debtItems)
     ): Promise<SatdRelationship[]> {
         if (!this.workspaceRoot) {
             return [];
@@ -69,9 +72,6 @@ export class ModuleDependencyAnalyzer {
         
         const relationships: SatdRelationship[] = [];
         
-        // Map debt items by file for easier access
-        const debtByFile = this.groupDebtItemsByFile(debtItems);
-        
         // Build a module dependency map with hop counts
         const dependencyMap = await this.buildModuleDependencyMap(
             debtByFile.keys(), 
@@ -119,22 +119,6 @@ export class ModuleDependencyAnalyzer {
         return relationships;
     }
     
-    /**
-     * Group technical debt items by file
-     */
-    private groupDebtItemsByFile(debtItems: TechnicalDebt[]): Map<string, TechnicalDebt[]> {
-        const debtByFile = new Map<string, TechnicalDebt[]>();
-        
-        for (const item of debtItems) {
-            if (!debtByFile.has(item.file)) {
-                debtByFile.set(item.file, []);
-            }
-            debtByFile.get(item.file)!.push(item);
-        }
-        
-        return debtByFile;
-    }
-    
     /**
      * Calculate edge weight based on hop count and directness
      */
@@ -183,6 +167,10 @@ export class ModuleDependencyAnalyzer {
     
     /**
      * Compute reachable modules using BFS with hop counting
+     * 
+     * Files are expanded one hop level at a time, each at most once. BFS
+     * reaches a file first at its fewest hops, so every SATD-bearing target
+     * is recorded once, in discovery order.
      */
     private computeReachableModules(
         startFile: string,
@@ -190,41 +178,36 @@ export class ModuleDependencyAnalyzer {
         debtByFile: Map<string, TechnicalDebt[]>
     ): Array<{ targetFile: string; hops: number; isDirect: boolean }> {
         const reachable: Array<{ targetFile: string; hops: number; isDirect: boolean }> = [];
-        const visited = new Set<string>();
-        const queue: Array<{ file: string; hops: number }> = [{ file: startFile, hops: 0 }];
+        const recorded = new Set<string>();
+        const seen = new Set<string>([startFile]);
+        let frontier: string[] = [startFile];
         
-        while (queue.length > 0) {
-            const { file, hops } = queue.shift()!;
-            
-            if (hops >= this.maxHops) continue;
-            if (visited.has(file)) continue;
-            visited.add(file);
+        for (let hops = 0; hops < this.maxHops && frontier.length > 0; hops++) {
+            const nextFrontier: string[] = [];
             
-            const deps = directDependencies.get(file) || new Set();
-            
-            for (const dep of deps) {
-                // Only include if the dependency has SATD
-                if (debtByFile.has(dep) && dep !== startFile) {
-                    // Check if we already have this target with fewer hops
-                    const existing = reachable.find(r => r.targetFile === dep);
-                    if (!existing || existing.hops > hops + 1) {
-                        if (existing) {
-                            existing.hops = hops + 1;
-                            existing.isDirect = hops === 0;
-                        } else {
-                            reachable.push({
-                                targetFile: dep,
-                                hops: hops + 1,
-                                isDirect: hops === 0
-                            });
-                        }
-                    }
-                }
+            for (const file of frontier) {
+                const deps = directDependencies.get(file);
+                if (!deps) continue;
                 
-                if (!visited.has(dep)) {
-                    queue.push({ file: dep, hops: hops + 1 });
+                for (const dep of deps) {
+                    // Only include if the dependency has SATD
+                    if (debtByFile.has(dep) && dep !== startFile && !recorded.has(dep)) {
+                        recorded.add(dep);
+                        reachable.push({
+                            targetFile: dep,
+                            hops: hops + 1,
+                            isDirect: hops === 0
+                        });
+                    }
+                    
+                    if (!seen.has(dep)) {
+                        seen.add(dep);
+                        nextFrontier.push(dep);
+                    }
                 }
             }
+            
+            frontier = nextFrontier;
         }
         
         return reachable;
@@ -306,6 +289,19 @@ export class ModuleDependencyAnalyzer {
         const dependencies = new Set<string>();
         const lines = fileContent.split('\n');
         
+        // The importing file's directory, and each module name resolved so
+        // far, are shared by every import line in the file
+        const currentDir = path.dirname(filePath);
+        const resolvedModules = new Map<string, string | null>();
+        const resolve = (moduleName: string): string | null => {
+            let modulePath = resolvedModules.get(moduleName);
+            if (modulePath === undefined) {
+                modulePath = this.resolvePythonModule(currentDir, moduleName, debtByFile);
+                resolvedModules.set(moduleName, modulePath);
+            }
+            return modulePath;
+        };
+        
         for (const line of lines) {
             const trimmedLine = line.trim();
             
@@ -316,7 +312,7 @@ export class ModuleDependencyAnalyzer {
             // Handle "import module" syntax
             const importMatch = trimmedLine.match(/^import\s+([a-zA-Z0-9_.]+)/);
             if (importMatch) {
-                const modulePath = this.resolvePythonModule(filePath, importMatch[1], debtByFile);
+                const modulePath = resolve(importMatch[1]);
                 if (modulePath) {
                     dependencies.add(modulePath);
                 }
@@ -326,7 +322,7 @@ export class ModuleDependencyAnalyzer {
             // Handle "from module import ..." syntax
             const fromImportMatch = trimmedLine.match(/^from\s+([a-zA-Z0-9_.]+)\s+import/);
             if (fromImportMatch) {
-                const modulePath = this.resolvePythonModule(filePath, fromImportMatch[1], debtByFile);
+                const modulePath = resolve(fromImportMatch[1]);
                 if (modulePath) {
                     dependencies.add(modulePath);
                 }
@@ -338,17 +334,19 @@ export class ModuleDependencyAnalyzer {
     
     /**
      * Resolve Python module to file path
+     * @param currentDir Directory of the importing file
      */
     private resolvePythonModule(
-        currentFile: string,
+        currentDir: string,
         moduleName: string,
         debtByFile: Map<string, TechnicalDebt[]>
     ): string | null {
+        const modulePath = moduleName.replace(/\./g, '/');
         const possiblePaths = [
-            moduleName.replace(/\./g, '/') + '.py',
-            moduleName.replace(/\./g, '/') + '/__init__.py',
-            path.join(path.dirname(currentFile), moduleName.replace(/\./g, '/') + '.py'),
-            path.join(path.dirname(currentFile), moduleName.replace(/\./g, '/'), '__init__.py')
+            modulePath + '.py',
+            modulePath + '/__init__.py',
+            path.join(currentDir, modulePath + '.py'),
+            path.join(currentDir, modulePath, '__init__.py')
         ];
         
         for (const possiblePath of possiblePaths) {
@@ -105,6 +105,7 @@ program
                 // Full scan with LLM
                 const apiKey = process.env.OPENAI_API_KEY;
                 const modelName = process.env.OPENAI_MODEL_NAME || 'gpt-4o';
+                const screeningModelName = process.env.OPENAI_SCREENING_MODEL_NAME || '';
                 
                 if (!apiKey) {
                     console.error('Error: OPENAI_API_KEY environment variable not set');
@@ -114,7 +115,7 @@ program
                 }
                 
                 console.log(`Initializing OpenAI client with model: ${modelName}...`);
-                const initialized = initializeOpenAICLI(apiKey, modelName);
+                const initialized = initializeOpenAICLI(apiKey, modelName, screeningModelName);
                 
                 if (!initialized) {
                     console.error('Failed to initialize OpenAI client');
@@ -368,6 +369,7 @@ program
             } else {
                 const apiKey = process.env.OPENAI_API_KEY;
                 const modelName = process.env.OPENAI_MODEL_NAME || 'gpt-4o';
+                const screeningModelName = process.env.OPENAI_SCREENING_MODEL_NAME || '';
                 
                 if (!apiKey) {
                     console.error('Error: OPENAI_API_KEY environment variable not set');
@@ -377,7 +379,7 @@ program
                 }
                 
                 console.log(`Initializing OpenAI client with model: ${modelName}...`);
-                const initialized = initializeOpenAICLI(apiKey, modelName);
+                const initialized = initializeOpenAICLI(apiKey, modelName, screeningModelName);
                 
                 if (!initialized) {
                     console.error('Failed to initialize OpenAI client');
@@ -149,13 +149,11 @@ export function activate(context: vscode.ExtensionContext) {
                 
                 chainAnalyzer!.setSirWeights(sirWeights.alpha, sirWeights.beta, sirWeights.gamma);
                 
-                // Find chains and calculate SIR
-                const chainResult = chainAnalyzer!.findChains(technicalDebtItems, relationships);
+                // Find chains and calculate SIR over one shared graph
+                const chainResult = chainAnalyzer!.analyzeChainsAndSIR(technicalDebtItems, relationships);
                 relationships = chainResult.relationships;
                 chains = chainResult.chains;
-                
-                // Calculate SIR scores
-                technicalDebtItems = chainAnalyzer!.calculateSIRScores(technicalDebtItems, relationships);
+                technicalDebtItems = chainResult.debtItems;
                 
                 // Rank by SIR
                 technicalDebtItems = chainAnalyzer!.rankBySIR(technicalDebtItems);
@@ -19,6 +19,17 @@ import {
     DEFAULT_SIR_WEIGHTS,
     SATDGraph
 } from './models';
+import { IndexedGraph, findWeaklyConnectedChains } from './utils/indexedGraph';
+
+/**
+ * SIR components in columnar form: one row per distinct debt item, in the
+ * order of first appearance (which is also its IndexedGraph node index)
+ */
+interface SIRColumns {
+    fanout: Float64Array;
+    chainLen: Float64Array;
+    reachability: Float64Array;
+}
 
 /**
  * SatdChainAnalyzer discovers chains of technical debt relationships
@@ -32,12 +43,6 @@ import {
 export class SatdChainAnalyzer {
     // SIR weight configuration
     private weights: SIRWeights = { ...DEFAULT_SIR_WEIGHTS };
-    
-    // Memoization cache for ChainLen computation
-    private chainLenCache: Map<string, number> = new Map();
-    
-    // Memoization cache for Reachability computation
-    private reachabilityCache: Map<string, number> = new Map();
 
     /**
      * Set weights for SIR score calculation
@@ -75,78 +80,10 @@ export class SatdChainAnalyzer {
         relationships: SatdRelationship[], 
         chains: Chain[] 
     } {
-        // Collect all weighted edges
-        const edges: WeightedEdge[] = [];
-        for (const rel of relationships) {
-            edges.push(...rel.edges);
-        }
-        
-        // Build undirected adjacency list for weakly connected component analysis
-        const undirectedAdj = new Map<string, Set<string>>();
-        
-        for (const debt of debtItems) {
-            undirectedAdj.set(debt.id, new Set());
-        }
-        
-        for (const edge of edges) {
-            if (!undirectedAdj.has(edge.sourceId)) {
-                undirectedAdj.set(edge.sourceId, new Set());
-            }
-            if (!undirectedAdj.has(edge.targetId)) {
-                undirectedAdj.set(edge.targetId, new Set());
-            }
-            
-            // Add edges in both directions for undirected graph
-            undirectedAdj.get(edge.sourceId)!.add(edge.targetId);
-            undirectedAdj.get(edge.targetId)!.add(edge.sourceId);
-        }
+        const edges = this.collectEdges(relationships);
         
         // Find weakly connected components using BFS
-        const chains: Chain[] = [];
-        const visited = new Set<string>();
-        let chainId = 0;
-        
-        for (const debt of debtItems) {
-            if (visited.has(debt.id)) continue;
-            
-            // BFS to find all nodes in this component
-            const component: string[] = [];
-            const queue: string[] = [debt.id];
-            
-            while (queue.length > 0) {
-                const nodeId = queue.shift()!;
-                if (visited.has(nodeId)) continue;
-                
-                visited.add(nodeId);
-                component.push(nodeId);
-                
-                const neighbors = undirectedAdj.get(nodeId) || new Set();
-                for (const neighbor of neighbors) {
-                    if (!visited.has(neighbor)) {
-                        queue.push(neighbor);
-                    }
-                }
-            }
-            
-            // Only create a chain if there's more than one node connected
-            if (component.length > 1) {
-                // Calculate total weight of edges in this chain
-                let totalWeight = 0;
-                const componentSet = new Set(component);
-                for (const edge of edges) {
-                    if (componentSet.has(edge.sourceId) && componentSet.has(edge.targetId)) {
-                        totalWeight += edge.weight;
-                    }
-                }
-                
-                chains.push({
-                    id: `chain-${++chainId}`,
-                    nodes: component,
-                    length: component.length,
-                    totalWeight
-                });
-            }
-        }
+        const chains = findWeaklyConnectedChains(debtItems, edges);
         
         // Enhance relationships with chain information
         const enhancedRelationships = this.enhanceRelationshipsWithChainInfo(relationships, chains);
@@ -157,6 +94,46 @@ export class SatdChainAnalyzer {
         };
     }
     
+    /**
+     * Find chains and calculate SIR scores over one shared graph
+     * 
+     * Same result as findChains followed by calculateSIRScores on the
+     * enhanced relationships, but the edge list and IndexedGraph are built
+     * once for both stages.
+     * @param debtItems Technical debt items
+     * @param relationships Direct relationships between debt items
+     * @returns Enhanced relationships, chains, and debt items with SIR scores
+     */
+    public analyzeChainsAndSIR(
+        debtItems: TechnicalDebt[],
+        relationships: SatdRelationship[]
+    ): {
+        relationships: SatdRelationship[],
+        chains: Chain[],
+        debtItems: TechnicalDebt[]
+    } {
+        const edges = this.collectEdges(relationships);
+        const graph = IndexedGraph.fromEdges(debtItems.map(debt => debt.id), edges);
+        const chains = findWeaklyConnectedChains(debtItems, edges, graph);
+        
+        return {
+            relationships: this.enhanceRelationshipsWithChainInfo(relationships, chains),
+            chains,
+            debtItems: this.scoreGraph(debtItems, graph)
+        };
+    }
+    
+    /**
+     * All weighted edges of the relationships, in relationship order
+     */
+    private collectEdges(relationships: SatdRelationship[]): WeightedEdge[] {
+        const edges: WeightedEdge[] = [];
+        for (const rel of relationships) {
+            edges.push(...rel.edges);
+        }
+        return edges;
+    }
+    
     /**
      * Enhance relationships with chain information
      */
@@ -164,30 +141,28 @@ export class SatdChainAnalyzer {
         relationships: SatdRelationship[],
         chains: Chain[]
     ): SatdRelationship[] {
-        const edgeToChains = new Map<string, string[]>();
+        // Chains each node belongs to, so a relationship is matched by its
+        // endpoints instead of indexing every node pair of every chain
+        const nodeToChains = new Map<string, string[]>();
         
         for (const chain of chains) {
-            for (let i = 0; i < chain.nodes.length; i++) {
-                for (let j = i + 1; j < chain.nodes.length; j++) {
-                    const edge1 = `${chain.nodes[i]}-${chain.nodes[j]}`;
-                    const edge2 = `${chain.nodes[j]}-${chain.nodes[i]}`;
-                    
-                    if (!edgeToChains.has(edge1)) {
-                        edgeToChains.set(edge1, []);
-                    }
-                    if (!edgeToChains.has(edge2)) {
-                        edgeToChains.set(edge2, []);
-                    }
-                    
-                    edgeToChains.get(edge1)!.push(chain.id);
-                    edgeToChains.get(edge2)!.push(chain.id);
+            for (const nodeId of chain.nodes) {
+                const nodeChains = nodeToChains.get(nodeId);
+                if (nodeChains) {
+                    nodeChains.push(chain.id);
+                } else {
+                    nodeToChains.set(nodeId, [chain.id]);
                 }
             }
         }
         
         return relationships.map(rel => {
-            const edge = `${rel.sourceId}-${rel.targetId}`;
-            const chainIds = edgeToChains.get(edge) || [];
+            // A chain holds a relationship when it contains both (distinct) endpoints
+            const sourceChains = rel.sourceId !== rel.targetId ? nodeToChains.get(rel.sourceId) : undefined;
+            const targetChains = nodeToChains.get(rel.targetId);
+            const chainIds = sourceChains && targetChains
+                ? sourceChains.filter(chainId => targetChains.includes(chainId))
+                : [];
             
             return {
                 ...rel,
@@ -210,192 +185,192 @@ export class SatdChainAnalyzer {
         debtItems: TechnicalDebt[],
         relationships: SatdRelationship[]
     ): TechnicalDebt[] {
-        // Clear memoization caches
-        this.chainLenCache.clear();
-        this.reachabilityCache.clear();
-        
-        // Build directed adjacency list with weighted edges
-        const adjacencyList = new Map<string, WeightedEdge[]>();
-        
-        for (const debt of debtItems) {
-            adjacencyList.set(debt.id, []);
-        }
-        
-        for (const rel of relationships) {
-            for (const edge of rel.edges) {
-                if (!adjacencyList.has(edge.sourceId)) {
-                    adjacencyList.set(edge.sourceId, []);
-                }
-                adjacencyList.get(edge.sourceId)!.push(edge);
-            }
-        }
+        // Build directed graph with weighted edges
+        const edges = this.collectEdges(relationships);
+        const graph = IndexedGraph.fromEdges(debtItems.map(debt => debt.id), edges);
+        return this.scoreGraph(debtItems, graph);
+    }
+    
+    /**
+     * Calculate SIR scores over a graph built from the debt items (listed
+     * first) and their relationship edges
+     */
+    private scoreGraph(debtItems: TechnicalDebt[], graph: IndexedGraph): TechnicalDebt[] {
+        // Debt items are indexed first, so rows 0..rowCount-1 are the debt nodes
+        const rowCount = new Set(debtItems.map(debt => debt.id)).size;
         
         // Calculate raw SIR components for each debt item
-        const rawComponents: Map<string, { fanout: number; chainLen: number; reachability: number }> = new Map();
+        const rawComponents: SIRColumns = {
+            fanout: new Float64Array(rowCount),
+            // ChainLen_w: Max weighted path length, for all nodes in one pass
+            chainLen: this.calculateChainLensW(graph).slice(0, rowCount),
+            reachability: new Float64Array(rowCount)
+        };
+        const pathStrengths = new Float64Array(graph.size);
         
-        for (const debt of debtItems) {
+        for (let row = 0; row < rowCount; row++) {
             // Fanout_w: Sum of weighted out-degrees
-            const fanout = this.calculateFanoutW(debt.id, adjacencyList);
-            
-            // ChainLen_w: Max weighted path length via DFS with memoization
-            const chainLen = this.calculateChainLenW(debt.id, adjacencyList, new Set());
+            rawComponents.fanout[row] = graph.weightedOutDegree(row);
             
             // Reachability_w: Sum of max path strengths to reachable SATD nodes
-            const reachability = this.calculateReachabilityW(debt.id, adjacencyList);
-            
-            rawComponents.set(debt.id, { fanout, chainLen, reachability });
+            rawComponents.reachability[row] = this.calculateReachabilityW(row, graph, pathStrengths);
         }
         
         // Min-max normalize each component to [0, 1]
         const normalizedComponents = this.normalizeComponents(rawComponents);
         
-        // Calculate final SIR scores
-        const debtWithScores = debtItems.map(debt => {
-            const components = normalizedComponents.get(debt.id)!;
-            const rawComps = rawComponents.get(debt.id)!;
-            
-            // SIR(t_i) = α·Fanout_w + β·ChainLen_w + γ·Reachability_w
-            const sirScore = 
-                this.weights.alpha * components.fanout +
-                this.weights.beta * components.chainLen +
-                this.weights.gamma * components.reachability;
-            
+        // SIR(t_i) = α·Fanout_w + β·ChainLen_w + γ·Reachability_w, one pass over the columns
+        const { alpha, beta, gamma } = this.weights;
+        const { fanout, chainLen, reachability } = normalizedComponents;
+        const rawSirScores = new Float64Array(rowCount);
+        for (let row = 0; row < rowCount; row++) {
+            rawSirScores[row] = alpha * fanout[row] + beta * chainLen[row] + gamma * reachability[row];
+        }
+        
+        // Normalize final SIR scores to [0, 1]
+        const sirScores = this.normalizeColumn(rawSirScores);
+        
+        return debtItems.map(debt => {
+            const row = graph.indexOf(debt.id);
             const sirComponents: SIRComponents = {
-                fanout_w: components.fanout,
-                chainLen_w: components.chainLen,
-                reachability_w: components.reachability,
-                rawFanout: rawComps.fanout,
-                rawChainLen: rawComps.chainLen,
-                rawReachability: rawComps.reachability
+                fanout_w: fanout[row],
+                chainLen_w: chainLen[row],
+                reachability_w: reachability[row],
+                rawFanout: rawComponents.fanout[row],
+                rawChainLen: rawComponents.chainLen[row],
+                rawReachability: rawComponents.reachability[row]
             };
             
             return {
                 ...debt,
-                sirScore,
+                sirScore: sirScores[row],
                 sirComponents
             };
         });
-        
-        // Normalize final SIR scores to [0, 1]
-        const maxSir = Math.max(...debtWithScores.map(d => d.sirScore || 0));
-        const minSir = Math.min(...debtWithScores.map(d => d.sirScore || 0));
-        const range = maxSir - minSir || 1;
-        
-        return debtWithScores.map(debt => ({
-            ...debt,
-            sirScore: (debt.sirScore! - minSir) / range
-        }));
     }
     
     /**
-     * Calculate Fanout_w(t_i): Sum of weighted out-degrees
-     * Captures how many and how strongly this node influences other SATD-bearing entities
+     * Calculate ChainLen_w(t_i) for every node: Maximum weighted path length
+     * 
+     * The graph is condensed into strongly connected components, which Tarjan's
+     * algorithm emits in reverse topological order, so every edge leaving a
+     * component points at nodes whose ChainLen_w is already known. Paths are
+     * only searched explicitly inside non-trivial (cyclic) components; on an
+     * acyclic graph the whole pass is O(V + E).
+     * 
+     * A path may end with one edge back onto a node it already visited: that
+     * edge's weight counts, but the path stops there.
+     * 
+     * @returns ChainLen_w indexed by graph node
      */
-    private calculateFanoutW(nodeId: string, adjacencyList: Map<string, WeightedEdge[]>): number {
-        const edges = adjacencyList.get(nodeId) || [];
-        return edges.reduce((sum, edge) => sum + edge.weight, 0);
+    private calculateChainLensW(graph: IndexedGraph): Float64Array {
+        const chainLens = new Float64Array(graph.size);
+        const onPath = new Uint8Array(graph.size);
+        const { componentOf, components } = graph.stronglyConnectedComponents();
+        
+        for (const component of components) {
+            for (const node of component) {
+                chainLens[node] = this.longestPathInComponent(node, graph, componentOf, chainLens, onPath);
+            }
+        }
+        
+        return chainLens;
     }
     
     /**
-     * Calculate ChainLen_w(t_i): Maximum weighted path length via DFS with memoization
-     * Uses visited set to avoid infinite recursion in cycles
+     * Longest weighted path from a node, searching simple paths within its
+     * own component and using the known ChainLen_w of any node outside it
      */
-    private calculateChainLenW(
-        nodeId: string, 
-        adjacencyList: Map<string, WeightedEdge[]>,
-        visited: Set<string>
+    private longestPathInComponent(
+        startNode: number,
+        graph: IndexedGraph,
+        componentOf: Int32Array,
+        chainLens: Float64Array,
+        onPath: Uint8Array
     ): number {
-        // Check memoization cache
-        const cacheKey = `${nodeId}-${Array.from(visited).sort().join(',')}`;
-        if (this.chainLenCache.has(cacheKey)) {
-            return this.chainLenCache.get(cacheKey)!;
-        }
+        const { offsets, targets, weights } = graph;
+        const component = componentOf[startNode];
         
-        // Avoid cycles
-        if (visited.has(nodeId)) {
-            return 0;
-        }
-        
-        visited.add(nodeId);
-        
-        const edges = adjacencyList.get(nodeId) || [];
-        
-        if (edges.length === 0) {
-            visited.delete(nodeId);
-            this.chainLenCache.set(cacheKey, 0);
-            return 0;
-        }
-        
-        let maxPathLength = 0;
-        
-        for (const edge of edges) {
-            // Recursively compute path length to child
-            const childPathLength = this.calculateChainLenW(edge.targetId, adjacencyList, visited);
-            const pathLength = edge.weight + childPathLength;
+        const search = (node: number): number => {
+            let maxPathLength = 0;
             
-            if (pathLength > maxPathLength) {
-                maxPathLength = pathLength;
+            for (let e = offsets[node]; e < offsets[node + 1]; e++) {
+                const target = targets[e];
+                let childPathLength = 0;
+                
+                if (componentOf[target] !== component) {
+                    // Downstream component, already finished
+                    childPathLength = chainLens[target];
+                } else if (!onPath[target]) {
+                    onPath[target] = 1;
+                    childPathLength = search(target);
+                    onPath[target] = 0;
+                }
+                
+                const pathLength = weights[e] + childPathLength;
+                if (pathLength > maxPathLength) {
+                    maxPathLength = pathLength;
+                }
             }
-        }
-        
-        visited.delete(nodeId);
-        this.chainLenCache.set(cacheKey, maxPathLength);
+            
+            return maxPathLength;
+        };
         
-        return maxPathLength;
+        onPath[startNode] = 1;
+        const longest = search(startNode);
+        onPath[startNode] = 0;
+        return longest;
     }
     
     /**
      * Calculate Reachability_w(t_i): Sum of max path strengths to all reachable SATD nodes
-     * Uses BFS/DFS with cycle detection
+     * Uses BFS with path strength tracking
+     * @param pathStrengths Scratch array of zeros, one per graph node; left zeroed
      */
     private calculateReachabilityW(
-        startNodeId: string, 
-        adjacencyList: Map<string, WeightedEdge[]>
+        startNode: number,
+        graph: IndexedGraph,
+        pathStrengths: Float64Array
     ): number {
-        // Check cache
-        if (this.reachabilityCache.has(startNodeId)) {
-            return this.reachabilityCache.get(startNodeId)!;
-        }
+        const { offsets, targets, weights } = graph;
         
-        // Track max path strength to each reachable node
-        const maxPathStrength = new Map<string, number>();
+        // Nodes in the order a path strength was first recorded for them
+        const reached: number[] = [];
         
         // BFS with path strength tracking
-        const queue: Array<{ nodeId: string; pathStrength: number }> = [
-            { nodeId: startNodeId, pathStrength: 0 }
-        ];
-        const visited = new Set<string>();
+        const queueNodes: number[] = [startNode];
+        const queueStrengths: number[] = [0];
         
-        while (queue.length > 0) {
-            const { nodeId, pathStrength } = queue.shift()!;
+        for (let head = 0; head < queueNodes.length; head++) {
+            const node = queueNodes[head];
+            const pathStrength = queueStrengths[head];
             
-            const edges = adjacencyList.get(nodeId) || [];
-            
-            for (const edge of edges) {
+            for (let e = offsets[node]; e < offsets[node + 1]; e++) {
+                const target = targets[e];
                 // Accumulate edge weights (sum) so path strength = total weighted cost
                 // of the path, consistent with how ChainLen_w is computed (paper Section 3.3).
-                const newPathStrength = pathStrength + edge.weight;
-                const existingStrength = maxPathStrength.get(edge.targetId) || 0;
+                const newPathStrength = pathStrength + weights[e];
+                const existingStrength = pathStrengths[target];
                 
                 if (newPathStrength > existingStrength) {
-                    maxPathStrength.set(edge.targetId, newPathStrength);
-                    
-                    // Only continue if we haven't processed this node with a stronger path
-                    if (!visited.has(edge.targetId) || existingStrength < newPathStrength) {
-                        visited.add(edge.targetId);
-                        queue.push({ nodeId: edge.targetId, pathStrength: newPathStrength });
+                    if (existingStrength === 0) {
+                        reached.push(target);
                     }
+                    pathStrengths[target] = newPathStrength;
+                    queueNodes.push(target);
+                    queueStrengths.push(newPathStrength);
                 }
             }
         }
         
-        // Remove self from reachability
-        maxPathStrength.delete(startNodeId);
-        
-        // Sum of max path strengths to all reachable nodes
-        const reachability = Array.from(maxPathStrength.values()).reduce((sum, strength) => sum + strength, 0);
-        
-        this.reachabilityCache.set(startNodeId, reachability);
+        // Sum of max path strengths to all reachable nodes, excluding self
+        let reachability = 0;
+        for (const node of reached) {
+            if (node !== startNode) {
+                reachability += pathStrengths[node];
+            }
+            pathStrengths[node] = 0;
+        }
         
         return reachability;
     }
@@ -403,39 +378,31 @@ export class SatdChainAnalyzer {
     /**
      * Min-max normalize SIR components to [0, 1]
      */
-    private normalizeComponents(
-        rawComponents: Map<string, { fanout: number; chainLen: number; reachability: number }>
-    ): Map<string, { fanout: number; chainLen: number; reachability: number }> {
-        const normalized = new Map<string, { fanout: number; chainLen: number; reachability: number }>();
-        
-        // Find min and max for each component
-        let minFanout = Infinity, maxFanout = -Infinity;
-        let minChainLen = Infinity, maxChainLen = -Infinity;
-        let minReachability = Infinity, maxReachability = -Infinity;
-        
-        for (const [, components] of rawComponents) {
-            minFanout = Math.min(minFanout, components.fanout);
-            maxFanout = Math.max(maxFanout, components.fanout);
-            minChainLen = Math.min(minChainLen, components.chainLen);
-            maxChainLen = Math.max(maxChainLen, components.chainLen);
-            minReachability = Math.min(minReachability, components.reachability);
-            maxReachability = Math.max(maxReachability, components.reachability);
+    private normalizeComponents(rawComponents: SIRColumns): SIRColumns {
+        return {
+            fanout: this.normalizeColumn(rawComponents.fanout),
+            chainLen: this.normalizeColumn(rawComponents.chainLen),
+            reachability: this.normalizeColumn(rawComponents.reachability)
+        };
+    }
+    
+    /**
+     * Min-max normalize one column of values to [0, 1]
+     */
+    private normalizeColumn(values: Float64Array): Float64Array {
+        let min = Infinity, max = -Infinity;
+        for (let i = 0; i < values.length; i++) {
+            if (values[i] < min) min = values[i];
+            if (values[i] > max) max = values[i];
         }
         
         // Avoid division by zero
-        const fanoutRange = maxFanout - minFanout || 1;
-        const chainLenRange = maxChainLen - minChainLen || 1;
-        const reachabilityRange = maxReachability - minReachability || 1;
+        const range = max - min || 1;
         
-        // Normalize each component
-        for (const [nodeId, components] of rawComponents) {
-            normalized.set(nodeId, {
-                fanout: (components.fanout - minFanout) / fanoutRange,
-                chainLen: (components.chainLen - minChainLen) / chainLenRange,
-                reachability: (components.reachability - minReachability) / reachabilityRange
-            });
+        const normalized = new Float64Array(values.length);
+        for (let i = 0; i < values.length; i++) {
+            normalized[i] = (values[i] - min) / range;
         }
-        
         return normalized;
     }
     
@@ -463,22 +430,53 @@ export class SatdChainAnalyzer {
     
     /**
      * Enhance chains with SIR information
+     *
+     * Debt items are indexed by ID once, so each chain only visits its own
+     * nodes instead of filtering the full debt list.
      */
     public enhanceChainsWithSIR(chains: Chain[], debtItems: TechnicalDebt[]): Chain[] {
+        const positionsById = new Map<string, number[]>();
+        debtItems.forEach((debt, position) => {
+            const positions = positionsById.get(debt.id);
+            if (positions) {
+                positions.push(position);
+            } else {
+                positionsById.set(debt.id, [position]);
+            }
+        });
+        
         return chains.map(chain => {
-            const chainNodeIds = new Set(chain.nodes);
-            const chainDebts = debtItems.filter(d => chainNodeIds.has(d.id));
+            const chainPositions: number[] = [];
+            for (const nodeId of new Set(chain.nodes)) {
+                const positions = positionsById.get(nodeId);
+                if (positions) {
+                    chainPositions.push(...positions);
+                }
+            }
             
-            const maxSirScore = chainDebts.length > 0 
-                ? Math.max(...chainDebts.map(d => d.sirScore || 0))
-                : 0;
+            let maxSirScore = chainPositions.length > 0 ? -Infinity : 0;
+            for (const position of chainPositions) {
+                const score = debtItems[position].sirScore || 0;
+                if (score > maxSirScore) {
+                    maxSirScore = score;
+                }
+            }
             
-            const representativeNode = chainDebts.find(d => d.sirScore === maxSirScore);
+            // First debt in list order with the top score
+            let representativePosition = -1;
+            for (const position of chainPositions) {
+                if (debtItems[position].sirScore === maxSirScore &&
+                    (representativePosition === -1 || position < representativePosition)) {
+                    representativePosition = position;
+                }
+            }
             
             return {
                 ...chain,
                 maxSirScore,
-                representativeNodeId: representativeNode?.id
+                representativeNodeId: representativePosition === -1
+                    ? undefined
+                    : debtItems[representativePosition].id
             };
         });
     }
@@ -35,6 +35,88 @@ interface LanguagePatterns {
     };
 }
 
+/** Escape a literal pattern for use inside a RegExp */
+function escapeRegExp(pattern: string): string {
+    return pattern.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+/**
+ * Debt type keywords, checked in order against the lowercased comment and
+ * context; the first type with a matching keyword wins
+ */
+const DEBT_TYPE_KEYWORDS: [DebtType, string[]][] = [
+    // Check for test debt FIRST (before defect) - look for test-specific keywords
+    [DebtType.TEST, [
+        'unit test', 'integration test', 'needs test', 'add test', 'write test',
+        'test coverage', 'test case', 'test suite', 'test function',
+        'lack of test', 'insufficient test', 'untested', 'more test',
+        'regression test', 'automated test', 'manual test', 'test this',
+        'mock', 'stub', 'testing framework'
+    ]],
+    // Check for implementation debt EARLY (before defect) - captures HACK, workarounds
+    [DebtType.IMPLEMENTATION, [
+        'hack', 'workaround', 'temporary', 'temporary solution',
+        'quick fix', 'optimize', 'optimization', 'slow',
+        'efficient', 'inefficient', 'magic number',
+        'duplicated', 'duplication', 'duplicate code', 'copy paste',
+        'ugly', 'messy', 'needs refactoring', 'needs work',
+        'could be better', 'quick and dirty', 'fix later', 'refactor later',
+        'not ideal', 'not optimal', 'suboptimal', 'revisit', 'rework',
+        'rewrite', 'simplify', 'complex', 'complicated',
+        'simplistic', 'naive', 'brute force'
+    ]],
+    // Check for architecture debt (before design - more specific)
+    [DebtType.ARCHITECTURE, [
+        'architecture', 'component coupling', 'cohesion', 'module dependency',
+        'layer', 'microservice', 'monolith', 'separation of concerns', 
+        'single responsibility', 'service layer', 'infrastructure',
+        'scaling', 'scalability', 'throughput', 'latency', 'response time', 
+        'bottleneck', 'distributed', 'reliability', 'availability', 'resilience'
+    ]],
+    // Check for design debt
+    [DebtType.DESIGN, [
+        'bad design', 'poor design', 'could be designed better', 'design debt', 'refactor',
+        'abstraction', 'flexibility', 'maintainability', 'extensibility', 'poorly designed',
+        'clean up', 'cleanup', 'clean this up', 'redesign', 'better design',
+        'code smell', 'technical debt', 'tech debt', 'antipattern', 'anti-pattern',
+        'decoupling', 'coupling', 'encapsulation', 'design pattern',
+        'inheritance', 'hardcoded', 'hard-coded', 'hard coded', 'hard-coding'
+    ]],
+    // Check for documentation debt
+    [DebtType.DOCUMENTATION, [
+        'documentation', 'docs', 'document', 'comment', 'needs explanation',
+        'explain', 'clarify', 'what this does', 'why this works', 'how this works',
+        'javadoc', 'jsdoc', 'docstring', 'readme', 'wiki', 'undocumented',
+        'missing documentation', 'update docs', 'document this', 'add comment',
+        'commenting', 'improve comment', 'better comment', 'better documentation',
+        'needs documentation', 'document usage', 'document parameters', 'document return'
+    ]],
+    // Check for defect debt
+    [DebtType.DEFECT, [
+        'bug', 'defect', 'issue', 'problem', 'error', 'incorrect',
+        'wrong', 'broken', 'doesn\'t work', 'not working', 'fails', 'failure',
+        'exception', 'crash', 'corrupted', 'corruption', 'overflow', 'underflow',
+        'memory leak', 'resource leak', 'null pointer', 'segfault', 'infinite loop',
+        'race condition', 'deadlock', 'concurrency issue', 'out of bounds', 
+        'boundary check', 'edge case', 'corner case', 'vulnerability', 
+        'security hole', 'security issue'
+    ]],
+    // Check for requirement debt
+    [DebtType.REQUIREMENT, [
+        'requirement', 'specification', 'spec', 'required', 'need to support',
+        'feature', 'enhancement', 'user story', 'use case', 'product owner',
+        'stakeholder', 'business rule', 'functional requirement', 'acceptance criteria',
+        'product backlog', 'missing feature', 'incomplete feature', 'unfinished feature',
+        'planned feature', 'roadmap', 'milestone', 'not implemented yet'
+    ]],
+];
+
+/** One substring alternation per debt type, compiled once */
+const DEBT_TYPE_MATCHERS: [DebtType, RegExp][] = DEBT_TYPE_KEYWORDS.map(
+    ([debtType, keywords]): [DebtType, RegExp] =>
+        [debtType, new RegExp(keywords.map(k => escapeRegExp(k.toLowerCase())).join('|'))]
+);
+
 /**
  * SatdDetector is responsible for detecting and classifying
  * Self-Admitted Technical Debt in code, focusing on Python, Java, and JavaScript
@@ -42,6 +124,7 @@ interface LanguagePatterns {
 export class SatdDetector {
     private workspaceRoot: string | null = null;
     private languagePatterns: Map<string, LanguagePatterns> = new Map();
+    private patternCache: Map<string, RegExp> = new Map();
     
     /**
      * Constructor initializes the language patterns
@@ -112,89 +195,10 @@ export class SatdDetector {
     public classifyDebtType(content: string, context: string = ''): DebtType {
         const fullContent = (content + ' ' + context).toLowerCase();
         
-        // Check for test debt FIRST (before defect) - look for test-specific keywords
-        if (this.containsAny(fullContent, [
-            'unit test', 'integration test', 'needs test', 'add test', 'write test',
-            'test coverage', 'test case', 'test suite', 'test function',
-            'lack of test', 'insufficient test', 'untested', 'more test',
-            'regression test', 'automated test', 'manual test', 'test this',
-            'mock', 'stub', 'testing framework'
-        ])) {
-            return DebtType.TEST;
-        }
-        
-        // Check for implementation debt EARLY (before defect) - captures HACK, workarounds
-        if (this.containsAny(fullContent, [
-            'hack', 'workaround', 'temporary', 'temporary solution',
-            'quick fix', 'optimize', 'optimization', 'slow',
-            'efficient', 'inefficient', 'magic number',
-            'duplicated', 'duplication', 'duplicate code', 'copy paste',
-            'ugly', 'messy', 'needs refactoring', 'needs work',
-            'could be better', 'quick and dirty', 'fix later', 'refactor later',
-            'not ideal', 'not optimal', 'suboptimal', 'revisit', 'rework',
-            'rewrite', 'simplify', 'complex', 'complicated',
-            'simplistic', 'naive', 'brute force'
-        ])) {
-            return DebtType.IMPLEMENTATION;
-        }
-        
-        // Check for architecture debt (before design - more specific)
-        if (this.containsAny(fullContent, [
-            'architecture', 'component coupling', 'cohesion', 'module dependency',
-            'layer', 'microservice', 'monolith', 'separation of concerns', 
-            'single responsibility', 'service layer', 'infrastructure',
-            'scaling', 'scalability', 'throughput', 'latency', 'response time', 
-            'bottleneck', 'distributed', 'reliability', 'availability', 'resilience'
-        ])) {
-            return DebtType.ARCHITECTURE;
-        }
-        
-        // Check for design debt
-        if (this.containsAny(fullContent, [
-            'bad design', 'poor design', 'could be designed better', 'design debt', 'refactor',
-            'abstraction', 'flexibility', 'maintainability', 'extensibility', 'poorly designed',
-            'clean up', 'cleanup', 'clean this up', 'redesign', 'better design',
-            'code smell', 'technical debt', 'tech debt', 'antipattern', 'anti-pattern',
-            'decoupling', 'coupling', 'encapsulation', 'design pattern',
-            'inheritance', 'hardcoded', 'hard-coded', 'hard coded', 'hard-coding'
-        ])) {
-            return DebtType.DESIGN;
-        }
-        
-        // Check for documentation debt
-        if (this.containsAny(fullContent, [
-            'documentation', 'docs', 'document', 'comment', 'needs explanation',
-            'explain', 'clarify', 'what this does', 'why this works', 'how this works',
-            'javadoc', 'jsdoc', 'docstring', 'readme', 'wiki', 'undocumented',
-            'missing documentation', 'update docs', 'document this', 'add comment',
-            'commenting', 'improve comment', 'better comment', 'better documentation',
-            'needs documentation', 'document usage', 'document parameters', 'document return'
-        ])) {
-            return DebtType.DOCUMENTATION;
-        }
-        
-        // Check for defect debt
-        if (this.containsAny(fullContent, [
-            'bug', 'defect', 'issue', 'problem', 'error', 'incorrect',
-            'wrong', 'broken', 'doesn\'t work', 'not working', 'fails', 'failure',
-            'exception', 'crash', 'corrupted', 'corruption', 'overflow', 'underflow',
-            'memory leak', 'resource leak', 'null pointer', 'segfault', 'infinite loop',
-            'race condition', 'deadlock', 'concurrency issue', 'out of bounds', 
-            'boundary check', 'edge case', 'corner case', 'vulnerability', 
-            'security hole', 'security issue'
-        ])) {
-            return DebtType.DEFECT;
-        }
-        
-        // Check for requirement debt
-        if (this.containsAny(fullContent, [
-            'requirement', 'specification', 'spec', 'required', 'need to support',
-            'feature', 'enhancement', 'user story', 'use case', 'product owner',
-            'stakeholder', 'business rule', 'functional requirement', 'acceptance criteria',
-            'product backlog', 'missing feature', 'incomplete feature', 'unfinished feature',
-            'planned feature', 'roadmap', 'milestone', 'not implemented yet'
-        ])) {
-            return DebtType.REQUIREMENT;
+        for (const [debtType, matcher] of DEBT_TYPE_MATCHERS) {
+            if (matcher.test(fullContent)) {
+                return debtType;
+            }
         }
         
         // Default
@@ -202,13 +206,22 @@ export class SatdDetector {
     }
     
     /**
-     * Checks if text contains any of the patterns
-     * @param text The text to check
-     * @param patterns Array of patterns to look for
-     * @returns True if text contains any of the patterns
+     * Compile patterns into one case-insensitive, word-bounded alternation.
+     * Unions are cached, so each pattern set is compiled once per detector.
+     * @param patterns Literal patterns
+     * @returns Combined regex, or null when there are no patterns
      */
-    private containsAny(text: string, patterns: string[]): boolean {
-        return patterns.some(pattern => text.includes(pattern.toLowerCase()));
+    private patternUnion(patterns: string[]): RegExp | null {
+        if (patterns.length === 0) {
+            return null;
+        }
+        const key = patterns.join('\n');
+        let regex = this.patternCache.get(key);
+        if (regex === undefined) {
+            regex = new RegExp(`\\b(?:${patterns.map(escapeRegExp).join('|')})\\b`, 'i');
+            this.patternCache.set(key, regex);
+        }
+        return regex;
     }
     
     /**
@@ -521,12 +534,11 @@ export class SatdDetector {
         const implicitPatterns = config.includeImplicit ? language.debtPatterns.implicit : [];
         const customPatterns = language.debtPatterns.custom || [];
         
-        // Combine all patterns
-        const allPatterns = [
-            ...explicitPatterns.map(p => ({ pattern: p, isExplicit: true })),
-            ...implicitPatterns.map(p => ({ pattern: p, isExplicit: false })),
-            ...customPatterns.map(p => ({ pattern: p, isExplicit: true }))
-        ];
+        // One compiled alternation per group; explicit markers take precedence
+        // over implicit phrases, which take precedence over custom patterns
+        const explicitRegex = this.patternUnion(explicitPatterns);
+        const implicitRegex = this.patternUnion(implicitPatterns);
+        const customRegex = this.patternUnion(customPatterns);
         
         // Check each line for patterns
         for (let i = 0; i < lines.length; i++) {
@@ -538,37 +550,40 @@ export class SatdDetector {
                 line.includes(style)
             );
             
-            if (hasComment) {
-                // Check for patterns
-                for (const { pattern, isExplicit } of allPatterns) {
-                    // Escape special regex characters in the pattern
-                    const escapedPattern = pattern.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
-                    const regex = new RegExp(`\\b${escapedPattern}\\b`, 'i');
-                    if (regex.test(line)) {
-                        // Get context (up to 2 lines before and after)
-                        const startLine = Math.max(0, i - 2);
-                        const endLine = Math.min(lines.length - 1, i + 2);
-                        const context = lines.slice(startLine, endLine + 1).join('\n');
-                        
-                        // Determine debt type
-                        const debtType = this.classifyDebtType(line, context);
-                        
-                        // Calculate confidence (explicit patterns have higher confidence)
-                        const confidence = isExplicit ? 0.9 : 0.7;
-                        
-                        results.push({
-                            line: lineNumber,
-                            content: line,
-                            isSatd: true,
-                            confidence,
-                            debtType
-                        });
-                        
-                        // Only report one match per line
-                        break;
-                    }
-                }
+            if (!hasComment) {
+                continue;
+            }
+            
+            // Only report one match per line
+            let isExplicit: boolean;
+            if (explicitRegex && explicitRegex.test(line)) {
+                isExplicit = true;
+            } else if (implicitRegex && implicitRegex.test(line)) {
+                isExplicit = false;
+            } else if (customRegex && customRegex.test(line)) {
+                isExplicit = true;
+            } else {
+                continue;
             }
+            
+            // Get context (up to 2 lines before and after)
+            const startLine = Math.max(0, i - 2);
+            const endLine = Math.min(lines.length - 1, i + 2);
+            const context = lines.slice(startLine, endLine + 1).join('\n');
+            
+            // Determine debt type
+            const debtType = this.classifyDebtType(line, context);
+            
+            // Calculate confidence (explicit patterns have higher confidence)
+            const confidence = isExplicit ? 0.9 : 0.7;
+            
+            results.push({
+                line: lineNumber,
+                content: line,
+                isSatd: true,
+                confidence,
+                debtType
+            });
         }
         
         return results;
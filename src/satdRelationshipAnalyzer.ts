@@ -24,6 +24,8 @@ import { CallGraphAnalyzer } from './analyzers/callGraphAnalyzer';
 import { DataDependencyAnalyzer } from './analyzers/dataDependencyAnalyzer';
 import { ControlFlowAnalyzer } from './analyzers/controlFlowAnalyzer';
 import { ModuleDependencyAnalyzer } from './analyzers/moduleDependencyAnalyzer';
+import { findWeaklyConnectedChains } from './utils/indexedGraph';
+import { groupDebtItemsByFile } from './utils/debtGrouping';
 
 /**
  * SatdRelationshipAnalyzer identifies relationships between different
@@ -85,8 +87,11 @@ export class SatdRelationshipAnalyzer {
             throw new Error('Analyzer not initialized');
         }
         
+        // Group debt items by file once; the analyzers share the grouping
+        const debtByFile = groupDebtItemsByFile(debtItems);
+        
         // Collect file content for all files with technical debt
-        const fileContentMap = await this.collectFileContent(debtItems);
+        const fileContentMap = await this.collectFileContent(debtByFile.keys());
 
         console.log(`IRD: Analyzing ${debtItems.length} SATD instances across ${fileContentMap.size} files`);
         console.log(`IRD: Max hop limit set to k=${this.maxHops}`);
@@ -102,10 +107,10 @@ export class SatdRelationshipAnalyzer {
         // Run all analyzers in parallel
         // Each analyzer checks DependencyExists(t_i, t_j, r, k) for their respective dependency type
         const [callRelationships, dataRelationships, controlFlowRelationships, moduleRelationships] = await Promise.all([
-            this.callGraphAnalyzer.findRelationships(debtItems, fileContentMap),
-            this.dataDependencyAnalyzer.findRelationships(debtItems, fileContentMap),
-            this.controlFlowAnalyzer.findRelationships(debtItems, fileContentMap),
-            this.moduleDependencyAnalyzer.findRelationships(debtItems, fileContentMap)
+            this.callGraphAnalyzer.findRelationships(debtItems, fileContentMap, debtByFile),
+            this.dataDependencyAnalyzer.findRelationships(debtItems, fileContentMap, debtByFile),
+            this.controlFlowAnalyzer.findRelationships(debtItems, fileContentMap, debtByFile),
+            this.moduleDependencyAnalyzer.findRelationships(debtItems, fileContentMap, debtByFile)
         ]);
         
         console.log(`IRD: Found ${callRelationships.length} call, ${dataRelationships.length} data, ${controlFlowRelationships.length} control, ${moduleRelationships.length} module relationships`);
@@ -176,73 +181,7 @@ export class SatdRelationshipAnalyzer {
      * for any pair (t_i, t_j), a path exists between them in the undirected version of G
      */
     public discoverChains(debtItems: TechnicalDebt[], edges: WeightedEdge[]): Chain[] {
-        const chains: Chain[] = [];
-        
-        // Build undirected adjacency list for weakly connected component analysis
-        const undirectedAdj = new Map<string, Set<string>>();
-        
-        for (const debt of debtItems) {
-            undirectedAdj.set(debt.id, new Set());
-        }
-        
-        for (const edge of edges) {
-            if (!undirectedAdj.has(edge.sourceId)) {
-                undirectedAdj.set(edge.sourceId, new Set());
-            }
-            if (!undirectedAdj.has(edge.targetId)) {
-                undirectedAdj.set(edge.targetId, new Set());
-            }
-            
-            // Add edges in both directions for undirected graph
-            undirectedAdj.get(edge.sourceId)!.add(edge.targetId);
-            undirectedAdj.get(edge.targetId)!.add(edge.sourceId);
-        }
-        
-        // Find weakly connected components using BFS
-        const visited = new Set<string>();
-        let chainId = 0;
-        
-        for (const debt of debtItems) {
-            if (visited.has(debt.id)) continue;
-            
-            // BFS to find all nodes in this component
-            const component: string[] = [];
-            const queue: string[] = [debt.id];
-            
-            while (queue.length > 0) {
-                const nodeId = queue.shift()!;
-                if (visited.has(nodeId)) continue;
-                
-                visited.add(nodeId);
-                component.push(nodeId);
-                
-                const neighbors = undirectedAdj.get(nodeId) || new Set();
-                for (const neighbor of neighbors) {
-                    if (!visited.has(neighbor)) {
-                        queue.push(neighbor);
-                    }
-                }
-            }
-            
-            // Only create a chain if there's more than one node connected
-            if (component.length > 1) {
-                // Calculate total weight of edges in this chain
-                let totalWeight = 0;
-                const componentSet = new Set(component);
-                for (const edge of edges) {
-                    if (componentSet.has(edge.sourceId) && componentSet.has(edge.targetId)) {
-                        totalWeight += edge.weight;
-                    }
-                }
-                
-                chains.push({
-                    id: `chain-${++chainId}`,
-                    nodes: component,
-                    length: component.length,
-                    totalWeight
-                });
-            }
-        }
+        const chains = findWeaklyConnectedChains(debtItems, edges);
         
         console.log(`IRD: Discovered ${chains.length} SATD chains`);
         
@@ -389,11 +328,10 @@ export class SatdRelationshipAnalyzer {
     /**
      * Collect content of all files with technical debt
      */
-    private async collectFileContent(debtItems: TechnicalDebt[]): Promise<Map<string, string>> {
+    private async collectFileContent(filePaths: Iterable<string>): Promise<Map<string, string>> {
         const fileContentMap = new Map<string, string>();
-        const uniqueFiles = [...new Set(debtItems.map(item => item.file))];
         
-        for (const filePath of uniqueFiles) {
+        for (const filePath of filePaths) {
             try {
                 if (!this.workspaceRoot) {
                     continue;
@@ -427,23 +365,24 @@ export class SatdRelationshipAnalyzer {
         
         for (const relationship of relationships) {
             const key = `${relationship.sourceId}-${relationship.targetId}`;
+            const existing = relationshipMap.get(key);
             
-            if (relationshipMap.has(key)) {
-                const existing = relationshipMap.get(key)!;
-                
+            if (existing) {
                 // Merge relationship types
                 const newTypes = new Set([...existing.types, ...relationship.types]);
                 existing.types = Array.from(newTypes);
                 
-                // Merge edges
-                existing.edges = [...existing.edges, ...relationship.edges];
+                // Merge edges into the merged relationship's own edge list
+                let strength = Math.max(existing.strength, relationship.strength);
+                for (const edge of relationship.edges) {
+                    existing.edges.push(edge);
+                    if (edge.weight > strength) {
+                        strength = edge.weight;
+                    }
+                }
                 
                 // Update strength to max of all edge weights
-                existing.strength = Math.max(
-                    existing.strength, 
-                    relationship.strength,
-                    ...relationship.edges.map(e => e.weight)
-                );
+                existing.strength = strength;
                 
                 // Update hop count to minimum
                 if (relationship.hopCount !== undefined) {
@@ -455,7 +394,8 @@ export class SatdRelationshipAnalyzer {
                 // Combine descriptions
                 existing.description = this.combineDescriptions(existing.description, relationship.description);
             } else {
-                relationshipMap.set(key, { ...relationship });
+                // Copy the edge list so merging never appends to the caller's array
+                relationshipMap.set(key, { ...relationship, edges: [...relationship.edges] });
             }
         }
         
@@ -29,6 +29,7 @@ import {
   summarizeChangesDiff,
 } from './llmProvider';
 import { RemediationPlan, TechnicalDebt } from '../models';
+import { getLLMCache } from './llmCache';
 
 // Conditional vscode import (not available in CLI mode)
 let vscode: typeof import('vscode') | undefined;
@@ -90,17 +91,21 @@ export class AnthropicProvider implements LLMProvider {
   // ---------------------------------------------------------------------------
   async classifySATD(comment: string, context = ''): Promise<LLMClassification> {
     try {
-      const response = await retryWithBackoff(() =>
-        this.client.messages.create({
-          model:      this.model,
-          max_tokens: 150,
-          system:     PROMPT1_SYSTEM,
-          messages:   [{ role: 'user', content: buildPrompt1(comment, context) }],
-        })
-      );
-
-      const res = response as any;
-      const text = (res.content?.[0] as any)?.text?.trim() ?? '';
+      const prompt = buildPrompt1(comment, context);
+      const text = await getLLMCache().getOrFetch(this.model, PROMPT1_SYSTEM, prompt, async () => {
+        const response = await retryWithBackoff(() =>
+          this.client.messages.create({
+            model:       this.model,
+            max_tokens:  150,
+            temperature: 0,   // deterministic, so the cached answer stands in for a re-run
+            system:      PROMPT1_SYSTEM,
+            messages:    [{ role: 'user', content: prompt }],
+          })
+        );
+
+        const res = response as any;
+        return (res.content?.[0] as any)?.text?.trim() ?? '';
+      });
       return parseClassificationResponse(text);
     } catch (err: any) {
       console.error(`[AnthropicProvider] classifySATD failed: ${err?.message}`);
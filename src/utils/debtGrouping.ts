@@ -0,0 +1,21 @@
+// src/utils/debtGrouping.ts
+import { TechnicalDebt } from '../models';
+
+/**
+ * Group technical debt items by file, keeping files in first-seen order
+ * and each file's items in list order
+ */
+export function groupDebtItemsByFile(debtItems: TechnicalDebt[]): Map<string, TechnicalDebt[]> {
+    const debtByFile = new Map<string, TechnicalDebt[]>();
+    
+    for (const item of debtItems) {
+        const debtsInFile = debtByFile.get(item.file);
+        if (debtsInFile) {
+            debtsInFile.push(item);
+        } else {
+            debtByFile.set(item.file, [item]);
+        }
+    }
+    
+    return debtByFile;
+}
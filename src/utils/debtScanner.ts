@@ -14,7 +14,13 @@ import * as fs from 'fs';
 import * as path from 'path';
 import { TechnicalDebt, DEFAULT_SATD_CONFIG, SatdConfig, DebtType } from '../models';
 import { getWorkspaceRoot } from './gitUtils';
-import { classifySATD, analyzeTechnicalDebtComment, batchClassifySATD } from './openaiClient';
+import {
+  classifySATD,
+  analyzeTechnicalDebtComment,
+  batchClassifySATD,
+  mapWithConcurrency,
+  LLM_CONCURRENCY
+} from './openaiClient';
 import { SatdDetector } from '../satdDetector';
 
 const execPromise = promisify(exec);
@@ -386,65 +392,71 @@ async function getSurroundingContext(
  * 
  * @param candidates Filtered candidates from Stage 1
  * @param threshold Confidence threshold τ (default: 0.7)
+ * @param failures Optional array that receives candidates whose LLM request
+ *        failed, unclassified with llmError set; they are never returned as SATD
  * @returns Confirmed SATD instances
  */
 export async function llmClassification(
   candidates: CandidateComment[],
-  threshold: number = 0.7
+  threshold: number = 0.7,
+  failures?: TechnicalDebt[]
 ): Promise<TechnicalDebt[]> {
-  const satdInstances: TechnicalDebt[] = [];
   const satdDetector = new SatdDetector();
-  
-  // Process candidates in batches for efficiency
-  const batchSize = 10;
-  
-  for (let i = 0; i < candidates.length; i += batchSize) {
-    const batch = candidates.slice(i, i + batchSize);
-    
-    const classificationPromises = batch.map(async (candidate) => {
-      try {
-        // Use LLM classification (Prompt 1)
-        const result = await classifySATD(candidate.content, candidate.context);
-        
-        // Apply confidence threshold τ
-        if (result.isSATD && result.confidence >= threshold) {
-          // Classify debt type
-          const debtType = satdDetector.classifyDebtType(candidate.content, candidate.context);
-          
-          // Create unique ID
-          const id = `${candidate.file}-${candidate.line}-${candidate.commitHash.substring(0, 7)}`;
-          
-          return {
-            id,
-            file: candidate.file,
-            line: candidate.line,
-            content: candidate.content,
-            extendedContent: candidate.context,
-            description: candidate.content,
-            createdCommit: candidate.commitHash,
-            createdDate: candidate.commitDate,
-            debtType,
-            isActualDebt: true,
-            confidence: result.confidence
-          } as TechnicalDebt;
-        }
-        
-        return null;
-      } catch (error) {
-        console.error(`LLM classification failed for ${candidate.file}:${candidate.line}: ${error}`);
+  let processed = 0;
+  let failed = 0;
+  
+  const toDebt = (candidate: CandidateComment, fields: Partial<TechnicalDebt>): TechnicalDebt => ({
+    id: `${candidate.file}-${candidate.line}-${candidate.commitHash.substring(0, 7)}`,
+    file: candidate.file,
+    line: candidate.line,
+    content: candidate.content,
+    extendedContent: candidate.context,
+    description: candidate.content,
+    createdCommit: candidate.commitHash,
+    createdDate: candidate.commitDate,
+    debtType: satdDetector.classifyDebtType(candidate.content, candidate.context),
+    ...fields
+  } as TechnicalDebt);
+  
+  // Keep up to LLM_CONCURRENCY requests in flight; results stay in candidate order
+  const results = await mapWithConcurrency(candidates, LLM_CONCURRENCY, async (candidate) => {
+    try {
+      // Use LLM classification (Prompt 1)
+      const result = await classifySATD(candidate.content, candidate.context);
+      
+      // A failed request is not a negative: keep the candidate unclassified
+      if (result.error) {
+        failed++;
+        console.warn(`LLM error for ${candidate.file}:${candidate.line}: ${result.error}`);
+        failures?.push(toDebt(candidate, { isActualDebt: undefined, confidence: undefined, llmError: result.error }));
         return null;
       }
-    });
-    
-    const results = await Promise.all(classificationPromises);
-    satdInstances.push(...results.filter((r): r is TechnicalDebt => r !== null));
-    
-    // Progress update
-    if ((i + batchSize) % 50 === 0) {
-      console.log(`Processed ${Math.min(i + batchSize, candidates.length)}/${candidates.length} candidates`);
+      
+      // Apply confidence threshold τ
+      if (result.isSATD && result.confidence >= threshold) {
+        return toDebt(candidate, { isActualDebt: true, confidence: result.confidence });
+      }
+      
+      return null;
+    } catch (error) {
+      failed++;
+      const errorMsg = error instanceof Error ? error.message : String(error);
+      console.error(`LLM classification failed for ${candidate.file}:${candidate.line}: ${errorMsg}`);
+      failures?.push(toDebt(candidate, { isActualDebt: undefined, confidence: undefined, llmError: errorMsg }));
+      return null;
+    } finally {
+      // Progress update
+      if (++processed % 50 === 0) {
+        console.log(`Processed ${processed}/${candidates.length} candidates`);
+      }
     }
+  });
+  
+  if (failed > 0) {
+    console.warn(`llmClassification: ${failed}/${candidates.length} candidates could not be classified and were left out`);
   }
   
+  const satdInstances = results.filter((r): r is TechnicalDebt => r !== null);
   return satdInstances;
 }
 
@@ -482,8 +494,9 @@ export async function detectSATDInstances(
   
   // Stage 2: LLM Classification
   console.log('Stage 2: LLM classification...');
-  const satdInstances = await llmClassification(candidates, fullConfig.confidenceThreshold);
-  console.log(`Confirmed ${satdInstances.length} SATD instances after LLM classification`);
+  const failures: TechnicalDebt[] = [];
+  const satdInstances = await llmClassification(candidates, fullConfig.confidenceThreshold, failures);
+  console.log(`Confirmed ${satdInstances.length} SATD instances after LLM classification (${failures.length} unclassified after LLM errors)`);
   
   return satdInstances;
 }
@@ -739,8 +752,9 @@ export async function scanRepositoryCLI(
   
   // Stage 2: LLM Classification
   console.log('Stage 2: LLM classification...');
-  const satdInstances = await llmClassification(candidates, fullConfig.confidenceThreshold);
-  console.log(`Confirmed ${satdInstances.length} SATD instances`);
+  const failures: TechnicalDebt[] = [];
+  const satdInstances = await llmClassification(candidates, fullConfig.confidenceThreshold, failures);
+  console.log(`Confirmed ${satdInstances.length} SATD instances (${failures.length} unclassified after LLM errors)`);
   
   return satdInstances;
 }
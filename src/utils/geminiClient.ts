@@ -29,6 +29,7 @@ import {
   summarizeChangesDiff,
 } from './llmProvider';
 import { RemediationPlan, TechnicalDebt } from '../models';
+import { getLLMCache } from './llmCache';
 
 // Conditional vscode import (not available in CLI mode)
 let vscode: typeof import('vscode') | undefined;
@@ -86,11 +87,18 @@ export class GeminiProvider implements LLMProvider {
   // ---------------------------------------------------------------------------
   async classifySATD(comment: string, context = ''): Promise<LLMClassification> {
     try {
-      const genModel = this.genAI.getGenerativeModel({ model: this.model });
-      const fullPrompt = `${PROMPT1_SYSTEM}\n\n${buildPrompt1(comment, context)}`;
-
-      const result = await retryWithBackoff(() => genModel.generateContent(fullPrompt)) as any;
-      const text = result.response.text().trim();
+      const prompt = buildPrompt1(comment, context);
+      const text = await getLLMCache().getOrFetch(this.model, PROMPT1_SYSTEM, prompt, async () => {
+        // temperature 0 so the cached answer stands in for a re-run
+        const genModel = this.genAI.getGenerativeModel({
+          model: this.model,
+          generationConfig: { temperature: 0 },
+        });
+        const fullPrompt = `${PROMPT1_SYSTEM}\n\n${prompt}`;
+
+        const result = await retryWithBackoff(() => genModel.generateContent(fullPrompt)) as any;
+        return result.response.text().trim();
+      });
       return parseClassificationResponse(text);
     } catch (err: any) {
       console.error(`[GeminiProvider] classifySATD failed: ${err?.message}`);
@@ -0,0 +1,301 @@
+// src/utils/indexedGraph.ts
+import { Chain, TechnicalDebt, WeightedEdge } from '../models';
+
+/**
+ * Strongly or weakly connected components of an IndexedGraph
+ */
+export interface GraphComponents {
+    /** Component number of each node, or -1 for nodes no component reached */
+    componentOf: Int32Array;
+
+    /** Node indices of each component */
+    components: Int32Array[];
+}
+
+/**
+ * IndexedGraph is a compact, read-only directed graph over SATD nodes.
+ *
+ * Node IDs are mapped to dense integer indices once, and adjacency is held in
+ * compressed sparse row (CSR) form: the out-edges of node i occupy
+ * positions offsets[i] .. offsets[i + 1] - 1 of the parallel `targets` and
+ * `weights` arrays, in the order the edges were given. Graph algorithms then
+ * run over typed arrays instead of string-keyed Maps of edge objects.
+ */
+export class IndexedGraph {
+    /** Node ID of each index */
+    public readonly ids: string[];
+
+    /** CSR row offsets (length = node count + 1) */
+    public readonly offsets: Int32Array;
+
+    /** Target node index of each edge */
+    public readonly targets: Int32Array;
+
+    /** Weight w_r of each edge */
+    public readonly weights: Float64Array;
+
+    private readonly indexById: Map<string, number>;
+
+    /** Endpoints of each edge in input order */
+    private readonly edgeSources: Int32Array;
+    private readonly edgeTargets: Int32Array;
+
+    private constructor(
+        ids: string[],
+        indexById: Map<string, number>,
+        offsets: Int32Array,
+        targets: Int32Array,
+        weights: Float64Array,
+        edgeSources: Int32Array,
+        edgeTargets: Int32Array
+    ) {
+        this.ids = ids;
+        this.indexById = indexById;
+        this.offsets = offsets;
+        this.targets = targets;
+        this.weights = weights;
+        this.edgeSources = edgeSources;
+        this.edgeTargets = edgeTargets;
+    }
+
+    /**
+     * Build a graph from node IDs and weighted edges.
+     *
+     * Nodes are indexed in the order given, followed by edge sources and then
+     * edge targets that were not listed, so iterating indices visits nodes in
+     * the same order as an adjacency Map filled the same way.
+     */
+    public static fromEdges(nodeIds: Iterable<string>, edges: WeightedEdge[]): IndexedGraph {
+        const ids: string[] = [];
+        const indexById = new Map<string, number>();
+        const indexOf = (id: string): number => {
+            let index = indexById.get(id);
+            if (index === undefined) {
+                index = ids.length;
+                indexById.set(id, index);
+                ids.push(id);
+            }
+            return index;
+        };
+
+        for (const id of nodeIds) {
+            indexOf(id);
+        }
+        const sources = new Int32Array(edges.length);
+        for (let e = 0; e < edges.length; e++) {
+            sources[e] = indexOf(edges[e].sourceId);
+        }
+        const edgeTargets = new Int32Array(edges.length);
+        for (let e = 0; e < edges.length; e++) {
+            edgeTargets[e] = indexOf(edges[e].targetId);
+        }
+
+        // Counting sort of edges by source, stable in input order
+        const nodeCount = ids.length;
+        const offsets = new Int32Array(nodeCount + 1);
+        for (let e = 0; e < edges.length; e++) {
+            offsets[sources[e] + 1]++;
+        }
+        for (let i = 0; i < nodeCount; i++) {
+            offsets[i + 1] += offsets[i];
+        }
+
+        const next = offsets.slice(0, nodeCount);
+        const targets = new Int32Array(edges.length);
+        const weights = new Float64Array(edges.length);
+        for (let e = 0; e < edges.length; e++) {
+            const position = next[sources[e]]++;
+            targets[position] = edgeTargets[e];
+            weights[position] = edges[e].weight;
+        }
+
+        return new IndexedGraph(ids, indexById, offsets, targets, weights, sources, edgeTargets);
+    }
+
+    /** Number of nodes */
+    public get size(): number {
+        return this.ids.length;
+    }
+
+    /** Index of a node ID, or -1 if the graph does not contain it */
+    public indexOf(id: string): number {
+        return this.indexById.get(id) ?? -1;
+    }
+
+    /** Sum of the weights of a node's out-edges */
+    public weightedOutDegree(node: number): number {
+        let sum = 0;
+        for (let e = this.offsets[node]; e < this.offsets[node + 1]; e++) {
+            sum += this.weights[e];
+        }
+        return sum;
+    }
+
+    /**
+     * Tarjan's strongly connected components (iterative, so long chains
+     * cannot overflow the call stack)
+     * @returns Components in reverse topological order (sinks first)
+     */
+    public stronglyConnectedComponents(): GraphComponents {
+        const nodeCount = this.size;
+        const { offsets, targets } = this;
+        const index = new Int32Array(nodeCount).fill(-1);
+        const lowLink = new Int32Array(nodeCount);
+        const onStack = new Uint8Array(nodeCount);
+        const stack = new Int32Array(nodeCount);
+        const componentOf = new Int32Array(nodeCount).fill(-1);
+        const components: Int32Array[] = [];
+        let stackTop = 0;
+        let nextIndex = 0;
+
+        // Explicit call stack of nodes and the position of their next edge
+        const workNode = new Int32Array(nodeCount);
+        const workEdge = new Int32Array(nodeCount);
+        let workTop = 0;
+
+        const open = (node: number) => {
+            index[node] = lowLink[node] = nextIndex++;
+            stack[stackTop++] = node;
+            onStack[node] = 1;
+            workNode[workTop] = node;
+            workEdge[workTop] = offsets[node];
+            workTop++;
+        };
+
+        for (let root = 0; root < nodeCount; root++) {
+            if (index[root] !== -1) continue;
+            open(root);
+
+            while (workTop > 0) {
+                const node = workNode[workTop - 1];
+
+                if (workEdge[workTop - 1] < offsets[node + 1]) {
+                    const target = targets[workEdge[workTop - 1]++];
+                    if (index[target] === -1) {
+                        open(target);
+                    } else if (onStack[target] && index[target] < lowLink[node]) {
+                        lowLink[node] = index[target];
+                    }
+                    continue;
+                }
+
+                workTop--;
+                if (workTop > 0) {
+                    const parent = workNode[workTop - 1];
+                    if (lowLink[node] < lowLink[parent]) {
+                        lowLink[parent] = lowLink[node];
+                    }
+                }
+
+                if (lowLink[node] === index[node]) {
+                    const component = components.length;
+                    let start = stackTop;
+                    do {
+                        start--;
+                        onStack[stack[start]] = 0;
+                        componentOf[stack[start]] = component;
+                    } while (stack[start] !== node);
+                    components.push(stack.slice(start, stackTop));
+                    stackTop = start;
+                }
+            }
+        }
+
+        return { componentOf, components };
+    }
+
+    /**
+     * Weakly connected components, found by breadth-first search from each
+     * start node in turn. Edge direction is ignored; each node's neighbours
+     * are visited in edge order. Components list nodes in BFS order.
+     */
+    public weaklyConnectedComponents(startNodes: Iterable<number>): GraphComponents {
+        const nodeCount = this.size;
+        const { edgeSources, edgeTargets } = this;
+
+        // Undirected CSR: every edge listed under both endpoints, in edge order
+        const degree = new Int32Array(nodeCount + 1);
+        for (let e = 0; e < edgeSources.length; e++) {
+            degree[edgeSources[e] + 1]++;
+            degree[edgeTargets[e] + 1]++;
+        }
+        for (let i = 0; i < nodeCount; i++) {
+            degree[i + 1] += degree[i];
+        }
+        const next = degree.slice(0, nodeCount);
+        const neighbors = new Int32Array(degree[nodeCount]);
+        for (let e = 0; e < edgeSources.length; e++) {
+            neighbors[next[edgeSources[e]]++] = edgeTargets[e];
+            neighbors[next[edgeTargets[e]]++] = edgeSources[e];
+        }
+
+        const componentOf = new Int32Array(nodeCount).fill(-1);
+        const components: Int32Array[] = [];
+        const queue = new Int32Array(nodeCount);
+
+        for (const start of startNodes) {
+            if (componentOf[start] !== -1) continue;
+
+            const component = components.length;
+            let head = 0;
+            let tail = 0;
+            queue[tail++] = start;
+            componentOf[start] = component;
+
+            while (head < tail) {
+                const node = queue[head++];
+                for (let n = degree[node]; n < degree[node + 1]; n++) {
+                    const neighbor = neighbors[n];
+                    if (componentOf[neighbor] === -1) {
+                        componentOf[neighbor] = component;
+                        queue[tail++] = neighbor;
+                    }
+                }
+            }
+
+            components.push(queue.slice(0, tail));
+        }
+
+        return { componentOf, components };
+    }
+}
+
+/**
+ * Find SATD chains as the weakly connected components of the dependency
+ * graph that contain more than one node. Components are searched from each
+ * debt item in order and numbered chain-1, chain-2, ...; totalWeight sums
+ * the weights of the edges inside the chain.
+ * @param graph The graph of debtItems and edges, if the caller already built it
+ */
+export function findWeaklyConnectedChains(
+    debtItems: TechnicalDebt[],
+    edges: WeightedEdge[],
+    graph: IndexedGraph = IndexedGraph.fromEdges(debtItems.map(debt => debt.id), edges)
+): Chain[] {
+    const { componentOf, components } = graph.weaklyConnectedComponents(
+        debtItems.map(debt => graph.indexOf(debt.id))
+    );
+
+    // Both endpoints of an edge always fall in the same component
+    const componentWeights = new Float64Array(components.length);
+    for (const edge of edges) {
+        const component = componentOf[graph.indexOf(edge.sourceId)];
+        if (component !== -1) {
+            componentWeights[component] += edge.weight;
+        }
+    }
+
+    const chains: Chain[] = [];
+    for (let c = 0; c < components.length; c++) {
+        if (components[c].length > 1) {
+            const nodes = Array.from(components[c], node => graph.ids[node]);
+            chains.push({
+                id: `chain-${chains.length + 1}`,
+                nodes,
+                length: nodes.length,
+                totalWeight: componentWeights[c]
+            });
+        }
+    }
+    return chains;
+}
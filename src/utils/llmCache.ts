@@ -0,0 +1,141 @@
+/**
+ * src/utils/llmCache.ts
+ *
+ * Persistent response cache for LLM prompts.
+ *
+ * Every prompt is sent with temperature=0 (paper Section 4.1), so a given
+ * (model, system message, user message) triple is treated as having one
+ * answer.  Responses are stored under the SHA-256 of that triple in an
+ * append-only JSON-lines file that is loaded once per process.  Comments
+ * that recur across a scan (bare TODO / FIXME lines in identical context)
+ * and re-runs of the evaluation are then served without a network call.
+ * Messages are keyed in canonical form (see LLMResponseCache.canonical), so
+ * the same comment and context with different line endings or trailing
+ * whitespace share one entry.
+ *
+ * Location (checked in order):
+ *   1. Environment variable RAPIDPAY_LLM_CACHE — a file path, or "off"
+ *   2. ~/.rapidpay/llm-cache.jsonl
+ */
+
+import { createHash } from 'crypto';
+import * as fs from 'fs';
+import * as os from 'os';
+import * as path from 'path';
+
+const DEFAULT_CACHE_FILE = path.join(os.homedir(), '.rapidpay', 'llm-cache.jsonl');
+
+export class LLMResponseCache {
+  private entries = new Map<string, string>();
+  private inflight = new Map<string, Promise<string>>();
+  private loaded = false;
+
+  /**
+   * @param filePath JSON-lines file backing the cache, or null to keep
+   *                 entries in memory only.
+   */
+  constructor(private filePath: string | null) {}
+
+  /**
+   * Canonical form of a message for keying: CRLF / CR line endings become
+   * LF and trailing whitespace is dropped from each line and from the end.
+   * Indentation is kept, since it can change the meaning of the code
+   * context.  The prompt sent to the model is left as is.
+   */
+  static canonical(text: string): string {
+    return text.replace(/\r\n?/g, '\n').replace(/[ \t]+$/gm, '').trimEnd();
+  }
+
+  /** Cache key for a prompt: SHA-256 over model and canonical system and user message. */
+  static key(model: string, system: string, user: string): string {
+    return createHash('sha256')
+      .update(model).update('\0')
+      .update(LLMResponseCache.canonical(system)).update('\0')
+      .update(LLMResponseCache.canonical(user))
+      .digest('hex');
+  }
+
+  get(key: string): string | undefined {
+    this.load();
+    return this.entries.get(key);
+  }
+
+  set(key: string, response: string): void {
+    this.load();
+    if (this.entries.get(key) === response) return;
+    this.entries.set(key, response);
+
+    if (!this.filePath) return;
+    try {
+      fs.mkdirSync(path.dirname(this.filePath), { recursive: true });
+      fs.appendFileSync(this.filePath, JSON.stringify({ key, response }) + '\n');
+    } catch (err: any) {
+      console.warn(`[LLMResponseCache] Cannot write ${this.filePath}, caching in memory only: ${err?.message}`);
+      this.filePath = null;
+    }
+  }
+
+  /**
+   * Return the cached response for a prompt, or call `complete` and cache
+   * its result.  Concurrent requests for the same prompt share one call.
+   * Empty responses and errors are not cached.
+   */
+  async getOrFetch(
+    model: string,
+    system: string,
+    user: string,
+    complete: () => Promise<string>
+  ): Promise<string> {
+    const key = LLMResponseCache.key(model, system, user);
+    const cached = this.get(key);
+    if (cached !== undefined) return cached;
+
+    let pending = this.inflight.get(key);
+    if (!pending) {
+      pending = complete()
+        .then(text => {
+          if (text) this.set(key, text);
+          return text;
+        })
+        .finally(() => this.inflight.delete(key));
+      this.inflight.set(key, pending);
+    }
+    return pending;
+  }
+
+  private load(): void {
+    if (this.loaded) return;
+    this.loaded = true;
+    if (!this.filePath || !fs.existsSync(this.filePath)) return;
+
+    try {
+      for (const line of fs.readFileSync(this.filePath, 'utf-8').split('\n')) {
+        if (!line) continue;
+        try {
+          const { key, response } = JSON.parse(line);
+          if (typeof key === 'string' && typeof response === 'string') {
+            this.entries.set(key, response);
+          }
+        } catch {
+          // Partial line left by an interrupted run
+        }
+      }
+    } catch (err: any) {
+      console.warn(`[LLMResponseCache] Cannot read ${this.filePath}: ${err?.message}`);
+    }
+  }
+}
+
+let sharedCache: LLMResponseCache | null = null;
+
+/**
+ * Process-wide cache used by all providers, located from RAPIDPAY_LLM_CACHE.
+ */
+export function getLLMCache(): LLMResponseCache {
+  if (!sharedCache) {
+    const setting = process.env.RAPIDPAY_LLM_CACHE;
+    const filePath = setting === 'off' ? null : setting || DEFAULT_CACHE_FILE;
+    sharedCache = new LLMResponseCache(filePath);
+  }
+  return sharedCache;
+}
@@ -17,10 +17,23 @@ import {
   FIX_POTENTIAL_VALUES,
   TechnicalDebt
 } from '../models';
+import { getLLMCache } from './llmCache';
 
 let openaiClient: OpenAI | null = null;
 let modelName: string = 'gpt-4o-2024-05-13';
 
+/**
+ * Optional cheaper model that answers Prompt 1 first; '' sends every
+ * comment straight to modelName (the paper setup)
+ */
+let screeningModelName: string = '';
+
+/**
+ * Screening answers at or above this confidence are final; the rest are
+ * escalated to modelName
+ */
+export const SCREENING_CONFIDENCE = 0.9;
+
 /**
  * Initialize the OpenAI client with API key from VS Code settings or environment
  * @returns boolean indicating success
@@ -34,6 +47,7 @@ export function initializeOpenAI(): boolean {
       const config = vscode.workspace.getConfiguration('RapidPay');
       apiKey = config.get<string>('openaiApiKey');
       modelName = config.get<string>('modelName') || 'gpt-4o-2024-05-13';
+      screeningModelName = config.get<string>('screeningModelName') || '';
     }
     
     // If no API key in settings, check for environment variable
@@ -77,11 +91,17 @@ export function initializeOpenAI(): boolean {
  * Initialize OpenAI client for CLI usage (without VS Code)
  * @param apiKey OpenAI API key
  * @param model Model name (default: gpt-4o)
+ * @param screeningModel Cheaper model that screens Prompt 1 first (default: none)
  */
-export function initializeOpenAICLI(apiKey: string, model: string = 'gpt-4o-2024-05-13'): boolean {
+export function initializeOpenAICLI(
+  apiKey: string,
+  model: string = 'gpt-4o-2024-05-13',
+  screeningModel: string = ''
+): boolean {
   try {
     openaiClient = new OpenAI({ apiKey });
     modelName = model;
+    screeningModelName = screeningModel;
     return true;
   } catch (error) {
     console.error(`Failed to initialize OpenAI client: ${error}`);
@@ -98,7 +118,36 @@ export function getOpenAIClient(): OpenAI | null {
 }
 
 /**
- * Retry helper with exponential backoff for rate limit errors
+ * Delay a rate-limit response asks for via its retry-after-ms or
+ * retry-after header, if it carries one
+ */
+function retryAfterMs(error: any): number | undefined {
+  const headers = error?.headers;
+  if (!headers) {
+    return undefined;
+  }
+  const header = (name: string): string | undefined =>
+    (typeof headers.get === 'function' ? headers.get(name) : headers[name]) ?? undefined;
+  
+  const ms = parseFloat(header('retry-after-ms') ?? '');
+  if (ms >= 0) {
+    return ms;
+  }
+  const value = header('retry-after');
+  if (!value) {
+    return undefined;
+  }
+  // Either delta-seconds or an HTTP date
+  const seconds = parseFloat(value);
+  if (!isNaN(seconds)) {
+    return Math.max(0, seconds * 1000);
+  }
+  const date = Date.parse(value);
+  return isNaN(date) ? undefined : Math.max(0, date - Date.now());
+}
+
+/**
+ * Retry helper with backoff for rate limit errors; honors Retry-After
  */
 async function retryWithBackoff<T>(
   fn: () => Promise<T>,
@@ -120,8 +169,8 @@ async function retryWithBackoff<T>(
                           error?.message?.includes('rate limit');
       
       if (isRateLimit && attempt < maxRetries - 1) {
-        // Exponential backoff: 1s, 2s, 4s, etc.
-        const delay = initialDelay * Math.pow(2, attempt);
+        // Wait as long as the server asks, else back off exponentially: 1s, 2s, 4s, etc.
+        const delay = retryAfterMs(error) ?? initialDelay * Math.pow(2, attempt);
         console.warn(`Rate limit hit, retrying in ${delay}ms (attempt ${attempt + 1}/${maxRetries})...`);
         await new Promise(resolve => setTimeout(resolve, delay));
         continue;
@@ -135,6 +184,136 @@ async function retryWithBackoff<T>(
   throw lastError;
 }
 
+/**
+ * Maximum number of in-flight Prompt 1 requests during batch classification.
+ * Request starts are paced by LLM_REQUESTS_PER_SECOND; rate-limit responses
+ * that still occur are absorbed by retryWithBackoff.
+ */
+export const LLM_CONCURRENCY = 16;
+
+/**
+ * Sustained Prompt 1 request rate across all workers (requests per second),
+ * with bursts of up to LLM_CONCURRENCY requests
+ */
+export const LLM_REQUESTS_PER_SECOND = 8;
+
+/**
+ * Token-bucket rate limiter. take() resolves once a request may start;
+ * waiting callers are served in arrival order.
+ */
+export class TokenBucket {
+  private tokens: number;
+  private lastRefill: number;
+  private queue: Promise<void> = Promise.resolve();
+  
+  constructor(
+    private readonly ratePerSecond: number,
+    private readonly capacity: number
+  ) {
+    this.tokens = capacity;
+    this.lastRefill = Date.now();
+  }
+  
+  take(): Promise<void> {
+    const turn = this.queue.then(() => this.waitForToken());
+    this.queue = turn;
+    return turn;
+  }
+  
+  private async waitForToken(): Promise<void> {
+    for (;;) {
+      const now = Date.now();
+      this.tokens = Math.min(
+        this.capacity,
+        this.tokens + (now - this.lastRefill) * this.ratePerSecond / 1000
+      );
+      this.lastRefill = now;
+      if (this.tokens >= 1) {
+        this.tokens -= 1;
+        return;
+      }
+      const wait = (1 - this.tokens) * 1000 / this.ratePerSecond;
+      await new Promise(resolve => setTimeout(resolve, wait));
+    }
+  }
+}
+
+/** Shared by every Prompt 1 request, including retries */
+const requestLimiter = new TokenBucket(LLM_REQUESTS_PER_SECOND, LLM_CONCURRENCY);
+
+/**
+ * Map items through an async function with at most `limit` calls in flight.
+ * Results are returned in input order.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results: R[] = new Array(items.length);
+  let next = 0;
+  
+  const worker = async () => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index], index);
+    }
+  };
+  
+  await Promise.all(
+    Array.from({ length: Math.min(limit, items.length) }, worker)
+  );
+  return results;
+}
+
+/**
+ * Send Prompt 1 to one model and parse its answer
+ */
+async function requestSATDClassification(
+  model: string,
+  systemMessage: string,
+  prompt: string
+): Promise<SATDClassificationResult> {
+  // Repeated comments (and re-runs) are answered from the on-disk cache
+  const responseText = await getLLMCache().getOrFetch(model, systemMessage, prompt, async () => {
+    const response = await retryWithBackoff(async () => {
+      await requestLimiter.take();
+      return await openaiClient!.chat.completions.create({
+        model,
+        messages: [
+          {
+            role: "system",
+            content: systemMessage
+          },
+          {
+            role: "user",
+            content: prompt
+          }
+        ],
+        max_tokens: 100,
+        temperature: 0   // paper specifies temperature=0 for reproducibility
+      });
+    });
+    return response.choices[0]?.message.content?.trim() || '';
+  });
+  
+  console.log(`classifySATD: ${model} response: "${responseText}"`);
+  
+  // Parse response
+  const classificationMatch = responseText.match(/CLASSIFICATION:\s*(TRUE|FALSE)/i);
+  const confidenceMatch = responseText.match(/CONFIDENCE:\s*(\d+)/i);
+  
+  const isSATD = classificationMatch ? classificationMatch[1].toUpperCase() === 'TRUE' : false;
+  const confidenceRaw = confidenceMatch ? parseInt(confidenceMatch[1], 10) : 0;
+  const confidence = Math.min(100, Math.max(0, confidenceRaw)) / 100; // Normalize to 0-1
+  
+  return {
+    isSATD,
+    confidence,
+    rawResponse: responseText
+  };
+}
+
 /**
  * PROMPT 1: SATD Instance Detection (SID)
  * Classifies a code comment as SATD or non-SATD with confidence score
@@ -170,41 +349,23 @@ CONFIDENCE: <number from 0 to 100>`;
   try {
     console.log(`classifySATD: Calling LLM for comment: "${commentText.substring(0, 50)}..."`);
     
-    const response = await retryWithBackoff(async () => {
-      return await openaiClient!.chat.completions.create({
-        model: modelName,
-        messages: [
-          {
-            role: "system",
-            content: "You are a code analysis assistant specialized in detecting Self-Admitted Technical Debt (SATD) in source code comments. SATD includes TODO comments, FIXME notes, hack acknowledgments, workaround descriptions, and any developer-written text acknowledging suboptimal code quality or implementation shortcuts."
-          },
-          {
-            role: "user",
-            content: prompt
-          }
-        ],
-        max_tokens: 100,
-        temperature: 0   // paper specifies temperature=0 for reproducibility
-      });
-    });
-
-    const responseText = response.choices[0]?.message.content?.trim() || '';
-    
-    console.log(`classifySATD: LLM response: "${responseText}"`);
+    const systemMessage = "You are a code analysis assistant specialized in detecting Self-Admitted Technical Debt (SATD) in source code comments. SATD includes TODO comments, FIXME notes, hack acknowledgments, workaround descriptions, and any developer-written text acknowledging suboptimal code quality or implementation shortcuts.";
     
-    // Parse response
-    const classificationMatch = responseText.match(/CLASSIFICATION:\s*(TRUE|FALSE)/i);
-    const confidenceMatch = responseText.match(/CONFIDENCE:\s*(\d+)/i);
-    
-    const isSATD = classificationMatch ? classificationMatch[1].toUpperCase() === 'TRUE' : false;
-    const confidenceRaw = confidenceMatch ? parseInt(confidenceMatch[1], 10) : 0;
-    const confidence = Math.min(100, Math.max(0, confidenceRaw)) / 100; // Normalize to 0-1
+    // Clear-cut answers from the screening model skip the main model
+    if (screeningModelName && screeningModelName !== modelName) {
+      try {
+        const screened = await requestSATDClassification(screeningModelName, systemMessage, prompt);
+        if (screened.confidence >= SCREENING_CONFIDENCE) {
+          return screened;
+        }
+        console.log(`classifySATD: Escalating to ${modelName} (screening confidence ${screened.confidence})`);
+      } catch (error: any) {
+        // A failed screen is not a verdict; let the main model decide
+        console.warn(`classifySATD: Screening with ${screeningModelName} failed, escalating to ${modelName}: ${error?.message || error}`);
+      }
+    }
     
-    return {
-      isSATD,
-      confidence,
-      rawResponse: responseText
-    };
+    return await requestSATDClassification(modelName, systemMessage, prompt);
   } catch (error: any) {
     const errorMessage = error?.message || String(error);
     const statusCode = error?.status || error?.response?.status;
@@ -517,43 +678,38 @@ export async function analyzeDebtFix(
 
 /**
  * Batch classify multiple comments for SATD (more efficient for large codebases)
+ * Requests run concurrently, at most `concurrency` at a time
  * @param comments Array of comments with their context
  * @param threshold Confidence threshold (default 0.7)
- * @returns Array of classification results
+ * @param concurrency Maximum in-flight requests (default LLM_CONCURRENCY)
+ * @returns Classification results by id; a failed request yields a result
+ *          with `error` set, which is not a negative classification
  */
 export async function batchClassifySATD(
   comments: Array<{ comment: string; context: string; id: string }>,
-  threshold: number = 0.7
+  threshold: number = 0.7,
+  concurrency: number = LLM_CONCURRENCY
 ): Promise<Map<string, SATDClassificationResult>> {
-  const results = new Map<string, SATDClassificationResult>();
-  
-  // Process sequentially with delays to avoid rate limits
-  // Reduced batch size and increased delays for better rate limit handling
-  const delayBetweenRequests = 2000; // 2 seconds between requests
-  const delayBetweenBatches = 5000; // 5 seconds between batches
-  
-  for (let i = 0; i < comments.length; i++) {
-    const { comment, context, id } = comments[i];
-    
+  const classified = await mapWithConcurrency(comments, concurrency, async ({ comment, context, id }) => {
     try {
-      const result = await classifySATD(comment, context);
-      results.set(id, result);
-      
-      // Add delay between requests (except for the last one)
-      if (i < comments.length - 1) {
-        await new Promise(resolve => setTimeout(resolve, delayBetweenRequests));
-      }
+      return await classifySATD(comment, context);
     } catch (error) {
       console.error(`Failed to classify comment ${id}: ${error}`);
-      results.set(id, { isSATD: false, confidence: 0 });
-    }
-    
-    // Extra delay every 5 items to respect rate limits
-    if ((i + 1) % 5 === 0 && i < comments.length - 1) {
-      await new Promise(resolve => setTimeout(resolve, delayBetweenBatches));
+      return {
+        isSATD: false,
+        confidence: 0,
+        error: error instanceof Error ? error.message : String(error)
+      } as SATDClassificationResult;
     }
+  });
+  
+  const failed = classified.filter(result => result.error).length;
+  if (failed > 0) {
+    console.warn(`batchClassifySATD: ${failed}/${comments.length} comments could not be classified`);
   }
   
+  const results = new Map<string, SATDClassificationResult>();
+  comments.forEach(({ id }, i) => results.set(id, classified[i]));
   return results;
 }
 
@@ -635,18 +791,21 @@ export class OpenAIProvider implements LLMProvider {
 
   async classifySATD(comment: string, context = ''): Promise<LLMClassification> {
     try {
-      const response = await retryWithBackoff(() =>
-        this.client.chat.completions.create({
-          model: this.model,
-          messages: [
-            { role: 'system', content: PROMPT1_SYSTEM },
-            { role: 'user',   content: buildPrompt1(comment, context) },
-          ],
-          max_tokens: 100,
-          temperature: 0,
-        })
-      );
-      const text = response.choices[0]?.message.content?.trim() ?? '';
+      const prompt = buildPrompt1(comment, context);
+      const text = await getLLMCache().getOrFetch(this.model, PROMPT1_SYSTEM, prompt, async () => {
+        const response = await retryWithBackoff(() =>
+          this.client.chat.completions.create({
+            model: this.model,
+            messages: [
+              { role: 'system', content: PROMPT1_SYSTEM },
+              { role: 'user',   content: prompt },
+            ],
+            max_tokens: 100,
+            temperature: 0,
+          })
+        );
+        return response.choices[0]?.message.content?.trim() ?? '';
+      });
       return parseClassificationResponse(text);
     } catch (err: any) {
       console.error(`[OpenAIProvider] classifySATD failed: ${err?.message}`);
@@ -52,17 +52,10 @@ export function registerVisualizationCommands(context: vscode.ExtensionContext):
                     // Create the chain analyzer
                     const chainAnalyzer = new SatdChainAnalyzer();
                     
-                    // Find chains in the relationships
-                    const { relationships: enhancedRelationships, chains } = 
-                        chainAnalyzer.findChains(debtItems, relationships);
-                    
-                    progress.report({ message: "Calculating SIR scores..." });
-                    
-                    // Calculate SIR scores for debt items
-                    const debtItemsWithScores = chainAnalyzer.calculateSIRScores(
-                        debtItems, 
-                        enhancedRelationships
-                    );
+                    // Find chains in the relationships and calculate SIR
+                    // scores for debt items, over one shared graph
+                    const { relationships: enhancedRelationships, chains, debtItems: debtItemsWithScores } = 
+                        chainAnalyzer.analyzeChainsAndSIR(debtItems, relationships);
                     
                     progress.report({ message: "Generating visualization..." });
                     